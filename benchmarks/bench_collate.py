@@ -0,0 +1,141 @@
+"""
+End-to-end throughput benchmark for ``collate`` on an offline machine.
+
+Replays recorded model metadata and READMEs and clones small local git
+repositories, then reports models/sec, peak RSS and per-stage latency for each
+run size. Each size runs in a fresh interpreter so peak RSS is not inherited.
+
+    PYTHONPATH=src python benchmarks/bench_collate.py --sizes 10,100,1000,10000
+    python benchmarks/bench_collate.py --sizes 100 --save-baseline base.json
+    python benchmarks/bench_collate.py --sizes 100 --baseline base.json --threshold 0.2
+
+With ``--baseline`` the exit status is 1 if throughput drops, or peak RSS grows,
+by more than ``--threshold`` (a fraction) for any size present in the baseline.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from offline import SRC, make_git_repos, offline_hub, url_lines
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+N_REPOS = 8
+
+
+def _peak_rss_mb() -> float:
+    kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return kb / 1024.0 if sys.platform != "darwin" else kb / (1024.0 * 1024.0)
+
+
+def run_once(n_models: int, workers: int = 4, workdir: str | None = None) -> Dict[str, Any]:
+    """Score ``n_models`` offline in this process and return the measurements."""
+    from core.compute import collate
+    from core.options import use_options
+    from core.tracing import start_tracing, stop_tracing
+
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        repos = make_git_repos(tmp, N_REPOS)
+        lines = url_lines(n_models, N_REPOS)
+        with offline_hub(tmp, repos), use_options(max_workers=workers):
+            tracer = start_tracing()
+            t0 = time.perf_counter()
+            try:
+                rows = sum(1 for _ in collate(lines))
+            finally:
+                stop_tracing()
+            wall = time.perf_counter() - t0
+    stages = tracer.summary()["stages"]
+    return {
+        "models": rows,
+        "wall_s": wall,
+        "models_per_s": rows / wall if wall > 0 else 0.0,
+        "peak_rss_mb": _peak_rss_mb(),
+        "stages": {
+            k: {q: v[q] for q in ("count", "p50_ms", "p95_ms", "p99_ms")}
+            for k, v in stages.items()
+        },
+    }
+
+
+def _run_isolated(n_models: int, workers: int) -> Dict[str, Any]:
+    env = dict(os.environ, PYTHONPATH=SRC, HF_HUB_DISABLE_PROGRESS_BARS="1")
+    proc = subprocess.run(
+        [
+            sys.executable, os.path.abspath(__file__),
+            "--single", str(n_models), "--workers", str(workers),
+        ],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    result: Dict[str, Any] = json.loads(proc.stdout)
+    return result
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Return a list of regressions of ``results`` against ``baseline``."""
+    problems = []
+    for size, base in baseline.items():
+        cur = results.get(size)
+        if cur is None:
+            continue
+        if cur["models_per_s"] < base["models_per_s"] * (1.0 - threshold):
+            problems.append(
+                f"{size} models: {cur['models_per_s']:.1f} models/s"
+                f" vs baseline {base['models_per_s']:.1f}"
+            )
+        if cur["peak_rss_mb"] > base["peak_rss_mb"] * (1.0 + threshold):
+            problems.append(
+                f"{size} models: peak RSS {cur['peak_rss_mb']:.0f} MB"
+                f" vs {base['peak_rss_mb']:.0f} MB"
+            )
+    return problems
+
+
+def main(argv: List[str] | None = None) -> int:
+    p = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    p.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    p.add_argument("--workers", type=int, default=4)
+    p.add_argument("--baseline", help="JSON results to compare against")
+    p.add_argument("--save-baseline", help="write this run's results here")
+    p.add_argument("--threshold", type=float, default=0.2)
+    p.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    args = p.parse_args(argv)
+
+    if args.single is not None:
+        print(json.dumps(run_once(args.single, args.workers)))
+        return 0
+
+    results: Dict[str, Any] = {}
+    for n in (int(x) for x in args.sizes.split(",") if x.strip()):
+        r = results[str(n)] = _run_isolated(n, args.workers)
+        metric_p50 = {k[len("metric."):]: round(v["p50_ms"], 1) for k, v in r["stages"].items()
+                      if k.startswith("metric.")}
+        print(
+            f"{n:>6} models  {r['models_per_s']:8.1f} models/s"
+            f"  peak RSS {r['peak_rss_mb']:7.1f} MB  "
+            f"metric p50 ms {metric_p50}"
+        )
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            problems = compare(results, json.load(f), args.threshold)
+        for msg in problems:
+            print(f"REGRESSION: {msg}", file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+"""
+Scaling fuzz for the README scanners used by the metrics.
+
+Generates adversarial and random model cards at doubling sizes, times the
+README-driven metrics on each, and fits the growth exponent of time against
+size (1.0 is linear, 2.0 quadratic).
+
+    PYTHONPATH=src python benchmarks/bench_markdown.py
+    python benchmarks/bench_markdown.py --max-lines 64000 --max-exponent 1.3
+
+The exit status is 1 if any family grows faster than ``--max-exponent``.
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+from bench_metrics import adversarial_readmes, make_ctx
+
+_FUZZ_TOKENS = ("```", "`", "#", "## ", "License", "|", " ", "\t", "\n", "\n\n", "py ", "x", "pip")
+
+
+def fuzz_readme(lines: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return "".join(rng.choice(_FUZZ_TOKENS) for _ in range(lines * 8))
+
+
+def families(lines: int) -> Dict[str, str]:
+    out = adversarial_readmes(lines)
+    out["fenced_whitespace"] = "``` " + " " * (lines * 10)
+    out["fuzz"] = fuzz_readme(lines)
+    return out
+
+
+def _timed(fn: Callable[[], object], repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def exponent(sizes: List[int], secs: List[float]) -> float:
+    """Least-squares slope of log(time) over log(size)."""
+    xs = [math.log(s) for s in sizes]
+    ys = [math.log(max(t, 1e-7)) for t in secs]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    var = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / var if var else 0.0
+
+
+def run(min_lines: int, max_lines: int, repeat: int = 3) -> Dict[str, Dict[str, object]]:
+    from metrics.availability import AvailabilityMetric
+    from metrics.license import LicenseMetric
+    from metrics.performance_claims import PerformanceClaimsMetric
+
+    os.environ.pop("GEN_AI_STUDIO_API_KEY", None)
+    metrics = (AvailabilityMetric(), LicenseMetric(), PerformanceClaimsMetric())
+    sizes: List[int] = []
+    n = min_lines
+    while n <= max_lines:
+        sizes.append(n)
+        n *= 2
+    secs: Dict[str, List[float]] = {}
+    for n in sizes:
+        for name, text in families(n).items():
+            ctx = make_ctx(0, 10)
+            ctx["readme_text"] = text
+            t = _timed(lambda: [m.compute(ctx) for m in metrics], repeat)
+            secs.setdefault(name, []).append(t)
+    return {
+        name: {"sizes": sizes, "seconds": ts, "exponent": exponent(sizes, ts)}
+        for name, ts in secs.items()
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    p = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    p.add_argument("--min-lines", type=int, default=2000)
+    p.add_argument("--max-lines", type=int, default=64000)
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--max-exponent", type=float, default=1.3)
+    args = p.parse_args(argv)
+
+    results = run(args.min_lines, args.max_lines, args.repeat)
+    bad = []
+    for name, r in results.items():
+        ms = ", ".join(f"{t * 1000:.1f}" for t in r["seconds"])  # type: ignore[attr-defined]
+        print(f"{name:<20} exponent {r['exponent']:.2f}  ms [{ms}]")
+        if r["exponent"] > args.max_exponent:  # type: ignore[operator]
+            bad.append(name)
+    for name in bad:
+        print(f"SUPERLINEAR: {name}", file=sys.stderr)
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,246 @@
+"""
+Micro-benchmarks for the pure ``Metric.compute`` hot paths.
+
+Builds synthetic contexts (README text up to several MB, file lists up to 100k
+entries as seen in large dataset-style model repos) plus adversarial model
+cards aimed at backtracking-prone regexes, and reports ns/op and peak
+allocation per metric and case.
+
+    PYTHONPATH=src python benchmarks/bench_metrics.py
+    python benchmarks/bench_metrics.py --history benchmarks/metrics_history.jsonl --threshold 0.25
+
+With ``--history`` each run is appended as one JSON line and compared against
+the previous line; the exit status is 1 if any case got slower or allocated
+more by more than ``--threshold``, or if any single call exceeded
+``--max-op-ms`` (the guard for adversarial inputs).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from unittest import mock
+
+from offline import ROOT
+
+# (label, README bytes, number of files)
+SCALES: Tuple[Tuple[str, int, int], ...] = (
+    ("small", 1_000, 10),
+    ("medium", 64_000, 1_000),
+    ("large", 1_000_000, 10_000),
+    ("huge", 4_000_000, 100_000),
+)
+ADVERSARIAL_LINES = 500
+
+_SECTIONS = (
+    "## Getting Started\n\nInstall with `pip install transformers` and run the example.\n\n"
+    "```python\nfrom transformers import AutoModel\nm = AutoModel.from_pretrained('x')\n```\n\n",
+    "## Evaluation\n\n| task | accuracy | f1 |\n|---|---|---|\n| mmlu | 0.61 | 0.58 |\n\n",
+    "## Training data\n\nTrained on a corpus with 3 splits; see the dataset card for size.\n\n",
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor.\n\n",
+)
+
+
+def make_readme(n_bytes: int) -> str:
+    parts: List[str] = ["# Model card\n\n"]
+    size, i = 0, 0
+    while size < n_bytes:
+        s = _SECTIONS[i % len(_SECTIONS)]
+        parts.append(s)
+        size += len(s)
+        i += 1
+    parts.append("## License\n\nApache-2.0\n")
+    return "".join(parts)
+
+
+def make_files(n: int) -> Tuple[List[str], List[Dict[str, Any]]]:
+    files = ["README.md", "config.json", "tokenizer.json", "model.safetensors.index.json"]
+    k = 0
+    while len(files) < n:
+        files.append(f"data/train/shard-{k:06d}.parquet")
+        if k % 10 == 0:
+            files.append(f"model-{k:05d}-of-99999.safetensors")
+        k += 1
+    files = files[:n]
+    meta = [{"rfilename": f, "size": 1_000_000 + i} for i, f in enumerate(files)]
+    return files, meta
+
+
+def make_ctx(readme_bytes: int, n_files: int) -> Dict[str, Any]:
+    from metrics.file_index import FileIndex
+
+    files, meta = make_files(n_files)
+    return {
+        "files": files,
+        "file_index": FileIndex(files, (m["size"] for m in meta)),
+        "readme_text": make_readme(readme_bytes),
+        "card_data": {"license": "apache-2.0"},
+        "hf_license": "apache-2.0",
+        "datasets": ["https://huggingface.co/datasets/a/b"],
+        "code": [],
+        "repo_id": "bench/model",
+    }
+
+
+def adversarial_readmes(lines: int) -> Dict[str, str]:
+    """Model cards that stress regex backtracking (blank runs, unclosed fences, many headings)."""
+    return {
+        "blank_runs": "\n" * lines,
+        "unclosed_fences": "```python\n" * lines,
+        "license_headings": ("# License\n" + "text\n") * lines,
+        "pipe_lines": ("| a " * 40 + "\n" + " \n") * lines,
+        "trailing_spaces": (" " * 50 + "\n") * lines,
+    }
+
+
+def _metrics() -> Dict[str, Any]:
+    from metrics.availability import AvailabilityMetric
+    from metrics.dataset_quality import DatasetQualityMetric
+    from metrics.license import LicenseMetric
+    from metrics.performance_claims import PerformanceClaimsMetric
+    from metrics.size import SizeMetric
+
+    return {
+        m.name: m
+        for m in (
+            AvailabilityMetric(),
+            LicenseMetric(),
+            PerformanceClaimsMetric(),
+            DatasetQualityMetric(),
+            SizeMetric(),
+        )
+    }
+
+
+def measure(fn: Callable[[], Any], min_time: float, max_op_ms: float) -> Dict[str, float]:
+    """ns/op over repeated calls (at least ``min_time`` seconds) and peak allocation of one call."""
+    t0 = time.perf_counter_ns()
+    fn()
+    first_ns = time.perf_counter_ns() - t0
+
+    calls, total_ns, worst_ns = 1, first_ns, first_ns
+    if first_ns / 1e6 <= max_op_ms:
+        while total_ns < min_time * 1e9:
+            t0 = time.perf_counter_ns()
+            fn()
+            dt = time.perf_counter_ns() - t0
+            calls, total_ns, worst_ns = calls + 1, total_ns + dt, max(worst_ns, dt)
+
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "ns_per_op": total_ns / calls,
+        "max_op_ms": worst_ns / 1e6,
+        "alloc_peak_bytes": float(peak - base),
+    }
+
+
+def run_cases(
+    scales: Tuple[Tuple[str, int, int], ...] = SCALES,
+    adversarial_lines: int = ADVERSARIAL_LINES,
+    min_time: float = 0.2,
+    max_op_ms: float = 250.0,
+) -> Dict[str, Dict[str, float]]:
+    # Measure the heuristic paths only; the caller's environment is restored afterwards.
+    with mock.patch.dict(os.environ):
+        os.environ.pop("GEN_AI_STUDIO_API_KEY", None)
+        metrics = _metrics()
+        results: Dict[str, Dict[str, float]] = {}
+        for label, readme_bytes, n_files in scales:
+            ctx = make_ctx(readme_bytes, n_files)
+            for name, m in metrics.items():
+                results[f"{name}/{label}"] = measure(lambda: m.compute(ctx), min_time, max_op_ms)
+        for label, text in adversarial_readmes(adversarial_lines).items():
+            ctx = make_ctx(0, 10)
+            ctx["readme_text"] = text
+            for name in ("ramp_up_time", "license", "performance_claims", "dataset_quality"):
+                m = metrics[name]
+                results[f"{name}/adv_{label}"] = measure(
+                    lambda: m.compute(ctx), min_time, max_op_ms
+                )
+    return results
+
+
+def check(
+    results: Dict[str, Dict[str, float]],
+    previous: Optional[Dict[str, Dict[str, float]]],
+    threshold: float,
+    max_op_ms: float,
+) -> List[str]:
+    problems = []
+    for case, r in results.items():
+        if r["max_op_ms"] > max_op_ms:
+            problems.append(f"{case}: call took {r['max_op_ms']:.0f} ms (limit {max_op_ms:.0f})")
+        prev = (previous or {}).get(case)
+        if not prev:
+            continue
+        if r["ns_per_op"] > prev["ns_per_op"] * (1.0 + threshold):
+            problems.append(f"{case}: {r['ns_per_op']:.0f} ns/op vs {prev['ns_per_op']:.0f} ns/op")
+        if r["alloc_peak_bytes"] > max(prev["alloc_peak_bytes"] * (1.0 + threshold), 4096.0):
+            problems.append(
+                f"{case}: {r['alloc_peak_bytes']:.0f} B peak vs {prev['alloc_peak_bytes']:.0f} B"
+            )
+    return problems
+
+
+def _git_rev() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True
+        )
+        return out.stdout.strip()
+    except Exception:
+        return ""
+
+
+def _last_entry(path: str) -> Optional[Dict[str, Dict[str, float]]]:
+    if not os.path.isfile(path):
+        return None
+    last = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                last = json.loads(line)["results"]
+    return last
+
+
+def main(argv: List[str] | None = None) -> int:
+    p = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    p.add_argument("--scales", default=",".join(s[0] for s in SCALES), help="scale labels to run")
+    p.add_argument("--adversarial-lines", type=int, default=ADVERSARIAL_LINES)
+    p.add_argument("--min-time", type=float, default=0.2, help="seconds of repeated calls per case")
+    p.add_argument("--max-op-ms", type=float, default=250.0)
+    p.add_argument("--history", help="JSONL file to append results to and compare against")
+    p.add_argument("--threshold", type=float, default=0.25)
+    args = p.parse_args(argv)
+
+    wanted = set(args.scales.split(","))
+    scales = tuple(s for s in SCALES if s[0] in wanted)
+    results = run_cases(scales, args.adversarial_lines, args.min_time, args.max_op_ms)
+    for case, r in results.items():
+        kib = r["alloc_peak_bytes"] / 1024
+        print(f"{case:<40} {r['ns_per_op']:>14,.0f} ns/op  {kib:>10,.1f} KiB peak")
+
+    previous = _last_entry(args.history) if args.history else None
+    problems = check(results, previous, args.threshold, args.max_op_ms)
+    if args.history:
+        entry = {"timestamp": time.time(), "git_rev": _git_rev(), "results": results}
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+    for msg in problems:
+        print(f"REGRESSION: {msg}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,213 @@
+"""
+Offline replay of Hugging Face and GitHub for the benchmark scripts.
+
+Model metadata and README files are replayed from ``fixtures/``; GitHub code
+URLs resolve to small synthetic git repositories created locally, so a full
+``collate`` run needs no network access.
+"""
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SRC = os.path.join(ROOT, "src")
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+
+def load_payloads() -> List[Dict[str, Any]]:
+    with open(os.path.join(FIXTURES, "model_info.json"), "r", encoding="utf-8") as f:
+        payloads: List[Dict[str, Any]] = json.load(f)
+    return payloads
+
+
+def load_index_files() -> Dict[str, Any]:
+    with open(os.path.join(FIXTURES, "index_files.json"), "r", encoding="utf-8") as f:
+        data: Dict[str, Any] = json.load(f)
+    return data
+
+
+def model_info(payload: Dict[str, Any], repo_id: str) -> SimpleNamespace:
+    """Build an object shaped like ``huggingface_hub.ModelInfo`` from a fixture payload."""
+    return SimpleNamespace(
+        id=repo_id,
+        license=payload.get("license"),
+        tags=list(payload.get("tags") or []),
+        cardData=payload.get("cardData"),
+        lastModified=payload.get("lastModified"),
+        downloads=payload.get("downloads"),
+        likes=payload.get("likes"),
+        siblings=[
+            SimpleNamespace(rfilename=s["rfilename"], size=s["size"]) for s in payload["siblings"]
+        ],
+    )
+
+
+def dataset_info(repo_id: str) -> SimpleNamespace:
+    """A ``huggingface_hub.DatasetInfo``-shaped object with a documented card."""
+    splits = [{"name": "train", "num_examples": 10_000}, {"name": "test", "num_examples": 1_000}]
+    card = {
+        "license": "cc-by-4.0",
+        "pretty_name": repo_id,
+        "task_categories": ["text-classification"],
+        "dataset_info": {"features": [{"name": "text"}, {"name": "label"}], "splits": splits},
+    }
+    return SimpleNamespace(
+        id=repo_id, license=None, tags=[], cardData=card, downloads=10, likes=1,
+        siblings=[SimpleNamespace(rfilename="README.md")],
+    )
+
+
+def _git(cwd: str, *args: str, author: str = "Bench Author") -> None:
+    env = dict(
+        os.environ,
+        GIT_AUTHOR_NAME=author,
+        GIT_AUTHOR_EMAIL=f"{author.split()[0].lower()}@example.com",
+        GIT_COMMITTER_NAME=author,
+        GIT_COMMITTER_EMAIL=f"{author.split()[0].lower()}@example.com",
+    )
+    subprocess.run(["git", *args], cwd=cwd, env=env, check=True, capture_output=True)
+
+
+def make_git_repos(root: str, count: int) -> List[str]:
+    """Create ``count`` small repositories with tests, CI, typing config and several authors."""
+    paths = []
+    for k in range(count):
+        path = os.path.join(root, f"repo{k}")
+        os.makedirs(os.path.join(path, "tests"), exist_ok=True)
+        os.makedirs(os.path.join(path, ".github", "workflows"), exist_ok=True)
+        files = {
+            "pyproject.toml": (
+                '[project]\nname = "r"\ndependencies = ["requests"]\n\n[tool.mypy]\nstrict = true\n'
+            ),
+            "tests/test_basic.py": "def test_ok():\n    assert True\n",
+            ".github/workflows/ci.yml": "name: ci\non: [push]\n",
+            "eval_results.md": "| task | acc |\n|---|---|\n| x | 0.9 |\n",
+            "README.md": f"# repo {k}\n",
+        }
+        for rel, text in files.items():
+            with open(os.path.join(path, rel), "w", encoding="utf-8") as f:
+                f.write(text)
+        _git(path, "init", "-q")
+        for i, author in enumerate(("Alice Example", "Bob Example", "Carol Example")[: 1 + k % 3]):
+            with open(os.path.join(path, f"file{i}.py"), "w", encoding="utf-8") as f:
+                f.write(f"X = {i}\n")
+            _git(path, "add", "-A", author=author)
+            _git(path, "commit", "-q", "-m", f"commit {i}", author=author)
+        paths.append(path)
+    return paths
+
+
+def url_lines(n_models: int, n_repos: int) -> List[str]:
+    """An input file in the CLI format: each model preceded by its dataset/code lines."""
+    payloads = load_payloads()
+    lines: List[str] = []
+    for i in range(n_models):
+        if i % 2 == 0:
+            lines.append(f"https://huggingface.co/datasets/bench/ds{i % 7}")
+        if i % 3 != 2:
+            lines.append(f"https://github.com/bench/repo{i % n_repos}")
+        owner, name = payloads[i % len(payloads)]["id"].split("/")
+        lines.append(f"https://huggingface.co/{owner}/{name}-{i}")
+    return lines
+
+
+class _FakeGithubRepo:
+    def __init__(self, name: str) -> None:
+        self.stargazers_count = 100 + len(name)
+
+    def get_contributors(self) -> List[int]:
+        return [1, 2, 3]
+
+    def get_license(self) -> SimpleNamespace:
+        return SimpleNamespace(license=SimpleNamespace(spdx_id="MIT"))
+
+
+class _FakeGithub:
+    def get_repo(self, name: str) -> _FakeGithubRepo:
+        return _FakeGithubRepo(name)
+
+
+@contextmanager
+def offline_hub(workdir: str, repos: List[str]) -> Iterator[None]:
+    """Route every HF/GitHub access made during scoring to local fixtures."""
+    import git
+
+    import core.github as ghmod
+    import core.hf_api as hfmod
+    import core.safetensors as stmod
+
+    payloads = load_payloads()
+    index_files = load_index_files()
+    by_prefix = {p["id"]: p for p in payloads}
+    files_dir = os.path.join(workdir, "hub_files")
+    os.makedirs(files_dir, exist_ok=True)
+
+    def _payload(repo_id: str) -> Dict[str, Any]:
+        return by_prefix[repo_id.rsplit("-", 1)[0]]
+
+    class FakeApi:
+        def model_info(
+            self, repo_id: str, files_metadata: bool = False, **kw: Any
+        ) -> SimpleNamespace:
+            return model_info(_payload(repo_id), repo_id)
+
+        def dataset_info(self, repo_id: str, **kw: Any) -> SimpleNamespace:
+            return dataset_info(repo_id)
+
+    def fake_download(repo_id: str, filename: str, repo_type: str = "model", **kw: Any) -> str:
+        if filename == "README.md":
+            text = _payload(repo_id)["readme"]
+        elif filename in index_files:
+            text = json.dumps(index_files[filename])
+        else:
+            raise FileNotFoundError(filename)
+        path = os.path.join(files_dir, f"{abs(hash((repo_id, filename)))}_{filename}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def fake_safetensors(repo_id: str, filenames: List[str]) -> Dict[str, Any]:
+        params = 1_000_000 * len(filenames)
+        return {"params": params, "dtype_params": {"BF16": params}, "data_bytes": 2 * params,
+                "shards": len(filenames)}
+
+    orig_clone = git.Repo.clone_from
+    orig_attr = git.Repo.__dict__["clone_from"]
+
+    def local_clone(url: str, to_path: str, **kw: Any) -> Any:
+        k = int(url.rstrip("/").rsplit("repo", 1)[-1])
+        return orig_clone("file://" + repos[k % len(repos)], to_path, **kw)
+
+    saved = {
+        (hfmod, "_api"): hfmod.__dict__.get("_api"),
+        (hfmod, "hf_hub_download"): hfmod.__dict__.get("hf_hub_download"),
+        (ghmod, "Github"): ghmod.__dict__.get("Github"),
+        (stmod, "fetch_summary"): stmod.fetch_summary,
+    }
+    hfmod._api = FakeApi()
+    hfmod.hf_hub_download = fake_download  # type: ignore[attr-defined]
+    ghmod.Github = _FakeGithub  # type: ignore[attr-defined]
+    stmod.fetch_summary = fake_safetensors  # type: ignore[assignment]
+    git.Repo.clone_from = staticmethod(local_clone)  # type: ignore[method-assign,assignment]
+    old_key = os.environ.pop("GEN_AI_STUDIO_API_KEY", None)
+    hfmod.DATASET_CACHE.clear()
+    try:
+        yield
+    finally:
+        hfmod.DATASET_CACHE.clear()
+        git.Repo.clone_from = orig_attr  # type: ignore[method-assign]
+        for (mod, name), value in saved.items():
+            if value is None:
+                mod.__dict__.pop(name, None)
+            else:
+                setattr(mod, name, value)
+        if old_key is not None:
+            os.environ["GEN_AI_STUDIO_API_KEY"] = old_key
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Persistent entries older than this are refetched (seconds; default one day).
+DEFAULT_TTL_S = 24 * 3600.0
+
+# In-memory entries kept per MetadataCache before the least recently used go.
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    In-memory keyed memo with single-flight loading.
+
+    The first get() for a key runs the loader; concurrent callers for the same
+    key wait for that call instead of issuing their own, then every caller
+    shares the result. A loader error is raised to all waiters and not cached.
+
+    Values live until clear() unless ``max_entries`` (least recently used are
+    evicted) or ``ttl_s`` (seconds; expired values are reloaded) bound them,
+    as long-lived processes such as the scoring service need.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_s: Optional[float] = None) -> None:
+        self._lock = threading.Lock()
+        self._values: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._max_entries = max_entries
+        self._memory_ttl_s = ttl_s
+        self.loads = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        # Callers hold self._lock.
+        entry = self._values.get(key)
+        if entry is None:
+            return False, None
+        value, at = entry
+        if self._memory_ttl_s is not None and time.monotonic() - at > self._memory_ttl_s:
+            del self._values[key]
+            return False, None
+        self._values.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        # Callers hold self._lock.
+        self._values[key] = (value, time.monotonic())
+        self._values.move_to_end(key)
+        if self._max_entries is not None:
+            while len(self._values) > self._max_entries:
+                self._values.popitem(last=False)
+
+    def _load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.loads += 1
+        return loader()
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            found, cached = self._lookup(key)
+            if found:
+                return cached
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            value = self._load(key, loader)
+            flight.value = value
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            with self._lock:
+                self._store(key, value)
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+        return value
+
+    def peek(self, key: Hashable) -> Any:
+        """The cached value for ``key``, or None; never loads."""
+        with self._lock:
+            return self._lookup(key)[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache ``value`` for ``key`` as if a loader had returned it."""
+        with self._lock:
+            self._store(key, value)
+
+    def clear(self) -> None:
+        """Drop every memoized value."""
+        with self._lock:
+            self._values.clear()
+
+
+class MetadataCache(SingleFlight):
+    """
+    SingleFlight for remote metadata, with an optional persistent layer.
+
+    With a ``directory`` (default: $METADATA_CACHE_DIR) JSON-serialisable
+    results are also written under ``<directory>/<namespace>/`` and reused by
+    later runs until ``ttl_s`` expires. None results and loader errors are
+    never persisted. The in-memory layer expires after the same ``ttl_s`` and
+    holds at most ``max_entries`` values.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        directory: Optional[str] = None,
+        ttl_s: Optional[float] = None,
+        max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        ttl = DEFAULT_TTL_S if ttl_s is None else ttl_s
+        super().__init__(max_entries=max_entries, ttl_s=ttl)
+        self.namespace = namespace
+        self._directory = directory
+        self.ttl_s = ttl
+
+    @property
+    def directory(self) -> Optional[str]:
+        d = self._directory or os.getenv("METADATA_CACHE_DIR")
+        return os.path.join(d, self.namespace) if d else None
+
+    def _path(self, key: str) -> Optional[str]:
+        d = self.directory
+        if not d:
+            return None
+        return os.path.join(d, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def _read_disk(self, key: str) -> Any:
+        path = self._path(key)
+        if not path:
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key or time.time() - float(entry.get("at", 0)) > self.ttl_s:
+            return None
+        return entry.get("value")
+
+    def _write_disk(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        if not path or value is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "at": time.time(), "value": value}, f)
+            os.replace(tmp, path)
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def _load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        value = self._read_disk(str(key))
+        if value is None:
+            value = super()._load(key, loader)
+            self._write_disk(str(key), value)
+        return value
+
+    def clear(self) -> None:
+        """Drop the in-memory layer (persistent entries are kept)."""
+        super().clear()
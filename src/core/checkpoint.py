@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+Key = Tuple[int, str]
+
+
+class Journal:
+    """
+    Append-only NDJSON journal of emitted rows, keyed by (input line index, URL).
+
+    Each line is ``{"index": i, "url": u, "row": {...}}``. A run killed mid-write
+    leaves at most one truncated trailing line, which resuming cuts off so the
+    next record starts on a line of its own.
+    """
+
+    def __init__(self, path: str, resume: bool = False) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._done: Dict[Key, Dict[str, Any]] = {}
+        end = 0
+        if resume:
+            self._done, end = self._load()
+        self._fh = open(path, "a" if resume else "w", encoding="utf-8")
+        if resume:
+            self._fh.truncate(end)
+
+    def _load(self) -> Tuple[Dict[Key, Dict[str, Any]], int]:
+        """Journaled rows and the byte offset just past the last complete line."""
+        done: Dict[Key, Dict[str, Any]] = {}
+        end = 0
+        if not os.path.isfile(self.path):
+            return done, end
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn write
+                end += len(line)
+                try:
+                    rec = json.loads(line)
+                    done[(int(rec["index"]), str(rec["url"]))] = dict(rec["row"])
+                except Exception:
+                    continue
+        return done, end
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def get(self, index: int, url: str) -> Optional[Dict[str, Any]]:
+        return self._done.get((index, url))
+
+    def record(self, index: int, url: str, row: Dict[str, Any]) -> None:
+        with self._lock:
+            if (index, url) in self._done:
+                return
+            self._done[(index, url)] = dict(row)
+            entry = {"index": index, "url": url, "row": row}
+            self._fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.close()
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -1,28 +1,216 @@
 from __future__ import annotations
 
+import argparse
+import logging
+import os
 import sys
+import time
+from contextlib import ExitStack
 from typing import Iterable, List, Optional
 
+from .checkpoint import Journal
 from .compute import collate
+from .incremental import IncrementalState
+from .inputs import iter_lines
 from .io_ndjson import write_rows
 from .logging_cfg import setup_logging
+from .options import MODEL_WORKERS, use_options
+from .shard import merge_shards, parse_shard, shard_lines
+from .tracing import Tracer, span, start_tracing, stop_tracing, write_otlp, write_profile
+
+log = logging.getLogger(__name__)
+
+USAGE = (
+    "Usage: python -m core.cli [--workers N] [--window N] [--unordered]"
+    " [--metrics LIST] [--threshold T] [--model-timeout S] [--run-timeout S]"
+    " [--checkpoint PATH] [--resume] [--incremental STATE] [--param-counts]"
+    " [--prefetch] [--hf-local DIR] [--repos-dir DIR] [--shard i/N]"
+    " [--profile PATH] [--trace PATH] URL_FILE...\n"
+    "       python -m core.cli merge SHARD_OUTPUT..."
+)
+
+
+class _UsageError(Exception):
+    pass
+
+
+class _Parser(argparse.ArgumentParser):
+    def error(self, message: str) -> None:  # type: ignore[override]
+        raise _UsageError(message)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    p = _Parser(prog="core.cli", add_help=False)
+    p.add_argument("url_files", nargs="+")
+    p.add_argument("--workers", type=int, default=MODEL_WORKERS, help="models scored concurrently")
+    p.add_argument("--window", type=int, default=None, help="max models in flight or buffered")
+    p.add_argument("--unordered", action="store_true", help="emit rows as soon as they finish")
+    p.add_argument("--checkpoint", default=None, help="journal of emitted rows")
+    p.add_argument("--resume", action="store_true", help="replay journaled rows")
+    p.add_argument(
+        "--incremental",
+        default=None,
+        help="state file; rescore only models whose revision or repos changed",
+    )
+    p.add_argument(
+        "--param-counts",
+        action="store_true",
+        help="read safetensors headers for exact parameter counts (one request per shard)",
+    )
+    p.add_argument(
+        "--prefetch",
+        action="store_true",
+        help="read the whole input first and list each author's models in bulk",
+    )
+    p.add_argument(
+        "--hf-local",
+        default=os.getenv("HF_LOCAL_DIR"),
+        help="read models and datasets from this local HF cache or mirror, not the API",
+    )
+    p.add_argument(
+        "--repos-dir",
+        default=os.getenv("REPOS_DIR"),
+        help="pre-cloned repos (<owner>/<name> or <name>) scanned in place instead of cloning",
+    )
+    p.add_argument(
+        "--metrics",
+        default=os.getenv("TRUSTWORTHY_METRICS"),
+        help="comma-separated metric names and/or profiles (all, fast, offline)",
+    )
+    p.add_argument(
+        "--threshold",
+        type=float,
+        default=None,
+        help="only decide net_score >= T; skip clone/LLM metrics that cannot change it",
+    )
+    p.add_argument(
+        "--model-timeout",
+        type=float,
+        default=None,
+        help="seconds per model; late metrics are reported as timed_out",
+    )
+    p.add_argument(
+        "--run-timeout",
+        type=float,
+        default=None,
+        help="seconds for the whole run; models still pending are emitted partial",
+    )
+    p.add_argument("--shard", type=parse_shard, default=None, help="score only shard i of N")
+    p.add_argument(
+        "--profile",
+        default=os.getenv("PROFILE_FILE"),
+        help="write per-stage latency percentiles to this JSON file",
+    )
+    p.add_argument(
+        "--trace",
+        default=os.getenv("TRACE_FILE"),
+        help="write every span as an OTLP/JSON trace to this file",
+    )
+    return p
+
+
+def _merge(paths: List[str]) -> int:
+    if not paths:
+        print(USAGE, file=sys.stderr)
+        return 1
+    try:
+        with ExitStack() as stack:
+            files = [stack.enter_context(open(p, "r", encoding="utf-8")) for p in paths]
+            merge_shards(files, sys.stdout)
+        return 0
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
 
 
 def main(argv: Optional[List[str]] = None) -> int:
     setup_logging()
     argv = sys.argv if argv is None else argv
-    if len(argv) != 2:
-        print("Usage: python -m core.cli URL_FILE", file=sys.stderr)
+    if argv[1:2] == ["merge"]:
+        return _merge(argv[2:])
+    try:
+        args = _build_parser().parse_args(argv[1:])
+    except _UsageError:
+        print(USAGE, file=sys.stderr)
+        return 1
+    if args.metrics:
+        from metrics import metric_registry, select_metrics
+
+        try:
+            select_metrics(metric_registry(), args.metrics)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+    sources = args.url_files
+    path = ",".join(sources)
+    if args.resume and not args.checkpoint and (len(sources) != 1 or sources[0] == "-"):
+        print("Error: --resume with several inputs or stdin needs --checkpoint", file=sys.stderr)
         return 1
-    path = argv[1]
+    if args.shard is not None and args.unordered:
+        # Rows carry no input index, so merge can only interleave ordered shards.
+        print("Error: --shard output must be ordered; drop --unordered", file=sys.stderr)
+        return 1
+    ckpt = args.checkpoint or (f"{path}.journal" if args.resume else None)
+    run_deadline = None if args.run_timeout is None else time.monotonic() + args.run_timeout
+    tracer = start_tracing(keep_spans=bool(args.trace)) if (args.profile or args.trace) else None
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            rows: Iterable[dict] = collate(line.strip() for line in f if line.strip())
+        with ExitStack() as stack:
+            journal = stack.enter_context(Journal(ckpt, resume=args.resume)) if ckpt else None
+            state = IncrementalState(args.incremental) if args.incremental else None
+            stack.enter_context(span("run", input=path))
+            stack.enter_context(
+                use_options(
+                    max_workers=max(1, args.workers),
+                    window=args.window,
+                    ordered=not args.unordered,
+                    journal=journal,
+                    incremental=state,
+                    prefetch=args.prefetch,
+                    param_counts=args.param_counts,
+                    hf_local=args.hf_local or None,
+                    repos_dir=args.repos_dir or None,
+                    metrics=args.metrics or None,
+                    threshold=args.threshold,
+                    model_timeout=args.model_timeout,
+                    deadline=run_deadline,
+                )
+            )
+            lines: Iterable[str] = iter_lines(sources)
+            if args.shard is not None:
+                lines = shard_lines(lines, *args.shard)
+            rows: Iterable[dict] = collate(lines)
             write_rows(rows)
+        if state is not None:
+            state.save()
+            log.info("incremental: %d reused, %d rescored", state.reused, state.rescored)
         return 0
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
+    finally:
+        if tracer is not None:
+            stop_tracing()
+            _emit_traces(tracer, args.profile, args.trace)
+
+
+def _emit_traces(tracer: Tracer, profile: Optional[str], trace: Optional[str]) -> None:
+    try:
+        if profile:
+            _emit_profile(tracer, profile)
+        if trace:
+            write_otlp(tracer, trace)
+    except OSError as e:
+        print(f"Error: could not write trace output: {e}", file=sys.stderr)
+
+
+def _emit_profile(tracer: Tracer, path: str) -> None:
+    summary = tracer.summary()
+    for stage, st in summary["stages"].items():
+        log.info(
+            "stage %s: n=%d p50=%.1fms p95=%.1fms p99=%.1fms",
+            stage, st["count"], st["p50_ms"], st["p95_ms"], st["p99_ms"],
+        )
+    write_profile(summary, path)
 
 
 if __name__ == "__main__":
@@ -1,16 +1,32 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import math
 import time
 from datetime import datetime, timezone
-from typing import Any, Callable, Dict, Iterable, List, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-from metrics import MetricResult, metric_registry
+from metrics import (
+    COST_CLONE,
+    COST_LLM,
+    COST_NETWORK,
+    COST_PURE,
+    MetricResult,
+    metric_registry,
+    select_metrics,
+)
+from metrics.dataset_quality import dataset_id
+from metrics.file_index import FileIndex, file_index
 
+from .cache import DEFAULT_MAX_ENTRIES, SingleFlight
+from .context import ModelContext
 from .github import analyze_github_urls
-from .hf_api import fetch_hf_model_meta
-from .parallel import run_parallel
-from .url import ParsedURL, parse_url
+from .hf_api import fetch_hf_dataset_meta, fetch_hf_model_meta, prefetch_hf_models
+from .options import current_options, use_options
+from .parallel import iter_parallel, run_parallel
+from .tracing import span
+from .url import CODE_KINDS, ParsedURL, is_code_url, parse_url
 
 NET_WEIGHTS: Dict[str, float] = {
     "size_score": 0.15,
@@ -24,13 +40,169 @@ NET_WEIGHTS: Dict[str, float] = {
 }
 
 
+# Output column order for the built-in metrics; plugin metrics follow.
+ROW_METRICS: Tuple[str, ...] = (
+    "ramp_up_time",
+    "bus_factor",
+    "performance_claims",
+    "license",
+    "size_score",
+    "dataset_and_code_score",
+    "dataset_quality",
+    "code_quality",
+)
+
+
+# Cost classes progressive scoring defers until they can change the outcome.
+EXPENSIVE: Tuple[str, ...] = (COST_CLONE, COST_LLM)
+
+# Metrics the GitHub analysis (done with the clone stage) can still raise.
+GITHUB_MERGED = frozenset({"code_quality", "performance_claims", "bus_factor"})
+
+
+def _clamp01(x: float) -> float:
+    return max(0.0, min(1.0, x))
+
+
+def _net_bounds(
+    weights: Dict[str, float],
+    results: Dict[str, MetricResult],
+    pending: Set[str],
+    github_pending: bool,
+) -> Tuple[float, float]:
+    """Lowest and highest weighted sum still reachable once ``pending`` metrics finish."""
+    lo = hi = 0.0
+    for k, w in weights.items():
+        v = _clamp01(results[k].score) if k in results else 0.0
+        lo += w * (0.0 if k in pending else v)
+        raisable = k in pending or (github_pending and k in GITHUB_MERGED)
+        hi += w * (1.0 if raisable else v)
+    return lo, hi
+
+
+def _merge_github(
+    results: Dict[str, MetricResult], extras: Dict[str, Any], gh: Dict[str, Any]
+) -> None:
+    """Raise the clone-stage metrics with the GitHub analysis where it scores higher."""
+    if "code_quality" in gh and "code_quality" in results:
+        q = results["code_quality"].score
+        results["code_quality"] = MetricResult(
+            score=max(q, float(gh["code_quality"])),
+            latency_ms=results["code_quality"].latency_ms + int(gh.get("code_quality_latency", 0)),
+        )
+    if "performance_claims" in gh and "performance_claims" in results:
+        q = results["performance_claims"].score
+        results["performance_claims"] = MetricResult(
+            score=max(q, float(gh["performance_claims"])),
+            latency_ms=results["performance_claims"].latency_ms
+            + int(gh.get("performance_claims_latency", 0)),
+        )
+    if "license" in gh and "license_note" not in extras:
+        extras["license_note"] = gh["license"]
+    if "bus_factor" in gh and "bus_factor" in results:
+        q = results["bus_factor"].score
+        results["bus_factor"] = MetricResult(
+            score=max(q, float(gh["bus_factor"])),
+            latency_ms=results["bus_factor"].latency_ms + int(gh.get("bus_factor_latency", 0)),
+        )
+
+
+def _digest(value: Any) -> str:
+    """Stable content hash of one ctx value, for run-level work dedup keys."""
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(value, FileIndex):
+        h.update("\n".join(value.paths).encode("utf-8", "surrogatepass"))
+        h.update(value.sizes.tobytes())
+    elif isinstance(value, str):
+        h.update(value.encode("utf-8", "surrogatepass"))
+    else:
+        h.update(json.dumps(value, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _dedup_key(m: Any, ctx: ModelContext, digests: Dict[str, str]) -> Tuple[str, ...] | None:
+    """(metric name, input digests) for metrics that declare ``dedup_inputs``."""
+    inputs = getattr(m, "dedup_inputs", None)
+    if not inputs:
+        return None
+    parts = [m.name]
+    for k in inputs:
+        if k not in digests:
+            digests[k] = _digest(file_index(ctx) if k == "file_index" else ctx.get(k))
+        parts.append(digests[k])
+    return tuple(parts)
+
+
+def _dataset_fetcher(d: str) -> Callable[[], Tuple[str, Optional[Dict[str, Any]]]]:
+    def fetch() -> Tuple[str, Optional[Dict[str, Any]]]:
+        return (d, fetch_hf_dataset_meta(d))
+
+    return fetch
+
+
+def _repo_key(url: str) -> str:
+    """Memo key of a code URL: GitHub owner/name ignore case, local paths do not."""
+    p = parse_url(url)
+    if p.kind == "github" and p.owner and p.name:
+        name = p.name[:-4] if p.name.endswith(".git") else p.name
+        return f"github.com/{p.owner}/{name}".lower()
+    return url.strip().rstrip("/")
+
+
+def _model_deadline() -> Optional[float]:
+    """A model's deadline: its own budget from now, capped by the run's (both optional)."""
+    opts = current_options()
+    deadline = opts.deadline
+    if opts.model_timeout is not None:
+        deadline = min(deadline or math.inf, time.monotonic() + opts.model_timeout)
+    return deadline
+
+
+def _call_by(deadline: Optional[float], fn: Callable[[], Any]) -> Tuple[Any, ...]:
+    """``(fn(),)``, or ``()`` if ``deadline`` passed first (fn is abandoned)."""
+    if deadline is None:
+        return (fn(),)
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        return ()
+
+    def _boxed() -> Tuple[Any]:
+        return (fn(),)
+
+    out = run_parallel([_boxed], max_workers=1, timeout=remaining)
+    return tuple(out[0]) if out else ()
+
+
 def compute_one(u: str, datasets: List[str] | None, code: List[str] | None) -> Dict[str, Any]:
+    with span("model", url=u):
+        return _score_model(u, datasets, code)
+
+
+def _score_model(u: str, datasets: List[str] | None, code: List[str] | None) -> Dict[str, Any]:
     p: ParsedURL = parse_url(u)
     if p.kind != "hf_model":
         return {}
 
-    meta, fetch_ms = fetch_hf_model_meta(p)
-    ctx: Dict[str, Any] = dict(meta)
+    opts = current_options()
+    deadline = _model_deadline()
+    timed_out: List[str] = []
+
+    def _expired() -> bool:
+        return deadline is not None and time.monotonic() >= deadline
+
+    def _within(fn: Callable[[], Any]) -> Tuple[Any, ...]:
+        return _call_by(deadline, fn)
+
+    t_fetch0 = time.perf_counter()
+    with span("fetch"):
+        fetched = _within(lambda: fetch_hf_model_meta(p))
+    if fetched:
+        meta, fetch_ms = fetched[0]
+    else:
+        meta, fetch_ms = {}, int((time.perf_counter() - t_fetch0) * 1000)
+        timed_out.append("fetch")
+        deadline = time.monotonic()
+    ctx = ModelContext(meta)
     ctx["datasets"] = datasets or []
     ctx["code"] = code or []
 
@@ -40,142 +212,245 @@ def compute_one(u: str, datasets: List[str] | None, code: List[str] | None) -> D
     except Exception:
         dt = None
     if dt:
-        days = max(
-            0.0, (datetime.now(timezone.utc) - dt.astimezone(timezone.utc)).total_seconds() / 86400.0
-        )
+        age = datetime.now(timezone.utc) - dt.astimezone(timezone.utc)
+        days = max(0.0, age.total_seconds() / 86400.0)
         ctx["recency_score"] = math.exp(-days / 180.0)
     else:
         ctx["recency_score"] = 0.3
 
-    gh = analyze_github_urls(ctx["code"], max_commits=200)
+    # Only the metrics selected for this run (RunOptions.metrics) are computed,
+    # and the network/clone work that only they need is skipped with them.
+    spec = opts.metrics
+    metrics = select_metrics(metric_registry(), spec)
+    costs = {getattr(m, "cost", COST_PURE) for m in metrics}
+
+    ds_ids = list(dict.fromkeys(filter(None, map(dataset_id, ctx["datasets"]))))
+    if ds_ids and (spec is None or COST_NETWORK in costs) and not _expired():
+        # Cached per dataset id, so shared datasets are fetched once per run.
+        with span("datasets"):
+            ctx["dataset_meta"] = dict(
+                run_parallel(
+                    [_dataset_fetcher(d) for d in ds_ids],
+                    timeout=None if deadline is None else max(0.0, deadline - time.monotonic()),
+                )
+            )
+
+    # Within a collate() run, identical sub-computations are done once and the
+    # result is shared by every model that needs it.
+    memo = opts.memo
+    threshold = opts.threshold
+
+    def _shared(key: Tuple[str, ...] | None, fn: Callable[[], Any]) -> Any:
+        return memo.get(key, fn) if memo is not None and key is not None else fn()
+
+    repo_url = next((c for c in ctx["code"] if is_code_url(c)), None)
+
+    def _github() -> Dict[str, Any]:
+        with span("github"):
+            gh: Dict[str, Any] = _shared(
+                ("github", _repo_key(repo_url)) if repo_url else None,
+                lambda: analyze_github_urls(ctx["code"], max_commits=200),
+            )
+        return gh
 
-    # Run all metrics in parallel and collect extras
+    # net_score_latency covers the metrics, the merge and the net score; time
+    # spent cloning and analyzing the GitHub repo is subtracted from it.
     t_net0 = time.perf_counter()
+    gh_s = 0.0
+
+    def _github_by_deadline() -> Dict[str, Any]:
+        nonlocal gh_s
+        t = time.perf_counter()
+        try:
+            return next(iter(_within(_github)), {})
+        finally:
+            gh_s += time.perf_counter() - t
+
     results: Dict[str, MetricResult] = {}
     extras: Dict[str, Any] = {}
-    metrics = metric_registry()
+    digests: Dict[str, str] = {}
+    keys = {m.name: _dedup_key(m, ctx, digests) for m in metrics} if memo is not None else {}
 
     def _run(m: Any) -> Tuple[str, MetricResult, Dict[str, Any]]:
-        r = m.compute(ctx)
+        with span(f"metric.{m.name}", metric=m.name):
+            r = _shared(keys.get(m.name), lambda: m.compute(ctx))
         return (m.name, r, r.extras or {})
 
-    funcs: List[Callable[[], Tuple[str, MetricResult, Dict[str, Any]]]] = []
-
     def _make_thunk(m: Any) -> Callable[[], Tuple[str, MetricResult, Dict[str, Any]]]:
         def thunk() -> Tuple[str, MetricResult, Dict[str, Any]]:
             return _run(m)
 
         return thunk
 
-    for m in metrics:
-        funcs.append(_make_thunk(m))
-
-    for name, r, ex in run_parallel(funcs):
-        results[name] = r
-        if ex:
-            extras.update(ex)
-
-    # Merge GitHub-derived signals where helpful
-    if gh:
-        if "code_quality" in gh:
-            q = results["code_quality"].score
-            results["code_quality"] = MetricResult(
-                score=max(q, float(gh["code_quality"])),
-                latency_ms=results["code_quality"].latency_ms + int(gh.get("code_quality_latency", 0)),
-            )
-        if "performance_claims" in gh:
-            q = results["performance_claims"].score
-            results["performance_claims"] = MetricResult(
-                score=max(q, float(gh["performance_claims"])),
-                latency_ms=results["performance_claims"].latency_ms
-                + int(gh.get("performance_claims_latency", 0)),
-            )
-        if "license" in gh and "license_note" not in extras:
-            extras["license_note"] = gh["license"]
-        if "bus_factor" in gh:
-            q = results["bus_factor"].score
-            results["bus_factor"] = MetricResult(
-                score=max(q, float(gh["bus_factor"])),
-                latency_ms=results["bus_factor"].latency_ms + int(gh.get("bus_factor_latency", 0)),
-            )
+    def _run_all(ms: List[Any]) -> None:
+        # Run metrics in parallel and collect extras; late ones are left out.
+        if _expired():
+            return
+        remaining = None if deadline is None else deadline - time.monotonic()
+        for name, r, ex in run_parallel([_make_thunk(m) for m in ms], timeout=remaining):
+            results[name] = r
+            if ex:
+                extras.update(ex)
+
+    # Weights of the selected metrics, renormalized when a subset was selected.
+    weights = {m.name: NET_WEIGHTS.get(m.name, float(getattr(m, "weight", 0.0))) for m in metrics}
+    total = sum(weights.values())
+    scale = total if spec is not None and total > 0 else 1.0
 
-    # Compute NetScore
-    def _clamp01(x: float) -> float:
-        return max(0.0, min(1.0, x))
+    gh: Dict[str, Any] = {}
+    skipped: List[str] = []
+    if threshold is None:
+        if spec is None or COST_CLONE in costs:
+            gh = _github_by_deadline()
+        _run_all(metrics)
+        _merge_github(results, extras, gh)
+    else:
+        # Progressive: cheap metrics first, then each expensive cost class only
+        # while its results could still move net_score across the threshold.
+        stages = [[m for m in metrics if getattr(m, "cost", COST_PURE) not in EXPENSIVE]]
+        stages += [[m for m in metrics if getattr(m, "cost", COST_PURE) == c] for c in EXPENSIVE]
+        stages = [st for st in stages if st]
+        clone_pending = any(getattr(m, "cost", COST_PURE) == COST_CLONE for m in metrics)
+        for n, stage in enumerate(stages):
+            if n > 0:
+                pending = {m.name for st in stages[n:] for m in st}
+                lo, hi = _net_bounds(weights, results, pending, clone_pending)
+                if lo / scale >= threshold or hi / scale < threshold:
+                    skipped = [m.name for m in metrics if m.name in pending]
+                    break
+            clone_stage = getattr(stage[0], "cost", COST_PURE) == COST_CLONE
+            if clone_stage:
+                gh = _github_by_deadline()
+                clone_pending = False
+            _run_all(stage)
+            if clone_stage:
+                # Merge now so the bounds for the LLM stage see the GitHub scores.
+                _merge_github(results, extras, gh)
 
+    # Compute NetScore; skipped and timed-out metrics count as 0 (the lower bound).
     net = 0.0
-    for k, w in NET_WEIGHTS.items():
+    for k, w in weights.items():
         v = results[k].score if k in results else 0.0
         net += w * _clamp01(v)
+    net /= scale
 
-    net_latency = int((time.perf_counter() - t_net0) * 1000)
+    net_latency = int((time.perf_counter() - t_net0 - gh_s) * 1000)
 
     row: Dict[str, Any] = {
         "name": p.name or "",
         "category": "MODEL",
         "net_score": net,
         "net_score_latency": net_latency,
-        "ramp_up_time": results["ramp_up_time"].score,
-        "ramp_up_time_latency": results["ramp_up_time"].latency_ms,
-        "bus_factor": results["bus_factor"].score,
-        "bus_factor_latency": results["bus_factor"].latency_ms,
-        "performance_claims": results["performance_claims"].score,
-        "performance_claims_latency": results["performance_claims"].latency_ms,
-        "license": results["license"].score,
-        "license_latency": results["license"].latency_ms,
-        "size_score": extras.get("size_score", {}),
-        "size_score_latency": results["size_score"].latency_ms + fetch_ms,
-        "dataset_and_code_score": results["dataset_and_code_score"].score,
-        "dataset_and_code_score_latency": results["dataset_and_code_score"].latency_ms,
-        "dataset_quality": results["dataset_quality"].score,
-        "dataset_quality_latency": results["dataset_quality"].latency_ms,
-        "code_quality": results["code_quality"].score,
-        "code_quality_latency": results["code_quality"].latency_ms,
     }
-
-    allowed = {
-        "url",
-        "name",
-        "category",
-        "net_score",
-        "net_score_latency",
-        "ramp_up_time",
-        "ramp_up_time_latency",
-        "bus_factor",
-        "bus_factor_latency",
-        "performance_claims",
-        "performance_claims_latency",
-        "license",
-        "license_latency",
-        "size_score",
-        "size_score_latency",
-        "dataset_and_code_score",
-        "dataset_and_code_score_latency",
-        "dataset_quality",
-        "dataset_quality_latency",
-        "code_quality",
-        "code_quality_latency",
-    }
-    return {k: v for k, v in row.items() if k in allowed}
+    order = [k for k in ROW_METRICS if k in weights]
+    order += [m.name for m in metrics if m.name not in ROW_METRICS]
+    for k in order:
+        r = results.get(k)
+        if r is None:
+            row[k] = None
+            row[f"{k}_latency"] = 0
+        elif k == "size_score":
+            row[k] = extras.get("size_score", {})
+            row[f"{k}_latency"] = r.latency_ms + fetch_ms
+        else:
+            row[k] = r.score
+            row[f"{k}_latency"] = r.latency_ms
+    if skipped:
+        row["skipped"] = skipped
+    timed_out += [m.name for m in metrics if m.name not in results and m.name not in skipped]
+    if timed_out:
+        row["timed_out"] = timed_out
+    return row
 
 
-def collate(urls: Iterable[str]) -> Iterable[Dict[str, Any]]:
+def _group(urls: Iterable[str]) -> Iterator[Tuple[int, str, List[str], List[str]]]:
+    """Attach preceding dataset/code lines to each model line (with its input index), lazily."""
     ds_stack: List[str] = []
     code_stack: List[str] = []
-    pending: List[Tuple[str, List[str], List[str]]] = []
-    for u in urls:
+    for i, u in enumerate(urls):
         kind = parse_url(u).kind
         if kind == "hf_dataset":
             ds_stack.append(u)
-        elif kind == "github":
+        elif kind in CODE_KINDS:
             code_stack.append(u)
         elif kind == "hf_model":
-            pending.append((u, list(ds_stack), list(code_stack)))
+            yield (i, u, list(ds_stack), list(code_stack))
             ds_stack.clear()
             code_stack.clear()
-        else:
+
+
+def collate(urls: Iterable[str]) -> Iterable[Dict[str, Any]]:
+    """
+    Score every model line, running up to ``max_workers`` models at once.
+
+    Rows are released in input order unless ``ordered`` is off; ``window`` caps
+    how many models may be in flight or buffered behind a slow one. All three
+    come from the active :class:`~core.options.RunOptions`.
+
+    When the options carry a checkpoint journal, models already recorded in it
+    are replayed instead of recomputed, and every new row is journaled before
+    it is emitted.
+
+    With an incremental state, a model whose fingerprint (model revision,
+    dataset shas, repo HEAD shas, dataset/code URLs) matches the previous run
+    reuses its old row. Model revisions then come from the bulk listings
+    below, as if ``prefetch`` were on.
+
+    With ``model_timeout`` or a run ``deadline`` set, a model out of time is
+    emitted with the metrics that finished and a ``timed_out`` list; such
+    partial rows are not journaled, so a resumed run recomputes them.
+
+    With ``prefetch`` on, the whole input is grouped first and every author
+    with several models is listed in bulk, so most models need no
+    ``model_info`` call of their own.
+
+    Models in one run share a work memo (``RunOptions.memo``, created per run
+    if unset): a GitHub repo is analyzed once however many models list it, and
+    metrics that declare ``dedup_inputs`` run once per distinct input.
+    """
+    opts = current_options()
+    journal = opts.journal
+    incremental = opts.incremental
+    # Bounded so a long stream keeps constant memory; an evicted entry is only recomputed.
+    memo = opts.memo if opts.memo is not None else SingleFlight(max_entries=DEFAULT_MAX_ENTRIES)
+
+    def _make_thunk(
+        i: int, u: str, ds: List[str], code: List[str]
+    ) -> Callable[[], Tuple[int, str, Dict[str, Any]]]:
+        def thunk() -> Tuple[int, str, Dict[str, Any]]:
+            done = journal.get(i, u) if journal is not None else None
+            if done is not None:
+                return (i, u, done)
+            fp = None
+            if incremental is not None:
+                # Revision lookups are network calls too, so they share the deadline.
+                fp = next(
+                    iter(_call_by(_model_deadline(), lambda: incremental.fingerprint(u, ds, code))),
+                    None,
+                )
+            done = incremental.get(u, fp) if incremental is not None else None
+            if done is not None:
+                return (i, u, done)
+            with use_options(memo=memo):
+                row = compute_one(u, ds, code)
+            if incremental is not None:
+                # A partial row is emitted but never reused by the next run.
+                incremental.record(u, None if row.get("timed_out") else fp, row)
+            return (i, u, row)
+
+        return thunk
+
+    groups: Iterable[Tuple[int, str, List[str], List[str]]] = _group(urls)
+    if (opts.prefetch or incremental is not None) and not opts.hf_local:
+        groups = list(groups)
+        with span("prefetch", models=len(groups)):
+            prefetch_hf_models(f"{p.owner}/{p.name}" for p in (parse_url(g[1]) for g in groups))
+    thunks = (_make_thunk(i, u, ds, code) for (i, u, ds, code) in groups)
+    for i, u, row in iter_parallel(
+        thunks, max_workers=opts.max_workers, window=opts.window, ordered=opts.ordered
+    ):
+        if not row:
             continue
-    for (u, ds, code) in pending:
-        row = compute_one(u, ds, code)
-        if row:
-            yield row
+        if journal is not None and not row.get("timed_out"):
+            journal.record(i, u, row)
+        yield row
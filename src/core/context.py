@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, Mapping, MutableMapping, Optional, Tuple
+
+_FIELDS: Tuple[str, ...] = (
+    "repo_id",
+    "files",
+    "file_index",
+    "card_data",
+    "hf_license",
+    "last_modified",
+    "downloads",
+    "likes",
+    "readme_text",
+    "index_json",
+    "safetensors",
+    "datasets",
+    "dataset_meta",
+    "code",
+    "recency_score",
+)
+_SLOTTED = frozenset(_FIELDS)
+
+
+class ModelContext(MutableMapping[str, Any]):
+    """
+    Per-model metric context.
+
+    The keys every model has are stored in slots rather than a per-instance
+    dict; anything else goes to a small overflow dict created on first use.
+    It is a MutableMapping, so metrics keep calling ``ctx.get("files")`` etc.
+    exactly as they did with the plain dict.
+    """
+
+    __slots__ = _FIELDS + ("_extra",)
+
+    def __init__(self, data: Optional[Mapping[str, Any]] = None, **kw: Any) -> None:
+        self._extra: Optional[Dict[str, Any]] = None
+        if data:
+            self.update(data)
+        if kw:
+            self.update(kw)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _SLOTTED:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _SLOTTED:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _SLOTTED:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is None:
+            raise KeyError(key)
+        else:
+            del self._extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for k in _FIELDS:
+            if hasattr(self, k):
+                yield k
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"ModelContext({dict(self)!r})"
@@ -1,60 +1,160 @@
 from __future__ import annotations
 
 import os
+import sys
 import tempfile
 import time
-from typing import Any, Dict, Iterator, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.request import url2pathname
 
-from git import Repo
-from github import Github
+from .options import current_options
+from .tracing import span
+from .url import is_code_url, parse_url
+
+_this = sys.modules[__name__]
+
+
+def __getattr__(name: str) -> Any:
+    # PyGithub and GitPython are slow to import; load them on first use only.
+    if name == "Github":
+        from github import Github
+
+        globals()[name] = Github
+        return Github
+    if name == "Repo":
+        from git import Repo
+
+        globals()[name] = Repo
+        return Repo
+    if name == "Git":
+        from git.cmd import Git
+
+        globals()[name] = Git
+        return Git
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def local_checkout(url: str) -> Optional[str]:
+    """
+    An existing checkout of a code URL, to be scanned in place rather than
+    cloned: the directory of a ``file://`` URL, or for a GitHub URL with
+    RunOptions.repos_dir set, ``<repos_dir>/<owner>/<name>`` and then
+    ``<repos_dir>/<name>``. None if there is no such directory.
+    """
+    u = url.strip()
+    p = urlparse(u)
+    if p.scheme.lower() == "file":
+        path = url2pathname(p.path)
+        return path if os.path.isdir(path) else None
+    root = current_options().repos_dir
+    parsed = parse_url(u)
+    if not root or parsed.kind != "github" or not parsed.owner or not parsed.name:
+        return None
+    name = parsed.name[:-4] if parsed.name.endswith(".git") else parsed.name
+    for path in (os.path.join(root, parsed.owner, name), os.path.join(root, name)):
+        if os.path.isdir(path):
+            return path
+    return None
+
+
+def _scan(root: str) -> Tuple[float, float, float, float]:
+    """(code_quality, its ms, performance_claims, its ms) from a checkout's files."""
+    t2 = time.perf_counter()
+    with span("github.scan.quality"):
+        has_tests = any("test" in f.lower() for f in _walk(root, (".py", ".ipynb")))
+        has_ci = any((".github/workflows/" in f.replace("\\", "/")) for f in _walk(root))
+        has_type = any(f.endswith(".pyi") for f in _walk(root))
+    code_quality = min(1.0, 0.5 * int(has_tests) + 0.3 * int(has_ci) + 0.2 * int(has_type))
+    quality_ms = (time.perf_counter() - t2) * 1000
+
+    t3 = time.perf_counter()
+    with span("github.scan.eval"):
+        names = (os.path.basename(f).lower() for f in _walk(root, (".py", ".ipynb", ".md")))
+        has_eval = any(("eval" in n or "benchmark" in n) for n in names)
+    perf_claims = 1.0 if has_eval else 0.0
+    eval_ms = (time.perf_counter() - t3) * 1000
+    return code_quality, quality_ms, perf_claims, eval_ms
 
 
 def analyze_github_urls(urls: List[str], max_commits: int = 200) -> Dict[str, Any]:
     t0 = time.perf_counter()
-    gh = Github()
     result: Dict[str, Any] = {}
+    repo_url = next((u for u in urls if is_code_url(u)), None)
+    if not repo_url:
+        return result
+    # A local checkout (file:// or under repos_dir) is scanned in place; a
+    # file:// repo has no GitHub API data, so only the scan signals are set.
+    local = local_checkout(repo_url)
+    on_github = "github.com" in repo_url.lower()
+    if not on_github and local is None:
+        return result
     try:
-        repo_url = next((u for u in urls if "github.com" in u.lower()), None)
-        if not repo_url:
-            return result
-        parts = [x for x in repo_url.split("/") if x][-2:]
-        if len(parts) != 2:
-            return result
-        owner, name = parts
-        r = gh.get_repo(f"{owner}/{name}")
-
-        contribs = list(r.get_contributors()[:50])
-        stars = r.stargazers_count or 0
-        bus = min(1.0, (len(contribs) / 10.0) + (stars / 5000.0) * 0.2)
-        result["bus_factor"] = bus
-        result["bus_factor_latency"] = int((time.perf_counter() - t0) * 1000)
-
-        t1 = time.perf_counter()
-        with tempfile.TemporaryDirectory() as tmp:
-            Repo.clone_from(repo_url, tmp, depth=1)
-            has_tests = any("test" in f.lower() for f in _walk(tmp, (".py", ".ipynb")))
-            has_ci = any((".github/workflows/" in f.replace("\\", "/")) for f in _walk(tmp))
-            has_type = any(f.endswith(".pyi") for f in _walk(tmp))
-            code_quality = min(1.0, 0.5 * int(has_tests) + 0.3 * int(has_ci) + 0.2 * int(has_type))
-            has_eval = any(
-                ("eval" in os.path.basename(f).lower() or "benchmark" in os.path.basename(f).lower())
-                for f in _walk(tmp, (".py", ".ipynb", ".md"))
-            )
-            perf_claims = 1.0 if has_eval else 0.0
+        r = None
+        if on_github:
+            gh = _this.Github()
+            parts = [x for x in repo_url.split("/") if x][-2:]
+            if len(parts) != 2:
+                return result
+            owner, name = parts
+            with span("github.api", kind="client", repo=f"{owner}/{name}"):
+                r = gh.get_repo(f"{owner}/{name}")
+                contribs = list(r.get_contributors()[:50])
+                stars = r.stargazers_count or 0
+            bus = min(1.0, (len(contribs) / 10.0) + (stars / 5000.0) * 0.2)
+            result["bus_factor"] = bus
+            result["bus_factor_latency"] = int((time.perf_counter() - t0) * 1000)
+
+        if local is not None:
+            clone_ms = 0.0
+            code_quality, quality_ms, perf_claims, eval_ms = _scan(local)
+        else:
+            with tempfile.TemporaryDirectory() as tmp:
+                t1 = time.perf_counter()
+                with span("clone", kind="client", url=repo_url):
+                    _this.Repo.clone_from(repo_url, tmp, depth=1)
+                clone_ms = (time.perf_counter() - t1) * 1000
+                code_quality, quality_ms, perf_claims, eval_ms = _scan(tmp)
 
+        # Both signals come from the same clone, so each latency includes it.
         result["code_quality"] = code_quality
-        result["code_quality_latency"] = int((time.perf_counter() - t1) * 1000)
+        result["code_quality_latency"] = int(clone_ms + quality_ms)
         result["performance_claims"] = perf_claims
-        result["performance_claims_latency"] = 0
-        lic = getattr(r.get_license().license, "spdx_id", None) if hasattr(r, "get_license") else None
+        result["performance_claims_latency"] = int(clone_ms + eval_ms)
+        if r is None:
+            return result
+        t4 = time.perf_counter()
+        with span("github.api", kind="client", repo=f"{owner}/{name}"):
+            lic = None
+            if hasattr(r, "get_license"):
+                lic = getattr(r.get_license().license, "spdx_id", None)
         if lic:
             result["license"] = (lic or "").lower()
-            result["license_latency"] = 0
+            result["license_latency"] = int((time.perf_counter() - t4) * 1000)
         return result
     except Exception:
         return result
 
 
+def head_sha(url: str) -> Optional[str]:
+    """
+    Commit sha of the remote HEAD via ``git ls-remote`` (no clone), or of the
+    local checkout's HEAD when one is used; None on failure.
+    """
+    local = local_checkout(url)
+    try:
+        if local is not None:
+            with span("git.rev_parse", path=local):
+                out = _this.Git(local).rev_parse("HEAD")
+        else:
+            with span("github.ls_remote", kind="client", url=url):
+                out = _this.Git().ls_remote(url, "HEAD")
+    except Exception:
+        return None
+    sha = str(out).split("\t", 1)[0].strip()
+    return sha or None
+
+
 def _walk(root: str, exts: Optional[tuple[str, ...]] = None) -> Iterator[str]:
     for d, _, files in os.walk(root):
         for f in files:
@@ -1,14 +1,68 @@
 from __future__ import annotations
 
 import io
+import json
+import sys
 import time
-from typing import Any, Callable, Dict, Tuple
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
 
-from huggingface_hub import HfApi, hf_hub_download
+from metrics.file_index import FileIndex
+from metrics.size import INDEX_FILES, WEIGHT_EXTS
 
+from . import hf_local, safetensors
+from .cache import DEFAULT_MAX_ENTRIES, MetadataCache, SingleFlight
+from .options import current_options
+from .parallel import run_parallel
+from .tracing import span
 from .url import ParsedURL
 
-_api = HfApi()
+_this = sys.modules[__name__]
+
+# Dataset facts, fetched once per dataset id however many models reference it.
+DATASET_CACHE = MetadataCache("hf_datasets")
+
+# ModelInfo objects from list_models() listings, keyed by lowercase repo id.
+# prefetch_hf_models() fills it; fetch_hf_model_meta() consults it first.
+# Entries expire so a long-lived process does not keep serving old revisions.
+LISTED_TTL_S = 3600.0
+LISTED_MODELS = SingleFlight(max_entries=DEFAULT_MAX_ENTRIES, ttl_s=LISTED_TTL_S)
+
+# Fields requested per model when listing an author's models. Listings carry
+# no file sizes, so weights are sized from the hub's safetensors totals instead.
+LIST_EXPAND = [
+    "sha", "lastModified", "cardData", "siblings", "tags", "downloads", "likes", "safetensors"
+]
+
+# Authors with fewer requested models are cheaper to fetch one by one.
+PREFETCH_MIN_MODELS = 4
+
+# A listing reads at most this many of an author's models per requested one,
+# so a prolific author is not paged through in full for a handful of models.
+LIST_ROWS_PER_MODEL = 25
+
+# Card metadata fields that indicate the dataset is documented beyond a name.
+DATASET_CARD_FIELDS = (
+    "pretty_name",
+    "task_categories",
+    "language",
+    "size_categories",
+    "source_datasets",
+    "annotations_creators",
+)
+
+
+def __getattr__(name: str) -> Any:
+    # huggingface_hub is imported, and the shared client built, on first use only.
+    if name in ("HfApi", "hf_hub_download"):
+        import huggingface_hub
+
+        value = getattr(huggingface_hub, name)
+    elif name == "_api":
+        value = _this.HfApi()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
 
 
 def _timer() -> Tuple[float, Callable[[], int]]:
@@ -16,6 +70,15 @@ def _timer() -> Tuple[float, Callable[[], int]]:
     return start, lambda: int((time.perf_counter() - start) * 1000)
 
 
+def _card_dict(info: Any) -> Dict[str, Any]:
+    cd = getattr(info, "card_data", None) or getattr(info, "cardData", None)
+    if cd is None:
+        return {}
+    d = getattr(cd, "to_dict", None)
+    data = d() if callable(d) else cd
+    return data if isinstance(data, dict) else {}
+
+
 def _extract_hf_license(info: Any) -> str | None:
     def ok(v: str | None) -> str | None:
         if not v:
@@ -51,30 +114,270 @@ def _extract_hf_license(info: Any) -> str | None:
 def _readme_text(repo_id: str) -> str:
     """Best-effort fetch of README.md, no crash if missing."""
     try:
-        path = hf_hub_download(repo_id=repo_id, filename="README.md", repo_type="model")
+        with span("fetch.readme", kind="client", repo_id=repo_id):
+            path = _this.hf_hub_download(repo_id=repo_id, filename="README.md", repo_type="model")
         with io.open(path, "r", encoding="utf-8", errors="ignore") as f:
             return f.read()
     except Exception:
         return ""
 
 
+def _index_json(repo_id: str, filename: str) -> Optional[Dict[str, Any]]:
+    """Best-effort fetch of a sharded-weights index file; None if missing or invalid."""
+    try:
+        with span("fetch.index", kind="client", repo_id=repo_id, filename=filename):
+            path = _this.hf_hub_download(repo_id=repo_id, filename=filename, repo_type="model")
+        with io.open(path, "r", encoding="utf-8", errors="ignore") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else None
+    except Exception:
+        return None
+
+
+def fetch_hf_model_revision(p: ParsedURL) -> Optional[str]:
+    """
+    Current commit sha (or lastModified) of a model, from one lightweight
+    ``model_info`` call without file metadata; None if it cannot be read.
+    """
+    repo_id = f"{p.owner}/{p.name}"
+    root = current_options().hf_local
+    if root:
+        try:
+            return hf_local.open_repo(root, repo_id).sha
+        except OSError:
+            return None
+    listed_sha = getattr(LISTED_MODELS.peek(repo_id.lower()), "sha", None)
+    if listed_sha:
+        return str(listed_sha)
+    try:
+        with span("fetch.revision", kind="client", repo_id=repo_id):
+            info = _this._api.model_info(repo_id, expand=["sha", "lastModified"])
+    except Exception:
+        return None
+    rev = getattr(info, "sha", None) or getattr(info, "lastModified", None)
+    return str(rev) if rev else None
+
+
+def fetch_hf_dataset_revision(dataset_id: str) -> Optional[str]:
+    """
+    Current commit sha (or lastModified) of a dataset, from one lightweight
+    ``dataset_info`` call; uncached, unlike fetch_hf_dataset_meta(), so a
+    change is seen at once. None if it cannot be read.
+    """
+    root = current_options().hf_local
+    if root:
+        try:
+            return hf_local.open_repo(root, dataset_id, "dataset").sha
+        except OSError:
+            return None
+    try:
+        with span("fetch.dataset_revision", kind="client", dataset_id=dataset_id):
+            info = _this._api.dataset_info(dataset_id, expand=["sha", "lastModified"])
+    except Exception:
+        return None
+    rev = getattr(info, "sha", None) or getattr(info, "lastModified", None)
+    return str(rev) if rev else None
+
+
+def prefetch_hf_models(repo_ids: Iterable[str], min_models: int = PREFETCH_MIN_MODELS) -> int:
+    """
+    Fill LISTED_MODELS for ``repo_ids`` with one paged ``list_models`` listing
+    per author that owns at least ``min_models`` of them, instead of one
+    ``model_info`` call per model. A listing stops after LIST_ROWS_PER_MODEL
+    rows per requested model. Returns how many models were found; the rest
+    (and any a listing cannot serve) are fetched individually later.
+    """
+    by_author: Dict[str, Set[str]] = {}
+    for rid in repo_ids:
+        author, sep, _ = rid.partition("/")
+        if sep:
+            by_author.setdefault(author.lower(), set()).add(rid.lower())
+
+    def _list(author: str, wanted: Set[str]) -> int:
+        found = 0
+        try:
+            with span("fetch.list_models", kind="client", author=author, wanted=len(wanted)):
+                listing = _this._api.list_models(
+                    author=author, expand=LIST_EXPAND, limit=len(wanted) * LIST_ROWS_PER_MODEL
+                )
+                for info in listing:
+                    key = str(getattr(info, "id", "")).lower()
+                    if key in wanted:
+                        LISTED_MODELS.put(key, info)
+                        found += 1
+                        if found == len(wanted):
+                            break
+        except Exception:
+            pass  # whatever was listed is kept; the gaps fall back to model_info
+        return found
+
+    tasks = [
+        lambda a=a, w=w: _list(a, w) for a, w in by_author.items() if len(w) >= max(1, min_models)
+    ]
+    return sum(run_parallel(tasks, max_workers=min(8, len(tasks)))) if tasks else 0
+
+
+def _listing_usable(info: Any) -> bool:
+    """
+    True if a listed model can be scored without file sizes: every weight file
+    is safetensors, and the hub's totals for them came with the listing.
+    """
+    siblings = getattr(info, "siblings", None)
+    if siblings is None:
+        return False
+    names = [str(getattr(s, "rfilename", "")).lower() for s in siblings]
+    weights = [n for n in names if n.endswith(WEIGHT_EXTS)]
+    if not all(n.endswith(".safetensors") for n in weights):
+        return False
+    st = getattr(info, "safetensors", None)
+    return not weights or safetensors.summary_from_totals(st, len(weights)) is not None
+
+
 def fetch_hf_model_meta(p: ParsedURL) -> Tuple[Dict[str, Any], int]:
     start, end = _timer()
-    info = _api.model_info(f"{p.owner}/{p.name}", files_metadata=True)
+    root = current_options().hf_local
+    if root:
+        with span("fetch.local", repo_id=f"{p.owner}/{p.name}"):
+            repo = hf_local.open_repo(root, f"{p.owner}/{p.name}")
+        latency_ms = end()
+        return _model_data(repo, listed=False, local=True) or {}, latency_ms
+    listed = LISTED_MODELS.peek(f"{p.owner}/{p.name}".lower())
+    if listed is not None and _listing_usable(listed):
+        data = _model_data(listed, listed=True)
+        if data is not None:
+            return data, end()
+    with span("fetch.model_info", kind="client", repo_id=f"{p.owner}/{p.name}"):
+        info = _this._api.model_info(f"{p.owner}/{p.name}", files_metadata=True)
     latency_ms = end()
+    return _model_data(info, listed=False) or {}, latency_ms
+
+
+def _model_data(info: Any, listed: bool, local: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Model metadata plus the README, index and safetensors summary fetched
+    alongside it (read from disk when ``info`` is a ``local`` LocalRepo).
+    A ``listed`` model is sized from the hub's safetensors totals with no
+    header or index reads; None if it has none.
+    """
     siblings = list(info.siblings or [])
-    files = [sib.rfilename for sib in (info.siblings or [])]
-    files_meta = [{"rfilename": sib.rfilename, "size": getattr(sib, "size", 0)} for sib in siblings]
+    index = FileIndex(
+        (sib.rfilename for sib in siblings), (getattr(sib, "size", 0) for sib in siblings)
+    )
+    # The index JSON is only needed when the listing has no weight sizes; fetch
+    # it alongside the README so SizeMetric never has to go to the network.
+    unsized_weights = index.ext_bytes(WEIGHT_EXTS)[0] == 0
+    index_name = index.first_path(INDEX_FILES) if unsized_weights and not listed else None
+    # Safetensors headers give exact parameter counts for a few KB per shard,
+    # but that is one request per shard: read them by default only when the
+    # listing has no sizes for them (or from a local mirror, where it is cheap).
+    st_names = [index.paths[i] for i in index.with_ext((".safetensors",))]
+    unsized = index.ext_bytes((".safetensors",))[0] == 0
+    fetched: Dict[str, Any] = {"index_json": None, "safetensors": None}
+    if listed and st_names:
+        fetched["safetensors"] = safetensors.summary_from_totals(
+            getattr(info, "safetensors", None), len(st_names)
+        )
+        if fetched["safetensors"] is None:
+            return None
+        st_names = []
+    elif not (local or unsized or current_options().param_counts):
+        st_names = []
+
+    def _get_readme() -> None:
+        fetched["readme_text"] = info.read_text("README.md") if local else _readme_text(info.id)
+
+    def _get_index() -> None:
+        name = index_name or ""
+        fetched["index_json"] = info.read_json(name) if local else _index_json(info.id, name)
+
+    def _get_safetensors() -> None:
+        fetched["safetensors"] = (
+            info.safetensors_summary(st_names)
+            if local
+            else safetensors.fetch_summary(info.id, st_names)
+        )
+
+    tasks = [_get_readme]
+    if index_name:
+        tasks.append(_get_index)
+    if st_names:
+        tasks.append(_get_safetensors)
+    if local:
+        # Disk reads are cheap enough that a thread pool would only add overhead.
+        for task in tasks:
+            task()
+    else:
+        run_parallel(tasks, max_workers=len(tasks))
     card_data = info.cardData or {}
-    data: Dict[str, Any] = {
-        "files": files,
-        "files_meta": files_meta,
+    return {
+        "files": index.paths,
+        "file_index": index,
         "card_data": card_data,
         "hf_license": _extract_hf_license(info),
         "last_modified": str(getattr(info, "lastModified", "")),
         "downloads": getattr(info, "downloads", None),
         "likes": getattr(info, "likes", None),
-        "readme_text": _readme_text(info.id),
+        "readme_text": fetched["readme_text"],
+        "index_json": fetched["index_json"],
+        "safetensors": fetched["safetensors"],
         "repo_id": info.id,
     }
-    return data, latency_ms
+
+
+def _dataset_facts(info: Any) -> Dict[str, Any]:
+    """Compact, JSON-serialisable facts about a dataset from its DatasetInfo."""
+    card = _card_dict(info)
+    configs = card.get("dataset_info") or []
+    if isinstance(configs, dict):
+        configs = [configs]
+    splits: Dict[str, int] = {}
+    n_features = 0
+    for cfg in configs if isinstance(configs, list) else []:
+        if not isinstance(cfg, dict):
+            continue
+        n_features = max(n_features, len(cfg.get("features") or []))
+        for sp in cfg.get("splits") or []:
+            if isinstance(sp, dict) and sp.get("name"):
+                name = str(sp["name"])
+                splits[name] = splits.get(name, 0) + int(sp.get("num_examples") or 0)
+    siblings = [getattr(s, "rfilename", "") for s in getattr(info, "siblings", None) or []]
+    return {
+        "id": getattr(info, "id", None),
+        "license": _extract_hf_license(info),
+        "has_card": any(f.lower() == "readme.md" for f in siblings),
+        "card_fields": [k for k in DATASET_CARD_FIELDS if card.get(k)],
+        "splits": splits,
+        "num_rows": sum(splits.values()),
+        "num_features": n_features,
+        "downloads": getattr(info, "downloads", None),
+        "likes": getattr(info, "likes", None),
+    }
+
+
+def fetch_hf_dataset_meta(dataset_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Dataset card facts, splits and row counts for ``dataset_id`` via
+    ``HfApi.dataset_info``; None if the dataset cannot be read. Results go
+    through DATASET_CACHE, so each id is fetched at most once per process
+    (and once per TTL when $METADATA_CACHE_DIR is set).
+
+    In local mirror mode (RunOptions.hf_local) the facts are read from the
+    dataset's snapshot instead, uncached; None if it is not mirrored.
+    """
+    root = current_options().hf_local
+    if root:
+        try:
+            return _dataset_facts(hf_local.open_repo(root, dataset_id, "dataset"))
+        except OSError:
+            return None
+
+    def _load() -> Optional[Dict[str, Any]]:
+        try:
+            with span("fetch.dataset_info", kind="client", dataset_id=dataset_id):
+                info = _this._api.dataset_info(dataset_id)
+        except Exception:
+            return None
+        return _dataset_facts(info)
+
+    result: Optional[Dict[str, Any]] = DATASET_CACHE.get(dataset_id, _load)
+    return result
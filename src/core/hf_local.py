@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from .safetensors import MAX_HEADER_BYTES, MAX_SHARDS, summarize
+
+# Files at least this large are memory-mapped instead of read into memory.
+MMAP_MIN_BYTES = 1024 * 1024
+
+# Directories inside a snapshot that are not part of the repository.
+_SKIP_DIRS = frozenset({".git", ".cache", ".huggingface"})
+
+
+def _read(path: str, start: int = 0, stop: Optional[int] = None) -> bytes:
+    """Bytes ``start:stop`` of a file; large files are mapped, so only those pages are read."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        stop = size if stop is None else min(stop, size)
+        if stop <= start:
+            return b""
+        if size < MMAP_MIN_BYTES:
+            f.seek(start)
+            return f.read(stop - start)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            return m[start:stop]
+
+
+def read_safetensors_header(path: str) -> Dict[str, Any]:
+    """Parse the JSON header of a local .safetensors file without touching its tensor data."""
+    head = _read(path, 0, 8)
+    if len(head) < 8:
+        raise ValueError(f"{path}: too short for a safetensors file")
+    (n,) = struct.unpack("<Q", head)
+    if n > MAX_HEADER_BYTES:
+        raise ValueError(f"{path}: header length {n} exceeds the format limit")
+    body = _read(path, 8, 8 + n)
+    if len(body) != n:
+        raise ValueError(f"{path}: truncated header")
+    header = json.loads(body.decode("utf-8"))
+    if not isinstance(header, dict):
+        raise ValueError(f"{path}: header is not a JSON object")
+    return header
+
+
+def _front_matter(text: str) -> Dict[str, Any]:
+    """The YAML metadata block at the top of a model or dataset card, or {}."""
+    if not text.startswith("---"):
+        return {}
+    end = text.find("\n---", 3)
+    if end == -1:
+        return {}
+    try:
+        import yaml  # type: ignore[import-untyped]  # installed with huggingface_hub
+
+        data = yaml.safe_load(text[3:end])
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def snapshot_dir(
+    root: str, repo_id: str, repo_type: str = "model", revision: str = "main"
+) -> Optional[str]:
+    """
+    Directory holding ``repo_id``'s files under ``root``, or None.
+
+    ``root`` may be a hub cache (``models--owner--name/snapshots/<sha>/``,
+    with ``refs/<revision>`` naming the sha; the newest snapshot is used if
+    the ref is missing) or a plain mirror laid out as ``<root>/<owner>/<name>``
+    (``<root>/datasets/<owner>/<name>`` for datasets).
+    """
+    base = os.path.join(root, f"{repo_type}s--{repo_id.replace('/', '--')}")
+    snaps = os.path.join(base, "snapshots")
+    if os.path.isdir(snaps):
+        try:
+            with open(os.path.join(base, "refs", revision), "r", encoding="utf-8") as f:
+                sha = f.read().strip()
+        except OSError:
+            sha = ""
+        if sha and os.path.isdir(os.path.join(snaps, sha)):
+            return os.path.join(snaps, sha)
+        found = [os.path.join(snaps, d) for d in os.listdir(snaps)]
+        found = [d for d in found if os.path.isdir(d)]
+        if found:
+            return max(found, key=os.path.getmtime)
+    plain = os.path.join(root, *([] if repo_type == "model" else [f"{repo_type}s"]), repo_id)
+    return plain if os.path.isdir(plain) else None
+
+
+class LocalRepo:
+    """
+    One model or dataset snapshot on disk, shaped like the hub's ModelInfo /
+    DatasetInfo so hf_api builds the same metadata from it: ``id``, ``sha``,
+    ``siblings`` (with sizes), ``lastModified`` and the card's YAML as
+    ``cardData``. Download counts and likes are unknown offline (None).
+    """
+
+    def __init__(self, repo_id: str, path: str) -> None:
+        self.id = repo_id
+        self.path = path
+        in_cache = os.path.basename(os.path.dirname(path)) == "snapshots"
+        self.siblings: List[Any] = []
+        newest = os.path.getmtime(path)
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(d for d in dirnames if d not in _SKIP_DIRS)
+            for name in sorted(filenames):
+                full = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(full)  # follows the cache's symlinks into blobs/
+                except OSError:
+                    continue
+                newest = max(newest, st.st_mtime)
+                rel = os.path.relpath(full, path).replace(os.sep, "/")
+                self.siblings.append(SimpleNamespace(rfilename=rel, size=st.st_size))
+        modified = datetime.fromtimestamp(newest, tz=timezone.utc)
+        self.lastModified = modified.isoformat().replace("+00:00", "Z")
+        # A cache snapshot is named by its commit sha; a plain mirror only has mtimes.
+        self.sha = os.path.basename(path) if in_cache else f"mtime:{newest:.0f}"
+        self.cardData = self.card_data = _front_matter(self.read_text("README.md"))
+        self.tags: List[str] = []
+        self.downloads = None
+        self.likes = None
+
+    def _file(self, filename: str) -> str:
+        return os.path.join(self.path, *filename.split("/"))
+
+    def read_text(self, filename: str) -> str:
+        """A file's text, or "" if it is missing."""
+        try:
+            return _read(self._file(filename)).decode("utf-8", errors="ignore")
+        except OSError:
+            return ""
+
+    def read_json(self, filename: str) -> Optional[Dict[str, Any]]:
+        """A JSON object file, or None if it is missing or invalid."""
+        try:
+            data = json.loads(_read(self._file(filename)))
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def safetensors_summary(self, filenames: List[str]) -> Optional[Dict[str, Any]]:
+        """summarize() of the given shards' headers; None as in safetensors.fetch_summary."""
+        if not filenames or len(filenames) > MAX_SHARDS:
+            return None
+        try:
+            return summarize(read_safetensors_header(self._file(f)) for f in filenames)
+        except (OSError, ValueError):
+            return None
+
+
+def open_repo(root: str, repo_id: str, repo_type: str = "model") -> LocalRepo:
+    """The local snapshot of ``repo_id``; raises FileNotFoundError if ``root`` has none."""
+    path = snapshot_dir(root, repo_id, repo_type)
+    if path is None:
+        raise FileNotFoundError(f"{repo_type} {repo_id} not found in local mirror {root}")
+    return LocalRepo(repo_id, path)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from metrics.dataset_quality import dataset_id
+
+from .cache import SingleFlight
+from .github import head_sha
+from .hf_api import fetch_hf_dataset_revision, fetch_hf_model_revision
+from .options import current_options
+from .url import is_code_url, parse_url
+
+# Bump when scoring changes so every stored row is recomputed once.
+STATE_VERSION = 1
+
+
+class IncrementalState:
+    """
+    Fingerprints and rows of the previous run, keyed by model URL.
+
+    A fingerprint covers the model's current revision, the sha of each
+    dataset and the HEAD sha of each code repo on its line (of the local
+    checkout when one is used), the dataset/code URLs themselves and the
+    metric selection and threshold, all of which are cheap to query. Each
+    revision is looked up once per run however many lines share it. collate()
+    reuses the stored row when the fingerprint is unchanged and recomputes
+    otherwise. save() writes only the models seen in this run, so entries
+    dropped from the input also leave the state.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._old: Dict[str, Dict[str, Any]] = self._load()
+        self._new: Dict[str, Dict[str, Any]] = {}
+        self._revisions = SingleFlight()
+        self.reused = 0
+        self.rescored = 0
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        if not isinstance(data, dict) or data.get("version") != STATE_VERSION:
+            return {}
+        models = data.get("models")
+        return models if isinstance(models, dict) else {}
+
+    def __len__(self) -> int:
+        return len(self._old)
+
+    def _revision(self, key: Hashable, fn: Callable[[], Optional[str]]) -> Optional[str]:
+        rev: Optional[str] = self._revisions.get(key, fn)
+        return rev
+
+    def fingerprint(self, url: str, datasets: List[str], code: List[str]) -> Optional[str]:
+        """Fingerprint of a model line's inputs, or None if any revision is unknown."""
+        revs = [self._revision(("model", url), lambda: fetch_hf_model_revision(parse_url(url)))]
+        for d in filter(None, map(dataset_id, datasets)):
+            revs.append(self._revision(("dataset", d), partial(fetch_hf_dataset_revision, d)))
+        for c in filter(is_code_url, code):
+            revs.append(self._revision(("head", c), partial(head_sha, c)))
+        if None in revs:
+            return None
+        opts = current_options()
+        blob = json.dumps(
+            [revs, datasets, code, opts.metrics, opts.threshold], separators=(",", ":")
+        )
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def get(self, url: str, fp: Optional[str]) -> Optional[Dict[str, Any]]:
+        """The previous row for ``url`` if its fingerprint is still ``fp``."""
+        entry = self._old.get(url)
+        if fp is None or not entry or entry.get("fp") != fp:
+            return None
+        row = entry.get("row")
+        if not isinstance(row, dict):
+            return None
+        with self._lock:
+            self._new[url] = entry
+            self.reused += 1
+        return row
+
+    def record(self, url: str, fp: Optional[str], row: Dict[str, Any]) -> None:
+        with self._lock:
+            self.rescored += 1
+            if fp is not None and row:
+                self._new[url] = {"fp": fp, "row": row}
+
+    def save(self) -> None:
+        """Atomically replace the state file with this run's fingerprints and rows."""
+        tmp = f"{self.path}.tmp"
+        with self._lock:
+            data = {"version": STATE_VERSION, "models": self._new}
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import glob
+import gzip
+import io
+import os
+import sys
+from contextlib import ExitStack
+from typing import IO, Any, Iterable, Iterator, List, cast
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_GLOB_CHARS = frozenset("*?[")
+
+
+def expand_sources(specs: Iterable[str]) -> List[str]:
+    """
+    Expand CLI input arguments into an ordered list of sources.
+
+    ``-`` stands for stdin; arguments with glob characters expand to their
+    sorted matches (an error if there are none); anything else is a path.
+    """
+    out: List[str] = []
+    for spec in specs:
+        if spec == "-" or not (_GLOB_CHARS & set(spec)):
+            out.append(spec)
+            continue
+        matches = sorted(glob.glob(spec, recursive=True))
+        if not matches:
+            raise FileNotFoundError(f"no input matches {spec!r}")
+        out.extend(matches)
+    return out
+
+
+def _zstd_reader(raw: IO[bytes]) -> IO[bytes]:
+    try:
+        from compression import zstd  # type: ignore[import-not-found]  # Python 3.14+
+
+        return zstd.ZstdFile(raw)  # type: ignore[no-any-return]
+    except ImportError:
+        pass
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError:
+        msg = "zstd input needs the 'zstandard' package (pip install .[zstd])"
+        raise RuntimeError(msg) from None
+    return zstandard.ZstdDecompressor().stream_reader(raw)  # type: ignore[no-any-return]
+
+
+def open_source(source: str, stack: ExitStack) -> io.TextIOWrapper:
+    """
+    Open one source for lazy, line-by-line text reading; ``stack`` closes it.
+
+    Compression is detected from the first bytes rather than the file name,
+    so ``.gz``/``.zst`` files and compressed data piped to stdin both work.
+    The decompressors do not close the file they read from, so the file
+    itself is registered on ``stack`` too. Stdin is never closed.
+    """
+    raw: Any = sys.stdin.buffer if source == "-" else stack.enter_context(open(source, "rb"))
+    if not isinstance(raw, io.BufferedReader):
+        raw = io.BufferedReader(raw)
+    head = raw.peek(4)[:4]
+    stream: IO[bytes] = raw
+    if head.startswith(GZIP_MAGIC):
+        stream = cast(IO[bytes], gzip.GzipFile(fileobj=raw, mode="rb"))
+    elif head.startswith(ZSTD_MAGIC):
+        stream = _zstd_reader(raw)
+    text = io.TextIOWrapper(stream, encoding="utf-8", errors="replace")
+    stack.callback(text.detach if source == "-" else text.close)
+    return text
+
+
+def iter_lines(specs: Iterable[str]) -> Iterator[str]:
+    """
+    Stripped non-empty lines of every source in order, read lazily so that
+    arbitrarily large (or endless) inputs use constant memory.
+    """
+    for source in expand_sources(specs):
+        if source != "-" and not os.path.isfile(source):
+            raise FileNotFoundError(f"input not found: {source}")
+        with ExitStack() as stack:
+            for line in open_source(source, stack):
+                line = line.strip()
+                if line:
+                    yield line
@@ -4,6 +4,8 @@ import json
 import sys
 from typing import Any, Dict, Iterable, TextIO
 
+from .tracing import span
+
 
 def _coerce_ms(v: Any) -> int:
     try:
@@ -26,15 +28,20 @@ def _round_floats(obj: Any) -> Any:
     return obj
 
 
-def write_rows(rows: Iterable[Dict[str, Any]], out: TextIO = sys.stdout) -> None:
-    for r in rows:
-        # Ensure latency fields are ints
-        for k in list(r.keys()):
-            if k.endswith("_latency"):
-                r[k] = _coerce_ms(r[k])
+def normalize_row(r: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply the output conventions (int latencies, 2-decimal floats) to one row."""
+    # Ensure latency fields are ints
+    for k in list(r.keys()):
+        if k.endswith("_latency"):
+            r[k] = _coerce_ms(r[k])
 
-        # Round all floats (including nested structures) to 2 decimals
-        r = _round_floats(r)
+    # Round all floats (including nested structures) to 2 decimals
+    out: Dict[str, Any] = _round_floats(r)
+    return out
 
-        out.write(json.dumps(r, ensure_ascii=False) + "\n")
-        out.flush()
+
+def write_rows(rows: Iterable[Dict[str, Any]], out: TextIO = sys.stdout) -> None:
+    for r in rows:
+        with span("write"):
+            out.write(json.dumps(normalize_row(r), ensure_ascii=False) + "\n")
+            out.flush()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Iterator, Optional
+
+if TYPE_CHECKING:
+    from .cache import SingleFlight
+    from .checkpoint import Journal
+    from .incremental import IncrementalState
+
+# Models scored concurrently by collate(); each model also fans out its metrics.
+MODEL_WORKERS = 4
+
+
+@dataclass(frozen=True)
+class RunOptions:
+    """Run-level knobs shared by the CLI, collate() and compute_one()."""
+
+    max_workers: int = MODEL_WORKERS
+    window: Optional[int] = None
+    ordered: bool = True
+    journal: Optional[Journal] = None
+    incremental: Optional[IncrementalState] = None
+    # Metric names and/or profiles to compute (see metrics.select_metrics); None = all.
+    metrics: Optional[str] = None
+    # Progressive scoring: skip clone/LLM metrics once net_score's side of
+    # this threshold is decided.
+    threshold: Optional[float] = None
+    # Seconds one model may take, and the run's absolute time.monotonic() deadline;
+    # past either, compute_one returns a partial row marked "timed_out".
+    model_timeout: Optional[float] = None
+    deadline: Optional[float] = None
+    # Read safetensors headers for exact parameter counts even when file sizes
+    # are known (one ranged request per shard).
+    param_counts: bool = False
+    # List each author's models in bulk (hf_api.prefetch_hf_models) before scoring.
+    prefetch: bool = False
+    # Local mirror (hub cache or <owner>/<name> tree) to read models and datasets
+    # from instead of the Hugging Face API (see core.hf_local).
+    hf_local: Optional[str] = None
+    # Directory of pre-cloned repos (<owner>/<name> or <name>) that GitHub
+    # code URLs are scanned from in place instead of cloned.
+    repos_dir: Optional[str] = None
+    # Shared sub-computations (clones, README-only metrics) for the whole run.
+    memo: Optional[SingleFlight] = None
+
+
+_current: ContextVar[RunOptions] = ContextVar("run_options", default=RunOptions())
+
+
+def current_options() -> RunOptions:
+    return _current.get()
+
+
+@contextmanager
+def use_options(**overrides: Any) -> Iterator[RunOptions]:
+    """Apply option overrides for the duration of a ``with`` block."""
+    opts = replace(_current.get(), **overrides)
+    token = _current.set(opts)
+    try:
+        yield opts
+    finally:
+        _current.reset(token)
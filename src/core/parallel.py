@@ -1,15 +1,127 @@
 from __future__ import annotations
 
+import contextvars
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Callable, Iterable, List
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Tuple, TypeVar
 
+T = TypeVar("T")
 
-def run_parallel(funcs: Iterable[Callable[[], Any]], max_workers: int | None = None) -> List[Any]:
+
+def run_parallel(
+    funcs: Iterable[Callable[[], Any]],
+    max_workers: int | None = None,
+    timeout: float | None = None,
+) -> List[Any]:
+    """
+    Run thunks on a thread pool and return their results in completion order.
+
+    With a ``timeout`` (seconds) only the results finished by then are
+    returned: tasks not yet started are cancelled and running ones are left
+    to finish in the background, so the caller is never held past it. Such
+    tasks run on daemon threads, so a call that never returns (a hung
+    request) cannot keep the process alive at exit either.
+    """
     n = max_workers or min(32, (os.cpu_count() or 4))
+    if timeout is not None:
+        return _run_abandonable(funcs, n, timeout)
     results: List[Any] = []
     with ThreadPoolExecutor(max_workers=n) as ex:
-        futs = [ex.submit(f) for f in funcs]
-        for f in as_completed(futs):
-            results.append(f.result())
+        # Copy the caller's context per task so trace parents and run options propagate.
+        futs = [ex.submit(contextvars.copy_context().run, f) for f in funcs]
+        for fut in as_completed(futs):
+            results.append(fut.result())
+    return results
+
+
+def _run_abandonable(funcs: Iterable[Callable[[], Any]], n: int, timeout: float) -> List[Any]:
+    # ThreadPoolExecutor joins its workers at interpreter exit, so work that
+    # may be abandoned gets its own daemon threads instead.
+    tasks: Deque[Tuple[Future[Any], contextvars.Context, Callable[[], Any]]] = deque(
+        (Future(), contextvars.copy_context(), f) for f in funcs
+    )
+    futs = [t[0] for t in tasks]
+
+    def _worker() -> None:
+        while True:
+            try:
+                fut, ctx, f = tasks.popleft()
+            except IndexError:
+                return
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                fut.set_result(ctx.run(f))
+            except BaseException as e:
+                fut.set_exception(e)
+
+    for _ in range(min(n, len(futs))):
+        threading.Thread(target=_worker, name="run_parallel", daemon=True).start()
+    results: List[Any] = []
+    done = as_completed(futs, timeout=timeout)
+    try:
+        while True:
+            try:
+                fut = next(done)
+            except StopIteration:
+                break
+            except FuturesTimeout:
+                # Only the wait itself; a task's own TimeoutError still propagates.
+                break
+            results.append(fut.result())
+    finally:
+        for fut in futs:
+            fut.cancel()
     return results
+
+
+def iter_parallel(
+    funcs: Iterable[Callable[[], T]],
+    max_workers: int | None = None,
+    window: int | None = None,
+    ordered: bool = True,
+) -> Iterator[T]:
+    """
+    Lazily run thunks on a thread pool and yield their results.
+
+    At most ``window`` thunks are outstanding at once (running, or finished but
+    not yet yielded), so one stuck task cannot make the reorder buffer grow
+    without bound. With ``ordered=True`` results are released in input order as
+    soon as the prefix is complete; otherwise they are yielded as they finish.
+    Like run_parallel(), each thunk runs in a copy of the submitter's context,
+    so run options and the current trace span carry over to worker threads.
+    """
+    n = max_workers or min(32, (os.cpu_count() or 4))
+    limit = max(1, window if window is not None else 4 * n)
+    it = iter(funcs)
+    pending: Deque[Future[T]] = deque()
+
+    with ThreadPoolExecutor(max_workers=n) as ex:
+
+        def _fill() -> None:
+            while len(pending) < limit:
+                f = next(it, None)
+                if f is None:
+                    return
+                pending.append(ex.submit(contextvars.copy_context().run, f))
+
+        try:
+            _fill()
+            while pending:
+                if ordered:
+                    fut = pending.popleft()
+                    res = fut.result()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    fut = next(iter(done))
+                    pending.remove(fut)
+                    res = fut.result()
+                # Keep workers busy while the consumer handles this result.
+                _fill()
+                yield res
+        finally:
+            for fut in pending:
+                fut.cancel()
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Mapping, Optional
+from urllib.parse import quote
+
+from .parallel import run_parallel
+from .tracing import span
+
+if TYPE_CHECKING:
+    import requests
+
+# First request size; covers the whole header of almost every real checkpoint.
+HEADER_PROBE_BYTES = 64 * 1024
+# The safetensors format caps the JSON header at 100 MB.
+MAX_HEADER_BYTES = 100 * 1024 * 1024
+# Repos with more shards than this are not probed (params reported as unknown).
+MAX_SHARDS = 128
+
+# Bytes per element, for the size of the tensor data each header describes.
+DTYPE_BYTES: Dict[str, float] = {
+    "F64": 8, "F32": 4, "F16": 2, "BF16": 2, "F8_E4M3": 1, "F8_E5M2": 1,
+    "I64": 8, "I32": 4, "I16": 2, "I8": 1, "U64": 8, "U32": 4, "U16": 2, "U8": 1,
+    "BOOL": 1,
+}
+
+_session_lock = threading.Lock()
+_session_obj: Optional["requests.Session"] = None
+
+
+def _session() -> "requests.Session":
+    """Shared keep-alive session; requests is only imported once a header is read."""
+    global _session_obj
+    with _session_lock:
+        if _session_obj is None:
+            import requests
+
+            _session_obj = requests.Session()
+        return _session_obj
+
+
+def resolve_url(repo_id: str, filename: str, revision: str = "main") -> str:
+    """Download URL of a repo file; $HF_ENDPOINT overrides the hub host."""
+    base = os.getenv("HF_ENDPOINT", "https://huggingface.co").rstrip("/")
+    return f"{base}/{repo_id}/resolve/{revision}/{quote(filename)}"
+
+
+def _get_range(url: str, start: int, end: int, timeout: float) -> bytes:
+    """Bytes ``start..end`` (inclusive) of ``url``, even if the server ignores Range."""
+    headers = {"Range": f"bytes={start}-{end}"}
+    token = os.getenv("HF_TOKEN")
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    with _session().get(url, headers=headers, timeout=timeout, stream=True) as resp:
+        resp.raise_for_status()
+        if resp.status_code == 206:
+            return bytes(resp.content[: end - start + 1])
+        # Plain 200: read just enough of the full body and stop.
+        buf = bytearray()
+        for chunk in resp.iter_content(chunk_size=64 * 1024):
+            buf += chunk
+            if len(buf) > end:
+                break
+        return bytes(buf[start:end + 1])
+
+
+def read_header(url: str, timeout: float = 10.0) -> Dict[str, Any]:
+    """
+    Fetch and parse the JSON header of a remote .safetensors file.
+
+    The file starts with a little-endian u64 header length followed by the
+    header itself, so one range request of HEADER_PROBE_BYTES usually
+    suffices; a second request fetches the rest of a larger header. The
+    tensor data is never downloaded. Raises ValueError on a malformed file.
+    """
+    with span("fetch.safetensors", kind="client", url=url):
+        head = _get_range(url, 0, HEADER_PROBE_BYTES - 1, timeout)
+        if len(head) < 8:
+            raise ValueError(f"{url}: too short for a safetensors file")
+        (n,) = struct.unpack("<Q", head[:8])
+        if n > MAX_HEADER_BYTES:
+            raise ValueError(f"{url}: header length {n} exceeds the format limit")
+        body = head[8:8 + n]
+        if len(body) < n:
+            body += _get_range(url, 8 + len(body), 8 + n - 1, timeout)
+    if len(body) != n:
+        raise ValueError(f"{url}: truncated header")
+    header = json.loads(body.decode("utf-8"))
+    if not isinstance(header, dict):
+        raise ValueError(f"{url}: header is not a JSON object")
+    return header
+
+
+def summarize(headers: Iterable[Mapping[str, Any]]) -> Dict[str, Any]:
+    """
+    Parameter count and dtype mix over the headers of every shard.
+
+    Returns ``{"params", "dtype_params", "data_bytes", "shards"}`` where
+    ``dtype_params`` maps a safetensors dtype (e.g. ``"BF16"``) to the
+    parameters stored in it and ``data_bytes`` is the tensor data size.
+    Raises ValueError for a tensor whose shape or dtype cannot be counted.
+    """
+    params = 0
+    data_bytes = 0.0
+    shards = 0
+    by_dtype: Dict[str, int] = {}
+    for header in headers:
+        shards += 1
+        for name, t in header.items():
+            if name == "__metadata__" or not isinstance(t, Mapping):
+                continue
+            count = 1
+            try:
+                for dim in t.get("shape") or ():
+                    count *= int(dim)
+            except (TypeError, ValueError):
+                raise ValueError(f"tensor {name!r}: invalid shape") from None
+            dtype = str(t.get("dtype", "?"))
+            if count < 0 or dtype not in DTYPE_BYTES:
+                raise ValueError(f"tensor {name!r}: invalid shape or dtype {dtype!r}")
+            by_dtype[dtype] = by_dtype.get(dtype, 0) + count
+            params += count
+            data_bytes += count * DTYPE_BYTES.get(dtype, 0)
+    return {
+        "params": params,
+        "dtype_params": by_dtype,
+        "data_bytes": int(data_bytes),
+        "shards": shards,
+    }
+
+
+def summary_from_totals(info: Any, shards: int) -> Optional[Dict[str, Any]]:
+    """
+    summarize()-shaped summary from the hub's own totals (``ModelInfo.safetensors``:
+    ``parameters`` per dtype and their ``total``), so no header has to be read.
+    None if the totals are missing or name a dtype of unknown width.
+    """
+    if isinstance(info, Mapping):
+        parameters, total = info.get("parameters"), info.get("total")
+    else:
+        parameters, total = getattr(info, "parameters", None), getattr(info, "total", None)
+    if not isinstance(parameters, Mapping) or not parameters or not total:
+        return None
+    try:
+        by_dtype = {str(k): int(v) for k, v in parameters.items()}
+        params = int(total)
+    except (TypeError, ValueError):
+        return None
+    if any(d not in DTYPE_BYTES for d in by_dtype):
+        return None
+    return {
+        "params": params,
+        "dtype_params": by_dtype,
+        "data_bytes": int(sum(n * DTYPE_BYTES[d] for d, n in by_dtype.items())),
+        "shards": shards,
+    }
+
+
+def fetch_summary(
+    repo_id: str, filenames: List[str], max_workers: int = 8
+) -> Optional[Dict[str, Any]]:
+    """
+    Best-effort summarize() of a repo's .safetensors shards, reading only
+    their headers. Returns None when there are none, too many, or any shard
+    cannot be read, since a partial count would understate the model.
+    """
+    if not filenames or len(filenames) > MAX_SHARDS:
+        return None
+
+    def _reader(filename: str) -> Callable[[], Dict[str, Any]]:
+        def read() -> Dict[str, Any]:
+            return read_header(resolve_url(repo_id, filename))
+
+        return read
+
+    try:
+        headers = run_parallel(
+            [_reader(f) for f in filenames], max_workers=min(max_workers, len(filenames))
+        )
+        # Headers are untrusted JSON: a bad shape or dtype must not fail the model.
+        return summarize(headers)
+    except Exception:
+        return None
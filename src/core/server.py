@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from . import compute
+from .io_ndjson import normalize_row
+from .logging_cfg import setup_logging
+
+log = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 8 * 1024 * 1024
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _str_list(payload: Dict[str, Any], key: str) -> List[str]:
+    """``payload[key]`` as a list of strings ([] if absent); BadRequest otherwise."""
+    value = payload.get(key)
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(isinstance(x, str) for x in value):
+        raise BadRequest(f"'{key}' must be a list of strings")
+    return value
+
+
+def score_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Score a ``POST /score`` body.
+
+    ``{"url": ..., "datasets": [...], "code": [...]}`` scores one model and
+    returns ``{"row": {...}}``; ``{"lines": [...]}`` runs the lines through
+    collate() exactly like a URL file and returns ``{"rows": [...]}``.
+    """
+    if "lines" in payload:
+        lines = [x.strip() for x in _str_list(payload, "lines") if x.strip()]
+        return {"rows": [normalize_row(r) for r in compute.collate(lines)]}
+    url = payload.get("url")
+    if not isinstance(url, str) or not url.strip():
+        raise BadRequest("expected 'url' or 'lines'")
+    datasets = _str_list(payload, "datasets")
+    code = _str_list(payload, "code")
+    row = compute.compute_one(url.strip(), datasets, code)
+    if not row:
+        raise BadRequest(f"not a Hugging Face model URL: {url}")
+    return {"row": normalize_row(row)}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "trustworthy-cli"
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:  # noqa: N802 (http.server naming)
+        if self.path == "/healthz":
+            self._send(200, {"status": "ok"})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self) -> None:  # noqa: N802 (http.server naming)
+        if self.path != "/score":
+            self._send(404, {"error": "not found"})
+            return
+        try:
+            n = int(self.headers.get("Content-Length") or 0)
+            if n > MAX_BODY_BYTES:
+                self._send(413, {"error": "request body too large"})
+                return
+            payload = json.loads(self.rfile.read(n) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("expected a JSON object")
+        except Exception as e:
+            self._send(400, {"error": f"bad request: {e}"})
+            return
+        try:
+            self._send(200, score_payload(payload))
+        except BadRequest as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            log.exception("scoring failed")
+            self._send(500, {"error": f"{e.__class__.__name__}: {e}"})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        log.info("%s " + format, self.address_string(), *args)
+
+
+def warm_up() -> None:
+    """Pay import and registry construction costs once, before serving traffic."""
+    from metrics import metric_registry
+
+    from . import github, hf_api
+
+    metric_registry()
+    lazy = ((hf_api, "_api"), (hf_api, "hf_hub_download"), (github, "Github"), (github, "Repo"))
+    for mod, attr in lazy:
+        try:
+            getattr(mod, attr)
+        except Exception:  # pragma: no cover - optional at warm-up time
+            log.warning("could not preload %s.%s", mod.__name__, attr)
+    try:
+        from providers import purdue_genai
+
+        purdue_genai._session()
+    except Exception:  # pragma: no cover
+        log.warning("could not preload the GenAI provider")
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8080) -> ThreadingHTTPServer:
+    srv = ThreadingHTTPServer((host, port), _Handler)
+    srv.daemon_threads = True
+    return srv
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    setup_logging()
+    p = argparse.ArgumentParser(prog="core.server", description="Serve POST /score over HTTP.")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8080)
+    args = p.parse_args(sys.argv[1:] if argv is None else argv[1:])
+    warm_up()
+    srv = make_server(args.host, args.port)
+    log.info("listening on %s:%s", *srv.server_address[:2])
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
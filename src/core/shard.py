@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from itertools import cycle
+from typing import Iterable, Iterator, List, Sequence, TextIO, Tuple
+
+from .url import CODE_KINDS, parse_url
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse ``"i/N"`` into ``(i, N)`` with ``0 <= i < N``."""
+    try:
+        a, b = spec.split("/", 1)
+        index, count = int(a), int(b)
+    except Exception:
+        raise ValueError(f"invalid shard spec {spec!r}; expected i/N") from None
+    if count < 1 or not (0 <= index < count):
+        raise ValueError(f"invalid shard spec {spec!r}; need 0 <= i < N")
+    return index, count
+
+
+def shard_lines(urls: Iterable[str], index: int, count: int) -> Iterator[str]:
+    """
+    Keep only the model groups assigned to shard ``index`` of ``count``.
+
+    Lines are grouped exactly as collate() groups them: dataset/code lines stay
+    with the model that follows them. The k-th model of the input goes to shard
+    ``k % count``, so every worker given the same file agrees on the split and
+    merge_shards() can restore input order by interleaving shard outputs.
+    """
+    buf: List[str] = []
+    k = 0
+    for u in urls:
+        kind = parse_url(u).kind
+        if kind == "hf_dataset" or kind in CODE_KINDS:
+            buf.append(u)
+        elif kind == "hf_model":
+            if k % count == index:
+                yield from buf
+                yield u
+            buf.clear()
+            k += 1
+
+
+def merge_shards(shards: Sequence[Iterable[str]], out: TextIO) -> int:
+    """
+    Interleave shard outputs (given in shard order 0..N-1) back into input order.
+
+    Each shard must emit one row per assigned model, in input order (the CLI
+    refuses ``--shard`` with ``--unordered``, since rows carry no input index
+    to re-sort by). Returns the number of rows written; raises ValueError if
+    the shard lengths cannot come from the same split.
+    """
+    its = [(ln for ln in s if ln.strip()) for s in shards]
+    written = 0
+    for i in cycle(range(len(its))):
+        line = next(its[i], None)
+        if line is None:
+            break
+        out.write(line if line.endswith("\n") else line + "\n")
+        written += 1
+    # Once one shard runs dry, every shard must be dry.
+    for j, it in enumerate(its):
+        if next(it, None) is not None:
+            raise ValueError(f"shard {j} has more rows than its split allows")
+    return written
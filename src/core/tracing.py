@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+import math
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+# Upper bounds (ms) of the run-level histogram buckets; the last bucket is open.
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000)
+
+
+def _percentile(sorted_ms: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_ms:
+        return 0.0
+    k = max(0, min(len(sorted_ms) - 1, math.ceil(q / 100.0 * len(sorted_ms)) - 1))
+    return sorted_ms[k]
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: int = 0
+    kind: str = "internal"
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Thread-safe collector for one run.
+
+    Always keeps per-stage durations for summary(); with ``keep_spans`` it also
+    keeps every finished :class:`Span` (ids, parent links, attributes) so the
+    run can be exported as an OTLP/JSON trace.
+    """
+
+    def __init__(self, keep_spans: bool = False) -> None:
+        self._lock = threading.Lock()
+        self._durations: Dict[str, List[float]] = {}
+        self._spans: List[Span] = []
+        self._keep_spans = keep_spans
+        self._t0 = time.perf_counter()
+
+    def record(self, stage: str, ms: float, sp: Optional[Span] = None) -> None:
+        with self._lock:
+            self._durations.setdefault(stage, []).append(ms)
+            if sp is not None and self._keep_spans:
+                self._spans.append(sp)
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = {k: sorted(v) for k, v in self._durations.items()}
+        stages: Dict[str, Any] = {}
+        for stage, ms in sorted(snapshot.items()):
+            hist = [0] * (len(BUCKETS_MS) + 1)
+            for v in ms:
+                hist[bisect_left(BUCKETS_MS, v)] += 1
+            labels = [f"le_{b}" for b in BUCKETS_MS] + ["inf"]
+            stages[stage] = {
+                "count": len(ms),
+                "total_ms": sum(ms),
+                "p50_ms": _percentile(ms, 50),
+                "p95_ms": _percentile(ms, 95),
+                "p99_ms": _percentile(ms, 99),
+                "max_ms": ms[-1],
+                "histogram": dict(zip(labels, hist)),
+            }
+        return {"wall_ms": (time.perf_counter() - self._t0) * 1000.0, "stages": stages}
+
+
+_tracer: Optional[Tracer] = None
+
+
+def start_tracing(keep_spans: bool = False) -> Tracer:
+    """Start collecting spans process-wide and return the collector."""
+    global _tracer
+    _tracer = Tracer(keep_spans=keep_spans)
+    return _tracer
+
+
+def stop_tracing() -> Optional[Tracer]:
+    global _tracer
+    t, _tracer = _tracer, None
+    return t
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+@contextmanager
+def span(stage: str, kind: str = "internal", **attrs: Any) -> Iterator[None]:
+    """
+    Time the enclosed block under ``stage``; free when tracing is off.
+
+    The span becomes the parent of spans opened inside the block, including on
+    worker threads started through core.parallel (which copies the context).
+    Use ``kind="client"`` for outbound requests.
+    """
+    t = _tracer
+    if t is None:
+        yield
+        return
+    parent = _current_span.get()
+    sp = Span(
+        name=stage,
+        trace_id=parent.trace_id if parent else _new_id(128),
+        span_id=_new_id(64),
+        parent_id=parent.span_id if parent else None,
+        start_ns=time.time_ns(),
+        kind=kind,
+        attrs={"thread.name": threading.current_thread().name, **attrs},
+    )
+    token = _current_span.set(sp)
+    t0 = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        sp.error = f"{e.__class__.__name__}: {e}"[:200]
+        raise
+    finally:
+        _current_span.reset(token)
+        ms = (time.perf_counter() - t0) * 1000.0
+        sp.end_ns = sp.start_ns + int(ms * 1e6)
+        t.record(stage, ms, sp)
+
+
+def write_profile(summary: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+        f.write("\n")
+
+
+_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+
+def _otlp_value(v: Any) -> Dict[str, Any]:
+    if isinstance(v, bool):
+        return {"boolValue": v}
+    if isinstance(v, int):
+        return {"intValue": str(v)}
+    if isinstance(v, float):
+        return {"doubleValue": v}
+    return {"stringValue": str(v)}
+
+
+def to_otlp(spans: List[Span], service_name: str = "trustworthy-cli") -> Dict[str, Any]:
+    """Encode spans as an OTLP/JSON ``ExportTraceServiceRequest`` document."""
+    out = []
+    for sp in spans:
+        d: Dict[str, Any] = {
+            "traceId": sp.trace_id,
+            "spanId": sp.span_id,
+            "name": sp.name,
+            "kind": _KINDS.get(sp.kind, 1),
+            "startTimeUnixNano": str(sp.start_ns),
+            "endTimeUnixNano": str(sp.end_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in sp.attrs.items()],
+            "status": {"code": 2, "message": sp.error} if sp.error else {"code": 1},
+        }
+        if sp.parent_id:
+            d["parentSpanId"] = sp.parent_id
+        out.append(d)
+    resource = {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]}
+    return {
+        "resourceSpans": [
+            {"resource": resource, "scopeSpans": [{"scope": {"name": __name__}, "spans": out}]}
+        ]
+    }
+
+
+def write_otlp(tracer: Tracer, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(to_otlp(tracer.spans), f)
+        f.write("\n")
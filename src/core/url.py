@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import posixpath
 from dataclasses import dataclass
 from typing import Optional
 from urllib.parse import urlparse
@@ -13,10 +14,24 @@ class ParsedURL:
     name: Optional[str]
 
 
+# Kinds of input line that name a code repository for the following model.
+CODE_KINDS = ("github", "local_repo")
+
+
+def is_code_url(u: str) -> bool:
+    """True for a code repository URL: GitHub, or a ``file://`` checkout on disk."""
+    low = u.strip().lower()
+    return "github.com" in low or low.startswith("file://")
+
+
 def parse_url(u: str) -> ParsedURL:
     p = urlparse(u.strip())
     host = p.netloc.lower()
 
+    if p.scheme.lower() == "file":
+        name = posixpath.basename(p.path.rstrip("/"))
+        return ParsedURL(u, "local_repo", None, name or None)
+
     if host in {"huggingface.co", "www.huggingface.co"}:
         parts = [x for x in p.path.split("/") if x]
         if parts and parts[0] == "datasets":
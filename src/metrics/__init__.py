@@ -1,18 +1,71 @@
-from .availability import AvailabilityMetric
-from .base import Metric, MetricResult
-from .bus_factor import BusFactorMetric
-from .code_quality import CodeQualityMetric
-from .dataset_code import DatasetCodePresenceMetric
-from .dataset_quality import DatasetQualityMetric
-from .license import LicenseMetric
-from .performance_claims import PerformanceClaimsMetric
-from .size import SizeMetric
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
 
-__all__ = ["Metric", "MetricResult", "metric_registry"]
+from .base import COST_CLONE, COST_LLM, COST_NETWORK, COST_PURE, COSTS, Metric, MetricResult
 
+__all__ = [
+    "COST_CLONE",
+    "COST_LLM",
+    "COST_NETWORK",
+    "COST_PURE",
+    "COSTS",
+    "ENTRY_POINT_GROUP",
+    "Metric",
+    "MetricResult",
+    "PROFILES",
+    "metric_registry",
+    "select_metrics",
+]
 
-def metric_registry() -> list[Metric]:
-    return [
+log = logging.getLogger(__name__)
+
+# Third-party packages add metrics by exposing a Metric class (or factory)
+# under this entry point group.
+ENTRY_POINT_GROUP = "trustworthy_cli.metrics"
+
+# Named metric selections by cost class; "fast" skips clones and LLM calls.
+PROFILES: Dict[str, Tuple[str, ...]] = {
+    "all": COSTS,
+    "fast": (COST_PURE, COST_NETWORK),
+    "offline": (COST_PURE,),
+}
+
+
+@lru_cache(maxsize=None)
+def _plugin_metrics() -> Tuple[Metric, ...]:
+    """Entry-point metrics, discovered and instantiated once per process."""
+    from importlib.metadata import entry_points
+
+    eps = entry_points()
+    group = (
+        eps.select(group=ENTRY_POINT_GROUP)
+        if hasattr(eps, "select")
+        else eps.get(ENTRY_POINT_GROUP, ())  # Python 3.9
+    )
+    out: List[Metric] = []
+    for ep in group:
+        try:
+            out.append(ep.load()())
+        except Exception as e:
+            log.warning("skipping metric plugin %s: %s", ep.name, e)
+    return tuple(out)
+
+
+def metric_registry() -> List[Metric]:
+    """Built-in metrics followed by entry-point plugins; a plugin replaces a same-named metric."""
+    # Metric modules (and the LLM provider behind them) load on first use so that
+    # importing the package stays cheap for callers that never score a model.
+    from .availability import AvailabilityMetric
+    from .bus_factor import BusFactorMetric
+    from .code_quality import CodeQualityMetric
+    from .dataset_code import DatasetCodePresenceMetric
+    from .dataset_quality import DatasetQualityMetric
+    from .license import LicenseMetric
+    from .performance_claims import PerformanceClaimsMetric
+    from .size import SizeMetric
+
+    metrics: List[Metric] = [
         AvailabilityMetric(),
         LicenseMetric(),
         SizeMetric(),
@@ -22,3 +75,37 @@ def metric_registry() -> list[Metric]:
         PerformanceClaimsMetric(),
         BusFactorMetric(),
     ]
+    by_name = {m.name: i for i, m in enumerate(metrics)}
+    for plugin in _plugin_metrics():
+        if plugin.name in by_name:
+            metrics[by_name[plugin.name]] = plugin
+        else:
+            by_name[plugin.name] = len(metrics)
+            metrics.append(plugin)
+    return metrics
+
+
+def select_metrics(metrics: List[Metric], spec: Optional[str]) -> List[Metric]:
+    """
+    The metrics named by ``spec``, in registry order.
+
+    ``spec`` is a comma-separated list of metric names and/or profile names
+    (see PROFILES); None or empty selects everything. Raises ValueError for an
+    unknown name.
+    """
+    if not spec:
+        return list(metrics)
+    known = {m.name for m in metrics}
+    names: Set[str] = set()
+    costs: Set[str] = set()
+    for part in (x.strip() for x in spec.split(",")):
+        if not part:
+            continue
+        if part in PROFILES:
+            costs.update(PROFILES[part])
+        elif part in known:
+            names.add(part)
+        else:
+            choices = ", ".join(sorted(known | set(PROFILES)))
+            raise ValueError(f"unknown metric or profile {part!r} (choose from {choices})")
+    return [m for m in metrics if m.name in names or getattr(m, "cost", COST_PURE) in costs]
@@ -3,22 +3,16 @@ from __future__ import annotations
 import os
 import re
 import time
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional, Tuple
 
-from .base import MetricResult
+from .base import COST_LLM, COST_PURE, MetricResult
+from .file_index import file_index
+from .markdown import ModelCard
 
-# Import provider module safely (no unused names; avoids flake8/mypy issues)
-try:
-    from providers import purdue_genai
-    _score_ramp_up_with_llm = purdue_genai.score_ramp_up_with_llm
-except Exception:  # pragma: no cover
-    _score_ramp_up_with_llm = None  # type: ignore[assignment]
-
-FENCED_CODE = re.compile(r"```[a-zA-Z0-9_-]*\s+[\s\S]+?```", re.I)
 QUICKSTART_HINT = re.compile(r"\b(quick\s*start|getting\s*started|usage|example[s]?)\b", re.I)
 INSTALL_HINT = re.compile(
     (
-        r"(?:^|\n)\s*(?:pip(?:3)?|conda|poetry)\s+install[^\n]*"
+        r"(?m:^)[^\S\n]*(?:pip(?:3)?|conda|poetry)\s+install[^\n]*"
         r"|requirements\.txt|pyproject\.toml|environment\.yml|setup\.py"
     ),
     re.I,
@@ -38,29 +32,42 @@ def _has_any_env_key() -> bool:
     return bool(os.getenv("GEN_AI_STUDIO_API_KEY"))
 
 
+def _llm_scorer() -> Optional[Callable[..., Tuple[float, Dict[str, Any]]]]:
+    """Import the provider (and `requests`) only when an LLM call is actually possible."""
+    try:
+        from providers import purdue_genai
+    except Exception:  # pragma: no cover
+        return None
+    return purdue_genai.score_ramp_up_with_llm
+
+
 class AvailabilityMetric:
     name = "ramp_up_time"
+    dedup_inputs = ("readme_text", "card_data", "hf_license", "file_index")
+
+    @property
+    def cost(self) -> str:
+        """Priced as an LLM call only when a key is set; otherwise it is pure heuristics."""
+        return COST_LLM if _has_any_env_key() else COST_PURE
 
     def compute(self, ctx: Dict[str, Any]) -> MetricResult:
         t0 = time.perf_counter()
-        files = [str(f) for f in (ctx.get("files") or [])]
+        files = file_index(ctx)
         readme = ctx.get("readme_text") or ""
         card = ctx.get("card_data") or {}
 
-        files_lower = [f.lower() for f in files]
-        basenames = {f.split("/")[-1].split("\\")[-1] for f in files_lower}
-
         have_readme = bool(readme or card)
         have_license = bool(card.get("license") or card.get("license_name") or ctx.get("hf_license"))
-        have_config = any(f.endswith(CONFIG_ENDINGS) for f in files_lower)
+        have_config = files.any_suffix(CONFIG_ENDINGS)
         have_tokenizer = any(
-            ("tokenizer" in f and f.endswith(TOKENIZER_EXTS)) or "/tokenizer" in f or "\\tokenizer" in f
-            for f in files_lower
+            f.endswith(TOKENIZER_EXTS) or "/tokenizer" in f or "\\tokenizer" in f
+            for f in files.containing("tokenizer")
         )
-        have_weights = any(f.endswith(WEIGHT_EXTS) for f in files_lower)
-        have_model_index = any(name in basenames for name in MODEL_INDEX_NAMES)
+        have_weights = files.any_suffix(WEIGHT_EXTS)
+        have_model_index = files.has_basename(MODEL_INDEX_NAMES)
 
-        has_fenced_code = bool(FENCED_CODE.search(readme))
+        doc = ModelCard(readme)
+        has_fenced_code = doc.has_fenced_code()
         has_qs_heading = bool(QUICKSTART_HINT.search(readme))
         has_install = bool(INSTALL_HINT.search(readme))
         has_code_example = bool(CODE_EXAMPLE_HINT.search(readme))
@@ -93,14 +100,17 @@ class AvailabilityMetric:
             "quickstart_strong": quickstart_strong,
             "method": "heuristic",
         }
+        if doc.truncated:
+            detail["readme_scan_truncated"] = True
 
         final = score
-        if _has_any_env_key() and (_score_ramp_up_with_llm is not None) and readme.strip():
+        scorer = _llm_scorer() if (_has_any_env_key() and readme.strip()) else None
+        if scorer is not None:
             try:
-                llm_score, llm_detail = _score_ramp_up_with_llm(
+                llm_score, llm_detail = scorer(
                     readme_text=readme,
                     meta={
-                        "files": files[:40],
+                        "files": files.paths[:40],
                         "card": {k: card.get(k) for k in ("license", "license_name", "tags", "datasets") if k in card},
                         "have_model_index": have_model_index,
                         "have_weights": have_weights,
@@ -1,10 +1,24 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
-from typing import Any, Dict, Protocol
+from typing import Any, Dict, Protocol, Tuple
 
+# One MetricResult per metric per model; slots drop the per-instance dict (3.10+).
+_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+# Cost classes a metric declares via ``cost``, cheapest first: pure reads the
+# prefetched context only, network needs extra API calls, clone checks out a
+# repository, llm calls a language model.
+COST_PURE = "pure"
+COST_NETWORK = "network"
+COST_CLONE = "clone"
+COST_LLM = "llm"
+COSTS: Tuple[str, ...] = (COST_PURE, COST_NETWORK, COST_CLONE, COST_LLM)
+
+
+@dataclass(**_SLOTS)
 class MetricResult:
     score: float
     latency_ms: int
@@ -12,6 +26,12 @@ class MetricResult:
 
 
 class Metric(Protocol):
+    # A metric may also set ``dedup_inputs``, the ctx keys its result depends
+    # on; compute_one then shares one result between models with equal inputs.
+    # Plugin metrics may set ``weight`` to take part in the net score.
     name: str
 
+    @property
+    def cost(self) -> str: ...
+
     def compute(self, ctx: Dict[str, Any]) -> MetricResult: ...
@@ -5,7 +5,11 @@ import shutil
 import time
 from typing import Any, Dict, Iterable
 
-from .base import MetricResult
+from core.github import local_checkout
+from core.tracing import span
+from core.url import is_code_url
+
+from .base import COST_CLONE, MetricResult
 from .code_quality import _safe_clone  # reuse
 
 LOOKBACK_DAYS = 180
@@ -40,12 +44,14 @@ def _gini(values: Iterable[int]) -> float:
 
 class BusFactorMetric:
     name = "bus_factor"
+    cost = COST_CLONE
+    dedup_inputs = ("code",)
 
     def compute(self, ctx: Dict[str, Any]) -> MetricResult:
         t0 = time.perf_counter()
         repo_url = None
         for u in ctx.get("code") or []:
-            if isinstance(u, str) and "github.com" in u:
+            if isinstance(u, str) and is_code_url(u):
                 repo_url = u
                 break
 
@@ -56,7 +62,9 @@ class BusFactorMetric:
                 extras={"reason": "no_repo"},
             )
 
-        root = _safe_clone(repo_url)
+        # A checkout already on disk is read in place and never deleted.
+        local = local_checkout(repo_url)
+        root = local or _safe_clone(repo_url)
         if not root:
             return MetricResult(
                 score=0.0,
@@ -66,7 +74,8 @@ class BusFactorMetric:
 
         try:
             since = dt.datetime.utcnow() - dt.timedelta(days=LOOKBACK_DAYS)
-            counts = _author_stats(root, since)
+            with span("history"):
+                counts = _author_stats(root, since)
             contrib = len(counts)
             commits = sum(counts.values())
             gini = _gini(counts.values()) if counts else 1.0
@@ -79,4 +88,5 @@ class BusFactorMetric:
                 extras={"contributors": contrib, "commits": commits, "gini": gini},
             )
         finally:
-            shutil.rmtree(root, ignore_errors=True)
+            if local is None:
+                shutil.rmtree(root, ignore_errors=True)
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import os
-import re
 import shutil
 import tempfile
 import time
 from typing import Any, Dict, Iterable
 
-from .base import MetricResult
+from core.github import local_checkout
+from core.tracing import span
+from core.url import is_code_url
+
+from .base import COST_CLONE, MetricResult
+from .markdown import ModelCard
 
 TRY_FILES = (
     "pytest.ini",
@@ -21,7 +25,7 @@ TRY_FILES = (
 )
 TYPE_CFG = ("mypy.ini", "pyproject.toml", "setup.cfg")
 LINT_CFG = ("pyproject.toml", "setup.cfg", ".flake8", "ruff.toml", ".pylintrc")
-DOC_HINTS = re.compile(r"```(?:python|py)\s+[\s\S]+?```", re.I)
+DOC_LANGS = ("python", "py")
 
 
 def _has_any(root: str, names: Iterable[str]) -> bool:
@@ -66,8 +70,9 @@ def _safe_clone(url: str, max_seconds: int = 5) -> str | None:
                 ok["err"] = e
 
         th = threading.Thread(target=_do, daemon=True)
-        th.start()
-        th.join(timeout=max_seconds)
+        with span("clone", kind="client", url=url):
+            th.start()
+            th.join(timeout=max_seconds)
         if not ok["done"]:
             shutil.rmtree(d, ignore_errors=True)
             return None
@@ -78,12 +83,14 @@ def _safe_clone(url: str, max_seconds: int = 5) -> str | None:
 
 class CodeQualityMetric:
     name = "code_quality"
+    cost = COST_CLONE
+    dedup_inputs = ("code", "readme_text")
 
     def compute(self, ctx: Dict[str, Any]) -> MetricResult:
         t0 = time.perf_counter()
         repo_url = None
         for u in ctx.get("code") or []:
-            if isinstance(u, str) and "github.com" in u:
+            if isinstance(u, str) and is_code_url(u):
                 repo_url = u
                 break
         readme = ctx.get("readme_text") or ""
@@ -93,11 +100,15 @@ class CodeQualityMetric:
 
         if not repo_url:
             # fallback: score small points from README evidence
-            extras["checks"]["readme_code_blocks"] = bool(DOC_HINTS.search(readme))
-            base = 0.2 if extras["checks"]["readme_code_blocks"] else 0.0
+            readme_blocks = ModelCard(readme).has_fenced_code(DOC_LANGS)
+            extras["checks"]["readme_code_blocks"] = readme_blocks
+            base = 0.2 if readme_blocks else 0.0
             return MetricResult(score=base, latency_ms=int((time.perf_counter() - t0) * 1000), extras=extras)
 
-        root = _safe_clone(repo_url)  # may return None on timeout
+        # A checkout already on disk is scanned in place and never deleted.
+        local = local_checkout(repo_url)
+        extras["local_checkout"] = local is not None
+        root = local or _safe_clone(repo_url)  # may return None on timeout
         if not root:
             extras["clone_timeout"] = True
             return MetricResult(score=0.0, latency_ms=int((time.perf_counter() - t0) * 1000), extras=extras)
@@ -107,7 +118,7 @@ class CodeQualityMetric:
             has_ci = _has_any(root, [".github/workflows", ".circleci/", "azure-pipelines.yml"])
             has_type = _has_any(root, TYPE_CFG) or _pyproject_has("tool.mypy", "plugins", root)
             has_lint = _has_any(root, LINT_CFG) or _pyproject_has("tool.ruff", "select", root)
-            readme_blocks = bool(DOC_HINTS.search(readme))
+            readme_blocks = ModelCard(readme).has_fenced_code(DOC_LANGS)
 
             # Weighted rubric
             score = (
@@ -130,4 +141,5 @@ class CodeQualityMetric:
             }
             return MetricResult(score=score, latency_ms=int((time.perf_counter() - t0) * 1000), extras=extras)
         finally:
-            shutil.rmtree(root, ignore_errors=True)
+            if local is None:
+                shutil.rmtree(root, ignore_errors=True)
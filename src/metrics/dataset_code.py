@@ -3,11 +3,12 @@ from __future__ import annotations
 import time
 from typing import Any, Dict
 
-from .base import MetricResult
+from .base import COST_PURE, MetricResult
 
 
 class DatasetCodePresenceMetric:
     name = "dataset_and_code_score"
+    cost = COST_PURE
 
     def compute(self, ctx: Dict[str, Any]) -> MetricResult:
         t0 = time.perf_counter()
@@ -2,9 +2,9 @@ from __future__ import annotations
 
 import re
 import time
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
-from .base import MetricResult
+from .base import COST_NETWORK, MetricResult
 
 # Strict HF dataset URL validator (accepts extra path like /tree/main)
 HF_DATASET_URL = re.compile(
@@ -50,6 +50,50 @@ def _valid_dataset_urls(urls: List[str]) -> List[str]:
     return out
 
 
+def dataset_id(url: str) -> Optional[str]:
+    """``owner/name`` of a valid HF dataset URL, else None."""
+    uu = url.strip() if isinstance(url, str) else ""
+    if not HF_DATASET_URL.match(uu):
+        return None
+    parts = uu.split("://", 1)[1].split("/")
+    return f"{parts[2]}/{parts[3]}"
+
+
+def _facts_checks(facts: Mapping[str, Any]) -> Dict[str, bool]:
+    """Documentation facts read from the dataset's own metadata."""
+    splits = facts.get("splits") or {}
+    return {
+        "has_card": bool(facts.get("has_card")),
+        "row_counts": int(facts.get("num_rows") or 0) > 0,
+        "held_out_split": any(name != "train" for name in splits),
+        "features": int(facts.get("num_features") or 0) > 0,
+        "license": bool(facts.get("license")),
+        "card_fields": len(facts.get("card_fields") or ()) >= 2,
+    }
+
+
+def _facts_score(
+    valid: List[str], dataset_meta: Mapping[str, Any]
+) -> Tuple[Optional[float], Dict[str, Any]]:
+    """
+    Best score over the provided datasets whose metadata was fetched, on the
+    same 0.50..0.95 band as the README tiers; None when no facts are known.
+    """
+    best: Optional[float] = None
+    detail: Dict[str, Any] = {}
+    for url in valid:
+        ds = dataset_id(url)
+        facts = dataset_meta.get(ds) if ds else None
+        if not isinstance(facts, Mapping):
+            continue
+        checks = _facts_checks(facts)
+        score = 0.50 + 0.45 * sum(checks.values()) / len(checks)
+        detail[ds or url] = {"checks": checks, "num_rows": facts.get("num_rows", 0)}
+        if best is None or score > best:
+            best = score
+    return best, detail
+
+
 def _count_quality_hits(readme_text: str) -> int:
     """Count distinct quality-related keywords present in the README."""
     if not readme_text:
@@ -64,6 +108,8 @@ def _count_quality_hits(readme_text: str) -> int:
 
 class DatasetQualityMetric:
     name = "dataset_quality"
+    cost = COST_NETWORK
+    dedup_inputs = ("datasets", "readme_text", "dataset_meta")
 
     def compute(self, ctx: Dict[str, Any]) -> MetricResult:
         t0 = time.perf_counter()
@@ -108,6 +154,14 @@ class DatasetQualityMetric:
             "readme_hits": hits,
             "tier": tier,
         }
+
+        # Real dataset facts (prefetched into ctx["dataset_meta"]) can lift the
+        # score when the datasets themselves are well documented.
+        facts_score, facts = _facts_score(valid, ctx.get("dataset_meta") or {})
+        if facts_score is not None:
+            extras["dataset_facts"] = facts
+            if facts_score > score:
+                score, extras["tier"] = facts_score, "dataset_facts"
         return MetricResult(
             score=score,
             latency_ms=int((time.perf_counter() - t0) * 1000),
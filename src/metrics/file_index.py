@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+
+def _basename(lower_path: str) -> str:
+    return lower_path.rsplit("/", 1)[-1].rsplit("\\", 1)[-1]
+
+
+def _share(path: str) -> str:
+    # Interning unique nested paths (dataset shards) would only grow the intern table.
+    return path if "/" in path else sys.intern(path)
+
+
+class FileIndex:
+    """
+    Precomputed views of one repository's file list, shared by all metrics.
+
+    Built once per model (in ``fetch_hf_model_meta``) so metrics answer
+    basename, extension, suffix and index-file questions in O(1)/O(k), where
+    k is the number of files with the relevant extension, instead of
+    re-lowercasing and scanning every sibling.
+
+    Storage is compact because many models are in flight at once: top-level
+    names (``config.json``, ``README.md``, ...) are interned so every model
+    shares one copy, a path already in lowercase doubles as its lowercase
+    form, sizes live in one ``array('q')`` and extension buckets in
+    ``array('l')``; no per-file objects exist beyond the path strings.
+    """
+
+    __slots__ = ("paths", "sizes", "lower", "_by_ext")
+
+    def __init__(self, paths: Iterable[str], sizes: Optional[Iterable[Any]] = None) -> None:
+        self.paths: List[str] = [_share(str(p)) for p in paths]
+        self.sizes = array("q", (int(s or 0) for s in sizes) if sizes is not None else ())
+        if len(self.sizes) < len(self.paths):
+            self.sizes.extend([0] * (len(self.paths) - len(self.sizes)))
+        lower = [p if (low := p.lower()) == p else _share(low) for p in self.paths]
+        same = all(a is b for a, b in zip(lower, self.paths))
+        self.lower: List[str] = self.paths if same else lower
+        self._by_ext: Dict[str, "array[int]"] = {}
+        for i, low in enumerate(self.lower):
+            base = _basename(low)
+            dot = base.rfind(".")
+            if dot != -1:
+                ext = base[dot + 1:]
+                bucket = self._by_ext.get(ext)
+                if bucket is None:
+                    bucket = self._by_ext[sys.intern(ext)] = array("l")
+                bucket.append(i)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(s for s in self.sizes if s > 0)
+
+    def has_basename(self, names: Iterable[str]) -> bool:
+        """True if any file (at any depth) has one of these lowercase basenames."""
+        for n in names:
+            dot = n.rfind(".")
+            candidates = self._by_ext.get(n[dot + 1:], ()) if dot != -1 else range(len(self))
+            for i in candidates:
+                if _basename(self.lower[i]) == n:
+                    return True
+        return False
+
+    def first_path(self, names: Iterable[str]) -> Optional[str]:
+        """The earliest-listed file whose full path is one of ``names``."""
+        wanted = set(names)
+        if not all("." in n for n in wanted):
+            return next((p for p in self.paths if p in wanted), None)
+        exts = {n.rsplit(".", 1)[-1].lower() for n in wanted}
+        for i in self.with_ext(sorted(exts)):
+            if self.paths[i] in wanted:
+                return self.paths[i]
+        return None
+
+    def with_ext(self, exts: Sequence[str]) -> List[int]:
+        """Positions (in listing order) of files with one of these extensions."""
+        out: List[int] = []
+        for e in exts:
+            out.extend(self._by_ext.get(e.lstrip(".").lower(), ()))
+        if len(exts) > 1:
+            out.sort()
+        return out
+
+    def any_suffix(self, suffixes: Tuple[str, ...]) -> bool:
+        """
+        Equivalent to ``any(p.lower().endswith(suffixes) for p in paths)``.
+        Suffixes containing a dot only look at files with that extension.
+        """
+        for s in suffixes:
+            s = s.lower()
+            dot = s.rfind(".")
+            if dot == -1:
+                if any(p.endswith(s) for p in self.lower):
+                    return True
+            elif any(self.lower[i].endswith(s) for i in self._by_ext.get(s[dot + 1:], ())):
+                return True
+        return False
+
+    def containing(self, sub: str) -> List[str]:
+        """Lowercased paths containing ``sub`` (lowercase); a full scan."""
+        return [p for p in self.lower if sub in p]
+
+    def ext_bytes(self, exts: Sequence[str]) -> Tuple[int, Dict[str, int]]:
+        """Total positive size of files with these extensions, and the per-extension split."""
+        total = 0
+        by_ext: Dict[str, int] = {}
+        for i in self.with_ext(exts):
+            size = self.sizes[i]
+            if size <= 0:
+                continue
+            ext = self.lower[i].rsplit(".", 1)[-1]
+            total += size
+            by_ext[ext] = by_ext.get(ext, 0) + size
+        return total, by_ext
+
+
+def file_index(ctx: Mapping[str, Any]) -> FileIndex:
+    """
+    The context's FileIndex, or one built from its plain ``files`` /
+    ``files_meta`` lists (metric tests and older callers pass those).
+    """
+    idx = ctx.get("file_index")
+    if isinstance(idx, FileIndex):
+        return idx
+    files = [str(f) for f in (ctx.get("files") or [])]
+    sizes = [0] * len(files)
+    pos = {f: i for i, f in enumerate(files)}
+    for fm in ctx.get("files_meta") or []:
+        if not isinstance(fm, Mapping):
+            continue
+        name = str(fm.get("rfilename", ""))
+        size = int(fm.get("size", 0) or 0)
+        if name in pos:
+            sizes[pos[name]] = size
+        else:
+            pos[name] = len(files)
+            files.append(name)
+            sizes.append(size)
+    return FileIndex(files, sizes)
@@ -4,7 +4,8 @@ import re
 import time
 from typing import Any, Dict
 
-from .base import MetricResult
+from .base import COST_PURE, MetricResult
+from .markdown import ModelCard
 
 # SPDX-ish normalization
 _COMPAT_1_0 = {
@@ -31,7 +32,7 @@ _ALIASES = {
     "cc-by-nc-4": "cc-by-nc-4.0",
 }
 
-LICENSE_SEC = re.compile(r"^\s{0,3}#{1,3}\s*license\b.*?$([\s\S]*?)(^\s{0,3}#{1,3}\s|\Z)", re.I | re.M)
+LICENSE_HEAD = re.compile(r"license\b", re.I)
 
 
 def _norm(s: str) -> str:
@@ -56,6 +57,8 @@ def _score(token: str) -> float:
 
 class LicenseMetric:
     name = "license"
+    cost = COST_PURE
+    dedup_inputs = ("readme_text", "card_data", "hf_license")
 
     def compute(self, ctx: Dict[str, Any]) -> MetricResult:
         t0 = time.perf_counter()
@@ -65,9 +68,8 @@ class LicenseMetric:
 
         # try README section if HF is unknown/other
         readme_lic = ""
-        m = LICENSE_SEC.search(readme)
-        if m:
-            blob = m.group(1) or ""
+        blob = ModelCard(readme).section(LICENSE_HEAD) if readme else None
+        if blob:
             # pick shortest token that looks like a license
             candidates = re.findall(
                 r"(apache[-\s]?2\.0|mit|bsd[\s-]?(?:2|3)|lgpl[-\s]?2\.1(?:-or-later)?|gpl[-\s]?3|agpl[-\s]?3|"
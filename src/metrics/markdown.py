@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import re
+from typing import List, NamedTuple, Optional, Pattern, Sequence
+
+# Every pattern here is anchored at a line start and never crosses a newline,
+# so a scan is linear in the size of the model card.
+_HEADING = re.compile(r"^[^\S\n]{0,3}(#{1,3})(?!#)([^\n]*)", re.M)
+_TABLE_ROW = re.compile(r"^[^\S\n]*\|[^\n]*\|[^\S\n]*$", re.M)
+_FENCE_LANG = re.compile(r"[A-Za-z0-9_-]*")
+
+# Headings and fence candidates examined per document before scans give up.
+# A step count rather than a clock, so a card scores the same under any load.
+MAX_STEPS = 50_000
+
+
+class Heading(NamedTuple):
+    level: int
+    title: str  # text after the '#' run, unstripped
+    start: int  # offset of the heading line
+    end: int  # offset just past the heading text (the '\n' or end of document)
+
+
+class ModelCard:
+    """
+    Linear-time scanner for the README checks the metrics make.
+
+    Headings are tokenized once and shared by section and heading lookups;
+    fenced code is found with ``str.find`` instead of a lazy regex. Scans stop
+    once the document's ``max_steps`` are spent and report "not found", with
+    ``truncated`` set so callers can surface it.
+    """
+
+    def __init__(self, text: str, max_steps: int = MAX_STEPS) -> None:
+        self.text = text
+        self.truncated = False
+        self._steps_left = max_steps
+        self._headings: Optional[List[Heading]] = None
+
+    def _step(self) -> bool:
+        """Spend one step; True once the budget is exhausted."""
+        if self._steps_left <= 0:
+            self.truncated = True
+        self._steps_left -= 1
+        return self.truncated
+
+    def headings(self) -> List[Heading]:
+        """ATX headings of level 1-3 (up to three leading spaces, exact '#' run)."""
+        if self._headings is None:
+            out: List[Heading] = []
+            for m in _HEADING.finditer(self.text):
+                if self._step():
+                    break
+                out.append(Heading(len(m.group(1)), m.group(2), m.start(), m.end()))
+            self._headings = out
+        return self._headings
+
+    def find_heading(self, title: Pattern[str]) -> Optional[Heading]:
+        """First heading whose title (after leading whitespace) matches ``title``."""
+        for h in self.headings():
+            if title.match(h.title.lstrip()):
+                return h
+        return None
+
+    def section(self, title: Pattern[str]) -> Optional[str]:
+        """
+        Body of the first section whose heading matches ``title``: everything
+        after the heading line up to the next heading whose '#' run is
+        followed by whitespace (including a line break), or the end of the
+        document.
+        """
+        hs = self.headings()
+        for k, h in enumerate(hs):
+            if not title.match(h.title.lstrip()):
+                continue
+            end = n = len(self.text)
+            for nxt in hs[k + 1:]:
+                if nxt.title[:1].isspace() or (not nxt.title and nxt.end < n):
+                    end = nxt.start
+                    break
+            return self.text[h.end:end]
+        return None
+
+    def has_table_row(self) -> bool:
+        """A line whose stripped content starts and ends with '|' (at least two pipes)."""
+        if "|" not in self.text or self.truncated:
+            return False
+        return _TABLE_ROW.search(self.text) is not None
+
+    def has_fenced_code(self, langs: Optional[Sequence[str]] = None) -> bool:
+        """
+        A ```-fence followed by an info string, whitespace, at least one
+        character and a closing ```. ``langs`` restricts the info string to
+        the given names (case-insensitive); otherwise any ``[A-Za-z0-9_-]*``.
+        """
+        text, n = self.text, len(self.text)
+        q = text.find("```")
+        while q != -1:
+            if self._step():
+                return False
+            j = self._after_lang(q + 3, langs)
+            if j is not None and j < n and text[j].isspace():
+                # Any later ``` closes this fence; if there is none, no later
+                # opener can be closed either.
+                return text.find("```", j + 2) != -1
+            q = text.find("```", q + 1)
+        return False
+
+    def _after_lang(self, j: int, langs: Optional[Sequence[str]]) -> Optional[int]:
+        if langs is None:
+            return _FENCE_LANG.match(self.text, j).end()  # type: ignore[union-attr]
+        for lang in langs:
+            k = j + len(lang)
+            if self.text[j:k].lower() == lang and k < len(self.text) and self.text[k].isspace():
+                return k
+        return None
@@ -4,13 +4,14 @@ import re
 import time
 from typing import Any, Dict
 
-from .base import MetricResult
+from .base import COST_PURE, MetricResult
+from .file_index import FileIndex, file_index
+from .markdown import ModelCard
 
 # Detects structured evaluation claims on HF cards or in README
 MODEL_INDEX_NAMES = {"model_index.json", "model-index.json"}
 
-RESULTS_HEAD = re.compile(r"^\s{0,3}#{1,3}\s*(results?|evaluation|benchmarks?)\b", re.I | re.M)
-TABLE_ROW = re.compile(r"^\s*\|.*\|\s*$", re.M)
+RESULTS_HEAD = re.compile(r"(results?|evaluation|benchmarks?)\b", re.I)
 METRIC_HINTS = (
     "accuracy",
     "f1",
@@ -27,26 +28,27 @@ METRIC_HINTS = (
 )
 
 
-def _has_model_index(files: list[str]) -> bool:
+def _has_model_index(files: FileIndex) -> bool:
     """True if repo lists a HF model-index file (any path depth)."""
-    lower = [str(f).lower() for f in (files or [])]
-    basenames = {f.split("/")[-1].split("\\")[-1] for f in lower}
-    return any(name in basenames for name in MODEL_INDEX_NAMES)
+    return files.has_basename(MODEL_INDEX_NAMES)
 
 
 class PerformanceClaimsMetric:
     name = "performance_claims"
+    cost = COST_PURE
+    dedup_inputs = ("readme_text", "file_index")
 
     def compute(self, ctx: Dict[str, Any]) -> MetricResult:
         t0 = time.perf_counter()
 
-        files = [str(f) for f in (ctx.get("files") or [])]
+        files = file_index(ctx)
         readme = ctx.get("readme_text") or ""
 
         # Signals
         has_idx = _has_model_index(files)
-        has_head = bool(RESULTS_HEAD.search(readme))
-        has_table = bool(TABLE_ROW.search(readme))
+        doc = ModelCard(readme)
+        has_head = doc.find_heading(RESULTS_HEAD) is not None
+        has_table = doc.has_table_row()
         has_metric_kw = any(h in readme.lower() for h in METRIC_HINTS)
 
         # Tiered mapping (no network fetch; stable & fast)
@@ -74,4 +76,6 @@ class PerformanceClaimsMetric:
             "readme_results_table": has_table,
             "readme_metric_keywords": has_metric_kw,
         }
+        if doc.truncated:
+            extras["readme_scan_truncated"] = True
         return MetricResult(score=score, latency_ms=latency_ms, extras=extras)
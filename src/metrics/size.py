@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import json
 import math
+import os
 import time
-from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Tuple
+from typing import Any, Dict, Mapping, MutableMapping, Optional, Tuple
 
-from .base import MetricResult
+from .base import COST_PURE, MetricResult
+from .file_index import FileIndex, file_index
 
 # Extensions that indicate model weight files
 WEIGHT_EXTS: Tuple[str, ...] = (
@@ -38,75 +40,99 @@ CAPS_GIB: Dict[str, float] = {
 SAFE_OCCUPANCY: float = 0.70
 TAU: float = 0.15
 
+# Bytes per parameter for the precision estimates built from safetensors headers.
+PRECISION_BYTES: Dict[str, float] = {"fp32": 4.0, "fp16": 2.0, "int8": 1.0, "int4": 0.5}
 
-def _logistic(util: float, tau: float = TAU) -> float:
-    """Logistic mapping where util ~= 1 means at the safe-occupancy threshold."""
-    return 1.0 / (1.0 + math.exp((util - 1.0) / tau))
+# Size assumed when neither file sizes nor an index JSON are available (200 MiB).
+HEURISTIC_BYTES: int = 200 * 1024**2
+
+_profiles_cache: Dict[str, Dict[str, float]] = {}
 
 
-def _is_weight_file(path: str) -> bool:
-    """Return True if the path looks like a model weight artifact."""
-    p: str = path.lower()
-    return p.endswith(WEIGHT_EXTS)
+def _logistic(util: float, tau: float = TAU) -> float:
+    """Logistic mapping where util ~= 1 means at the safe-occupancy threshold."""
+    return 1.0 / (1.0 + math.exp(min(700.0, (util - 1.0) / tau)))
 
 
-def _sum_files_meta_bytes(files_meta: Iterable[Mapping[str, Any]]) -> Tuple[int, Dict[str, int]]:
+def load_device_profiles(path: Optional[str] = None) -> Dict[str, float]:
     """
-    Sum sizes for weight-like files given HF 'files_metadata'.
+    Device capacities (GiB) to score against.
 
-    Returns:
-        total_bytes: Sum of sizes in bytes.
-        by_ext: Mapping from extension (e.g., 'bin', 'pt') to total bytes.
+    ``path`` (default: $SIZE_PROFILES_FILE) names a JSON object mapping device
+    names to capacities, e.g. ``{"phone": 6, "a100": 80}``; without one the
+    built-in CAPS_GIB profiles are used. Files are read once per process.
     """
-    total: int = 0
-    by_ext: Dict[str, int] = {}
-    for fm in files_meta:
-        name: str = str(fm.get("rfilename", ""))
-        if not _is_weight_file(name):
-            continue
-        size: int = int(fm.get("size", 0) or 0)
-        if size <= 0:
-            continue
-        total += size
-        ext: str = name.split(".")[-1].lower()
-        by_ext[ext] = by_ext.get(ext, 0) + size
-    return total, by_ext
+    path = path or os.getenv("SIZE_PROFILES_FILE")
+    if not path:
+        return CAPS_GIB
+    if path not in _profiles_cache:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or not data:
+            raise ValueError(f"{path}: expected a JSON object of device -> capacity in GiB")
+        profiles: Dict[str, float] = {}
+        for dev, cap in data.items():
+            if isinstance(cap, bool) or not isinstance(cap, (int, float)) or cap < 0:
+                raise ValueError(f"{path}: capacity for {dev!r} must be a non-negative number")
+            profiles[str(dev)] = float(cap)
+        _profiles_cache[path] = profiles
+    return _profiles_cache[path]
+
+
+def device_scores(total_gib: float, profiles: Mapping[str, float]) -> Dict[str, float]:
+    """Deployability per device profile for a model of ``total_gib``."""
+    out: Dict[str, float] = {}
+    for dev, cap_gib in profiles.items():
+        util: float = (total_gib / (cap_gib * SAFE_OCCUPANCY)) if cap_gib > 0 else 10.0
+        out[dev] = _logistic(util)
+    return out
 
 
 def _parse_index_total_size(ctx: Mapping[str, Any]) -> int:
     """
-    If an index JSON is present, parse it and extract metadata.total_size (bytes).
-
-    Args:
-        ctx: Metric context; expects 'files' and optionally 'repo_id' or 'name'.
+    Extract metadata.total_size (bytes) from the index JSON prefetched with the
+    model metadata (ctx["index_json"]); no network access happens here.
 
     Returns:
         Total model bytes if available, else 0.
     """
-    files_obj: Any = ctx.get("files")
-    files: List[str] = list(files_obj) if isinstance(files_obj, Iterable) else []  # type: ignore[typeddict-item]
-    index_name: str | None = next((f for f in files if f in INDEX_FILES), None)
-    if not index_name:
+    data: Any = ctx.get("index_json")
+    if not isinstance(data, Mapping):
         return 0
-    try:
-        from huggingface_hub import hf_hub_download
-
-        repo_id: str = str(ctx.get("repo_id") or ctx.get("name") or "")
-        path: str = hf_hub_download(repo_id=repo_id, filename=index_name, repo_type="model")
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            data: Dict[str, Any] = json.load(f)
-        meta_obj: Any = data.get("metadata") or {}
-        if isinstance(meta_obj, Mapping):
-            ts = int(meta_obj.get("total_size", 0) or 0)
-            return ts if ts > 0 else 0
+    meta_obj: Any = data.get("metadata") or {}
+    if not isinstance(meta_obj, Mapping):
         return 0
-    except Exception:
-        # Network / parsing failures are non-fatal; fall back to other methods.
+    try:
+        ts = int(meta_obj.get("total_size", 0) or 0)
+    except (TypeError, ValueError):
         return 0
+    return ts if ts > 0 else 0
+
+
+def _param_extras(summary: Any, profiles: Mapping[str, float]) -> Dict[str, Any]:
+    """
+    Extras from the prefetched safetensors header summary (ctx["safetensors"]):
+    exact parameter count, dtype mix, and size/score if stored at each precision.
+    """
+    if not isinstance(summary, Mapping) or not summary.get("params"):
+        return {}
+    params = int(summary["params"])
+    precision_gib = {p: params * b / float(1024**3) for p, b in PRECISION_BYTES.items()}
+    precision_overall = {}
+    for p, gib in precision_gib.items():
+        s = device_scores(gib, profiles)
+        precision_overall[p] = sum(s.values()) / max(1, len(s))
+    return {
+        "param_count": params,
+        "dtype_params": dict(summary.get("dtype_params") or {}),
+        "precision_gib": precision_gib,
+        "precision_size_score": precision_overall,
+    }
 
 
 class SizeMetric:
     name: str = "size_score"
+    cost: str = COST_PURE
 
     def compute(self, ctx: Mapping[str, Any]) -> MetricResult:
         """
@@ -114,18 +140,15 @@ class SizeMetric:
         Higher score => easier to deploy across a range of hardware.
 
         Strategy:
-          1) Sum sizes from files_meta for weight-like files.
-          2) If absent/zero, parse index JSON (if present).
-          3) If still zero, fall back to a small heuristic size (for stability offline).
+          1) Sum sizes of weight-like files from the file index.
+          2) If absent/zero, use the prefetched index JSON (if present).
+          3) Else the data size from the safetensors headers (listed models have no sizes).
+          4) If still zero, fall back to a small heuristic size (for stability offline).
         """
         t0: float = time.perf_counter()
 
-        files_meta_obj: Any = ctx.get("files_meta") or []
-        files_meta: Iterable[Mapping[str, Any]] = (
-            files_meta_obj if isinstance(files_meta_obj, Iterable) else []
-        )
-
-        total_bytes, per_ext = _sum_files_meta_bytes(files_meta)
+        files: FileIndex = file_index(ctx)
+        total_bytes, per_ext = files.ext_bytes(WEIGHT_EXTS)
 
         method_used: str = "files_meta"
         if total_bytes == 0:
@@ -134,17 +157,21 @@ class SizeMetric:
                 total_bytes = idx_total
                 method_used = "index_json"
 
+        summary: Any = ctx.get("safetensors")
+        if total_bytes == 0 and isinstance(summary, Mapping):
+            total_bytes = int(summary.get("data_bytes") or 0)
+            if total_bytes > 0:
+                method_used = "safetensors"
+
         if total_bytes == 0:
-            # Conservative default (200 MiB) for offline/edge cases.
-            total_bytes = 200 * 1024**2
+            # Conservative default for offline/edge cases.
+            total_bytes = HEURISTIC_BYTES
             method_used = "heuristic"
 
         total_gib: float = total_bytes / float(1024**3)
 
-        profiles: Dict[str, float] = {}
-        for dev, cap_gib in CAPS_GIB.items():
-            util: float = (total_gib / (cap_gib * SAFE_OCCUPANCY)) if cap_gib > 0 else 10.0
-            profiles[dev] = _logistic(util)
+        caps = load_device_profiles()
+        profiles: Dict[str, float] = device_scores(total_gib, caps)
 
         overall: float = sum(profiles.values()) / max(1, len(profiles))
 
@@ -156,6 +183,7 @@ class SizeMetric:
             "per_ext_bytes": per_ext,
             "method": method_used,
         }
+        extras.update(_param_extras(summary, caps))
 
         latency_ms: int = int((time.perf_counter() - t0) * 1000)
         return MetricResult(score=overall, latency_ms=latency_ms, extras=dict(extras))
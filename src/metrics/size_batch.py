@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .file_index import FileIndex, _basename
+from .size import (
+    HEURISTIC_BYTES,
+    SAFE_OCCUPANCY,
+    TAU,
+    WEIGHT_EXTS,
+    device_scores,
+    load_device_profiles,
+)
+
+_WEIGHT_EXT_NAMES = frozenset(e.lstrip(".") for e in WEIGHT_EXTS)
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+
+        return numpy
+    except ImportError:
+        return None
+
+
+@dataclass
+class SizeBatch:
+    """
+    Columnar size results for many models, in input order.
+
+    With NumPy the columns are ``ndarray``s, otherwise lists; index them the
+    same way either way.
+    """
+
+    total_bytes: Sequence[int]
+    per_ext_bytes: Dict[str, Sequence[int]]
+    scores: Dict[str, Sequence[float]]
+    overall: Sequence[float]
+
+
+def _ext(lower_path: str) -> str:
+    base = _basename(lower_path)
+    return base.rpartition(".")[2] if "." in base else ""
+
+
+def batch_arrays(indexes: Iterable[FileIndex]) -> Tuple[List[int], List[str], List[int], int]:
+    """
+    Flatten per-model file indexes into the ``(sizes, exts, owners, n_models)``
+    arrays score_batch() takes; ``owners[i]`` is the model position of file i.
+    """
+    sizes: List[int] = []
+    exts: List[str] = []
+    owners: List[int] = []
+    n = 0
+    for n, idx in enumerate(indexes, start=1):
+        sizes.extend(idx.sizes)
+        exts.extend(_ext(p) for p in idx.lower)
+        owners.extend([n - 1] * len(idx))
+    return sizes, exts, owners, n
+
+
+def score_batch(
+    sizes: Sequence[int],
+    exts: Sequence[str],
+    owners: Sequence[int],
+    n_models: int,
+    profiles: Optional[Mapping[str, float]] = None,
+    default_bytes: int = HEURISTIC_BYTES,
+    use_numpy: Optional[bool] = None,
+) -> SizeBatch:
+    """
+    Totals, per-extension breakdowns and every device-profile score for many
+    models at once.
+
+    Files are given as parallel arrays (size in bytes, lowercase extension
+    without the dot, owning model position). Only weight files with a
+    positive size count, as in SizeMetric; a model with no such files is
+    scored as ``default_bytes``. Uses one vectorized NumPy pass when NumPy
+    is installed (``pip install .[fast]``) and a pure-Python loop otherwise.
+    """
+    profiles = dict(profiles if profiles is not None else load_device_profiles())
+    np = _numpy() if use_numpy is not False else None
+    if use_numpy and np is None:
+        raise RuntimeError("score_batch(use_numpy=True) needs numpy; install the 'fast' extra")
+    if np is not None:
+        return _score_numpy(np, sizes, exts, owners, n_models, profiles, default_bytes)
+    return _score_python(sizes, exts, owners, n_models, profiles, default_bytes)
+
+
+def _score_python(
+    sizes: Sequence[int],
+    exts: Sequence[str],
+    owners: Sequence[int],
+    n_models: int,
+    profiles: Mapping[str, float],
+    default_bytes: int,
+) -> SizeBatch:
+    totals = [0] * n_models
+    per_ext: Dict[str, List[int]] = {}
+    for size, ext, owner in zip(sizes, exts, owners):
+        if size <= 0 or ext not in _WEIGHT_EXT_NAMES:
+            continue
+        totals[owner] += size
+        col = per_ext.get(ext)
+        if col is None:
+            col = per_ext[ext] = [0] * n_models
+        col[owner] += size
+    scores: Dict[str, List[float]] = {dev: [] for dev in profiles}
+    overall: List[float] = []
+    for total in totals:
+        s = device_scores((total or default_bytes) / float(1024**3), profiles)
+        for dev, v in s.items():
+            scores[dev].append(v)
+        overall.append(sum(s.values()) / max(1, len(s)))
+    return SizeBatch(totals, dict(sorted(per_ext.items())), dict(scores), overall)
+
+
+def _score_numpy(
+    np: Any,
+    sizes: Sequence[int],
+    exts: Sequence[str],
+    owners: Sequence[int],
+    n_models: int,
+    profiles: Mapping[str, float],
+    default_bytes: int,
+) -> SizeBatch:
+    size_arr = np.asarray(sizes, dtype=np.int64)
+    owner_arr = np.asarray(owners, dtype=np.intp)
+    if isinstance(exts, np.ndarray):
+        uniq, codes = np.unique(exts.astype(str), return_inverse=True)
+    else:
+        # A dict vocabulary beats sorting millions of strings with np.unique.
+        names = sorted(set(exts)) or [""]
+        vocab = {e: i for i, e in enumerate(names)}
+        codes = np.fromiter(map(vocab.__getitem__, exts), np.intp, len(exts))
+        uniq = np.asarray(names, dtype=str)
+    is_weight = np.isin(uniq, sorted(_WEIGHT_EXT_NAMES))
+    keep = is_weight[codes] & (size_arr > 0)
+
+    k = max(1, len(uniq))
+    # One bincount over (model, extension) cells gives every breakdown at once.
+    flat = np.bincount(
+        owner_arr[keep] * k + codes[keep],
+        weights=size_arr[keep].astype(np.float64),
+        minlength=n_models * k,
+    ).reshape(n_models, k)
+    cells = np.rint(flat).astype(np.int64)
+    per_ext = {
+        str(uniq[j]): cells[:, j]
+        for j in np.flatnonzero(is_weight)
+        if cells[:, j].any()
+    }
+    totals = cells.sum(axis=1)
+
+    gib = np.where(totals > 0, totals, default_bytes) / float(1024**3)
+    caps = np.asarray(list(profiles.values()), dtype=np.float64)
+    with np.errstate(divide="ignore", over="ignore"):
+        util = np.where(caps > 0, gib[:, None] / (caps * SAFE_OCCUPANCY), 10.0)
+        matrix = 1.0 / (1.0 + np.exp(np.minimum(700.0, (util - 1.0) / TAU)))
+    scores = {dev: matrix[:, j] for j, dev in enumerate(profiles)}
+    overall = matrix.mean(axis=1) if len(profiles) else np.zeros(n_models)
+    return SizeBatch(totals, per_ext, scores, overall)
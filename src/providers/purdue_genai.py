@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 import time
 from typing import Any, Dict, Optional, Tuple, cast
 
 import requests
 
+from core.tracing import span
+
 GENAI_BASE_URL = os.getenv("GENAI_BASE_URL", "https://genai.rcac.purdue.edu/api/chat/completions")
 
 
@@ -14,6 +17,19 @@ class PurdueGenAIError(RuntimeError):
     pass
 
 
+_session_lock = threading.Lock()
+_session_obj: Optional[requests.Session] = None
+
+
+def _session() -> requests.Session:
+    """Shared keep-alive session so repeated calls reuse TCP/TLS connections."""
+    global _session_obj
+    with _session_lock:
+        if _session_obj is None:
+            _session_obj = requests.Session()
+        return _session_obj
+
+
 def _get_api_key() -> Optional[str]:
     # Support both names
     return os.getenv("GEN_AI_STUDIO_API_KEY") or os.getenv("PURDUE_GENAISTUDIO_API_KEY")
@@ -28,7 +44,8 @@ def _post_chat_completion(
 ) -> Dict[str, Any]:
     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
     body: Dict[str, Any] = {"model": model, "messages": messages, "stream": stream}
-    resp = requests.post(GENAI_BASE_URL, headers=headers, json=body, timeout=timeout)
+    with span("llm", kind="client", model=model):
+        resp = _session().post(GENAI_BASE_URL, headers=headers, json=body, timeout=timeout)
     if resp.status_code != 200:
         raise PurdueGenAIError(f"GenAI HTTP {resp.status_code}: {resp.text[:500]}")
     try:
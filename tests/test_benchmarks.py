@@ -0,0 +1,37 @@
+import os
+import sys
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import bench_collate  # noqa: E402
+
+
+def test_offline_collate_benchmark_smoke(tmp_path):
+    r = bench_collate.run_once(4, workers=2, workdir=str(tmp_path))
+    assert r["models"] == 4
+    assert r["models_per_s"] > 0 and r["peak_rss_mb"] > 0
+    assert {"metric.license", "metric.code_quality", "clone"} <= set(r["stages"])
+
+
+def test_compare_flags_throughput_and_memory_regressions():
+    base = {"100": {"models_per_s": 10.0, "peak_rss_mb": 100.0}}
+    ok = {"100": {"models_per_s": 9.0, "peak_rss_mb": 110.0}}
+    bad = {"100": {"models_per_s": 7.0, "peak_rss_mb": 130.0}}
+    assert bench_collate.compare(ok, base, 0.2) == []
+    assert len(bench_collate.compare(bad, base, 0.2)) == 2
+
+
+def test_metric_microbench_smoke_and_regression_check(monkeypatch):
+    import bench_metrics
+
+    monkeypatch.setenv("GEN_AI_STUDIO_API_KEY", "kept")
+    r = bench_metrics.run_cases(scales=(("tiny", 2_000, 50),), adversarial_lines=5, min_time=0.0)
+    assert os.environ["GEN_AI_STUDIO_API_KEY"] == "kept"
+    assert {"size_score/tiny", "license/adv_blank_runs"} <= set(r)
+    assert all(v["ns_per_op"] > 0 for v in r.values())
+    assert bench_metrics.check(r, r, 0.25, max_op_ms=1e9) == []
+    slow = {k: dict(v, ns_per_op=v["ns_per_op"] * 2, max_op_ms=1e9) for k, v in r.items()}
+    problems = bench_metrics.check(slow, r, 0.25, max_op_ms=1e6)
+    assert len(problems) == 2 * len(r)
@@ -0,0 +1,48 @@
+import threading
+import time
+
+from core.cache import MetadataCache
+
+
+def test_concurrent_callers_share_one_load():
+    cache = MetadataCache("t")
+    calls = []
+
+    def load():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"rows": 3}
+
+    out = []
+    threads = [
+        threading.Thread(target=lambda: out.append(cache.get("squad", load))) for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1 and cache.loads == 1
+    assert out == [{"rows": 3}] * 8
+
+
+def test_persistent_layer_survives_a_new_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("METADATA_CACHE_DIR", str(tmp_path))
+    MetadataCache("t").get("a/b", lambda: {"rows": 1})
+    MetadataCache("t").get("missing", lambda: None)
+    again = MetadataCache("t")
+    assert again.get("a/b", lambda: {"rows": 2}) == {"rows": 1} and again.loads == 0
+    assert again.get("missing", lambda: "retried") == "retried"
+    stale = MetadataCache("t", ttl_s=0)
+    assert stale.get("a/b", lambda: {"rows": 2}) == {"rows": 2}
+
+
+def test_memory_layer_is_bounded_and_expires(monkeypatch):
+    monkeypatch.delenv("METADATA_CACHE_DIR", raising=False)
+    small = MetadataCache("t", max_entries=2)
+    for k in "abc":
+        small.get(k, lambda k=k: k)
+    assert len(small) == 2 and small.get("a", lambda: "reloaded") == "reloaded"
+    expiring = MetadataCache("t", ttl_s=0)
+    expiring.get("x", lambda: 1)
+    time.sleep(0.01)
+    assert expiring.get("x", lambda: 2) == 2 and expiring.loads == 2
@@ -0,0 +1,74 @@
+import json
+
+import core.cli as cli_mod
+import core.compute as C
+from core.checkpoint import Journal
+from core.options import use_options
+
+SEQ = [
+    "https://huggingface.co/datasets/a/b",
+    "https://huggingface.co/o/m1",
+    "https://huggingface.co/o/m2",
+    "https://huggingface.co/o/m3",
+]
+
+
+def test_journal_roundtrip_ignores_truncated_tail(tmp_path):
+    p = tmp_path / "run.journal"
+    with Journal(str(p)) as j:
+        j.record(1, "u1", {"name": "m1", "net_score": 0.5})
+        j.record(1, "u1", {"name": "dup"})  # first write wins
+    with open(p, "a", encoding="utf-8") as f:
+        f.write('{"index": 2, "url": "u2", "ro')  # crash mid-write
+    with Journal(str(p), resume=True) as j:
+        assert len(j) == 1
+        assert j.get(1, "u1") == {"name": "m1", "net_score": 0.5}
+        assert j.get(2, "u2") is None
+
+
+def test_resume_after_torn_write_keeps_later_records(tmp_path):
+    p = tmp_path / "run.journal"
+    with Journal(str(p)) as j:
+        j.record(1, "u1", {"name": "m1"})
+    with open(p, "a", encoding="utf-8") as f:
+        f.write('{"index": 2, "url": "u2", "ro')  # crash mid-write
+    with Journal(str(p), resume=True) as j:
+        j.record(2, "u2", {"name": "m2"})
+    with Journal(str(p), resume=True) as j:
+        assert j.get(2, "u2") == {"name": "m2"}
+        j.record(3, "u3", {"name": "m3"})
+    with Journal(str(p), resume=True) as j:
+        assert len(j) == 3
+    assert len(p.read_text().splitlines()) == 3
+
+
+def test_collate_resume_skips_completed_models(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_compute_one(u, ds, code):
+        calls.append(u)
+        return {"name": u.rsplit("/", 1)[-1]}
+
+    monkeypatch.setattr(C, "compute_one", fake_compute_one)
+    p = tmp_path / "run.journal"
+    with Journal(str(p)) as j, use_options(journal=j):
+        first = C.collate(SEQ)
+        assert next(first) == {"name": "m1"}
+        first.close()  # simulate the job dying after one model
+
+    calls.clear()
+    with Journal(str(p), resume=True) as j, use_options(journal=j):
+        rows = list(C.collate(SEQ))
+    assert [r["name"] for r in rows] == ["m1", "m2", "m3"]
+    assert "https://huggingface.co/o/m1" not in calls
+    keys = [(r["index"], r["url"]) for r in map(json.loads, p.read_text().splitlines())]
+    assert keys == [(1, SEQ[1]), (2, SEQ[2]), (3, SEQ[3])]
+
+
+def test_cli_resume_uses_default_journal(monkeypatch, tmp_path):
+    src = tmp_path / "urls.txt"
+    src.write_text("\n".join(SEQ) + "\n")
+    monkeypatch.setattr(C, "compute_one", lambda u, ds, code: {"name": u})
+    monkeypatch.setattr(cli_mod, "write_rows", lambda rows: list(rows))
+    assert cli_mod.main(["prog", "--resume", str(src)]) == 0
+    assert len((tmp_path / "urls.txt.journal").read_text().splitlines()) == 3
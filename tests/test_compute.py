@@ -1,3 +1,4 @@
+import time
 from types import SimpleNamespace
 from metrics.base import MetricResult
 import core.compute as C
@@ -81,3 +82,57 @@ def test_compute_one_with_mocks(monkeypatch):
     assert row["bus_factor"] >= 0.6
     # size latency includes fetch_ms
     assert row["size_score_latency"] >= 7
+
+
+def test_collate_shares_identical_work_across_models(monkeypatch):
+    readmes = {"base": "same card", "base-gguf": "same card", "other": "different"}
+    monkeypatch.setattr(C, "fetch_hf_model_meta", lambda p: (
+        {"files": ["config.json"], "readme_text": readmes[p.name], "last_modified": ""}, 1))
+    clones = []
+    monkeypatch.setattr(C, "analyze_github_urls",
+                        lambda urls, max_commits=200: clones.extend(urls) or {})
+    runs = []
+
+    class TextMetric(FakeMetric):
+        dedup_inputs = ("readme_text",)
+
+        def compute(self, ctx):
+            runs.append(ctx["readme_text"])
+            return super().compute(ctx)
+
+    metrics = [TextMetric(n, 0.5) for n in C.NET_WEIGHTS]
+    monkeypatch.setattr(C, "metric_registry", lambda: metrics)
+    seq = ["https://github.com/o/r", "https://huggingface.co/o/base",
+           "https://github.com/O/r/", "https://huggingface.co/o/base-gguf",
+           "https://huggingface.co/o/other"]
+    rows = list(C.collate(seq))
+    assert [r["name"] for r in rows] == ["base", "base-gguf", "other"]
+    assert len(clones) == 1
+    assert sorted(runs) == sorted(["same card", "different"] * len(metrics))
+    # Outside a run, compute_one does not memoize.
+    C.compute_one("https://huggingface.co/o/base", [], [])
+    assert len(runs) == 3 * len(metrics)
+
+
+def test_net_score_latency_excludes_github_analysis(monkeypatch):
+    monkeypatch.setattr(C, "fetch_hf_model_meta", lambda p: ({"last_modified": ""}, 0))
+    monkeypatch.setattr(C, "analyze_github_urls", lambda *a, **k: time.sleep(0.3) or {})
+    monkeypatch.setattr(C, "metric_registry", lambda: [FakeMetric("code_quality", 1.0)])
+    row = C.compute_one("https://huggingface.co/o/m", [], ["https://github.com/o/r"])
+    assert row["net_score_latency"] < 300
+
+
+def test_local_checkouts_are_not_merged_by_case(monkeypatch):
+    monkeypatch.setattr(C, "fetch_hf_model_meta", lambda p: ({"last_modified": ""}, 0))
+    analyzed = []
+    monkeypatch.setattr(C, "analyze_github_urls",
+                        lambda urls, max_commits=200: analyzed.extend(urls) or {})
+    monkeypatch.setattr(C, "metric_registry", lambda: [FakeMetric("code_quality", 1.0)])
+    seq = ["file:///src/Repo", "https://huggingface.co/o/a",
+           "file:///src/repo", "https://huggingface.co/o/b",
+           "https://github.com/o/r.git", "https://huggingface.co/o/c",
+           "https://github.com/O/R", "https://huggingface.co/o/d"]
+    list(C.collate(seq))
+    assert sorted(analyzed) == [
+        "file:///src/Repo", "file:///src/repo", "https://github.com/o/r.git",
+    ]
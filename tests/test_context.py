@@ -0,0 +1,12 @@
+from core.context import ModelContext
+
+
+def test_model_context_behaves_like_a_dict():
+    ctx = ModelContext({"files": ["a"], "readme_text": "hi"}, custom=1)
+    assert not hasattr(ctx, "__dict__")
+    assert ctx["files"] == ["a"] and ctx.get("card_data") is None
+    assert ctx.get("custom") == 1 and "custom" in ctx and "likes" not in ctx
+    ctx["datasets"] = []
+    assert dict(ctx) == {"files": ["a"], "readme_text": "hi", "datasets": [], "custom": 1}
+    del ctx["custom"]
+    assert len(ctx) == 3
@@ -0,0 +1,92 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import core.compute as C
+from core.options import use_options
+from core.parallel import run_parallel
+from metrics.base import MetricResult
+
+release = threading.Event()
+
+
+@pytest.fixture(autouse=True)
+def _release_abandoned_work():
+    release.clear()
+    yield
+    release.set()
+
+
+class Metric:
+    def __init__(self, name, delay=0.0):
+        self.name, self.cost, self.delay = name, "pure", delay
+
+    def compute(self, ctx):
+        if self.delay:
+            release.wait(self.delay)
+        return MetricResult(score=1.0, latency_ms=1, extras={})
+
+
+def test_run_parallel_timeout_returns_finished_results():
+    t0 = time.monotonic()
+    out = run_parallel([lambda: 1, lambda: release.wait(5) and 2], timeout=0.2)
+    assert out == [1] and time.monotonic() - t0 < 2
+
+
+def test_model_timeout_emits_partial_row(monkeypatch):
+    monkeypatch.setattr(C, "fetch_hf_model_meta", lambda p: ({"last_modified": ""}, 0))
+    monkeypatch.setattr(C, "analyze_github_urls", lambda *a, **k: {})
+    monkeypatch.setattr(C, "metric_registry", lambda: [Metric("license"), Metric("bus_factor", 5)])
+    t0 = time.monotonic()
+    with use_options(model_timeout=0.3):
+        row = C.compute_one("https://huggingface.co/o/m", [], [])
+    assert time.monotonic() - t0 < 2
+    assert row["license"] == 1.0 and row["bus_factor"] is None
+    assert row["timed_out"] == ["bus_factor"]
+
+
+def test_run_deadline_stops_slow_fetches(monkeypatch):
+    monkeypatch.setattr(C, "fetch_hf_model_meta", lambda p: release.wait(5) and ({}, 0))
+    monkeypatch.setattr(C, "metric_registry", lambda: [Metric("license")])
+    urls = [f"https://huggingface.co/o/m{i}" for i in range(6)]
+    t0 = time.monotonic()
+    with use_options(deadline=time.monotonic() + 0.3, max_workers=2):
+        rows = list(C.collate(urls))
+    assert time.monotonic() - t0 < 2
+    assert len(rows) == 6 and all(r["timed_out"] == ["fetch", "license"] for r in rows)
+    assert all(r["net_score"] == 0.0 for r in rows)
+
+
+def test_abandoned_work_does_not_delay_process_exit():
+    src = os.path.join(os.path.dirname(__file__), os.pardir, "src")
+    code = (
+        "import time\n"
+        "from core.parallel import run_parallel\n"
+        "assert run_parallel([lambda: time.sleep(5)], timeout=0.1) == []\n"
+    )
+    t0 = time.monotonic()
+    subprocess.run([sys.executable, "-c", code], check=True, env={**os.environ, "PYTHONPATH": src})
+    assert time.monotonic() - t0 < 3
+
+
+def test_fingerprint_is_bounded_by_the_deadline(monkeypatch):
+    class SlowState:
+        def fingerprint(self, u, ds, code):
+            release.wait(5)
+
+        def get(self, u, fp):
+            return None
+
+        def record(self, u, fp, row):
+            pass
+
+    monkeypatch.setattr(C, "fetch_hf_model_meta", lambda p: ({"last_modified": ""}, 0))
+    monkeypatch.setattr(C, "metric_registry", lambda: [Metric("license")])
+    t0 = time.monotonic()
+    with use_options(incremental=SlowState(), model_timeout=0.3):
+        rows = list(C.collate(["https://huggingface.co/o/m"]))
+    assert time.monotonic() - t0 < 2 and rows[0]["license"] == 1.0
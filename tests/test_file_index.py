@@ -0,0 +1,33 @@
+from metrics.file_index import FileIndex, file_index
+
+
+def test_queries_match_plain_scans():
+    paths = ["README.md", "sub/Model.SafeTensors", "tokenizer/vocab.txt", "a\\model-index.json",
+             "pytorch_model.bin.index.json", "model.safetensors.index.json", "config.json"]
+    idx = FileIndex(paths, [1, 100, 0, 2, 3, 4, 5])
+    assert idx.has_basename({"model-index.json"}) and not idx.has_basename({"nope"})
+    assert idx.any_suffix((".safetensors", ".onnx")) and not idx.any_suffix((".gguf",))
+    assert idx.any_suffix(("config.json",)) and not idx.any_suffix(("config.yaml",))
+    assert idx.containing("tokenizer") == ["tokenizer/vocab.txt"]
+    assert idx.first_path(("model.safetensors.index.json", "pytorch_model.bin.index.json")) == (
+        "pytorch_model.bin.index.json"
+    )
+    assert idx.ext_bytes((".safetensors", ".bin")) == (100, {"safetensors": 100})
+    assert idx.total_bytes == 115
+
+
+def test_file_index_from_plain_context_merges_files_and_meta():
+    meta = [{"rfilename": "a.bin", "size": 7}, {"rfilename": "c.pt", "size": 3}]
+    idx = file_index({"files": ["a.bin", "b.txt"], "files_meta": meta})
+    assert idx.paths == ["a.bin", "b.txt", "c.pt"]
+    assert idx.ext_bytes((".bin", ".pt")) == (10, {"bin": 7, "pt": 3})
+    prebuilt = FileIndex(["x.onnx"])
+    assert file_index({"file_index": prebuilt, "files": []}) is prebuilt
+
+
+def test_storage_is_compact():
+    idx = FileIndex([f"data/shard-{i}.parquet" for i in range(1000)], range(1000))
+    assert idx.sizes.typecode == "q" and idx.lower is idx.paths
+    a, b = FileIndex(["Config.json"]), FileIndex(["".join(["Config", ".json"])])
+    assert a.paths[0] is b.paths[0]
+    assert a.has_basename({"config.json"}) and a.any_suffix(("config.json",))
@@ -31,3 +31,13 @@ def test_analyze_github_urls_happy(monkeypatch):
 def test_analyze_github_urls_no_repo():
     out = analyze_github_urls([])
     assert out == {}
+
+def test_analyze_file_url_scans_without_api_or_clone(monkeypatch, tmp_path):
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_x.py").write_text("")
+    (tmp_path / "benchmark.md").write_text("")
+    monkeypatch.setattr(ghmod, "Github", None)  # any API or clone use would fail
+    monkeypatch.setattr(ghmod, "Repo", None)
+    out = analyze_github_urls([tmp_path.as_uri()])
+    assert out["code_quality"] == 0.5 and out["performance_claims"] == 1.0
+    assert "bus_factor" not in out and "license" not in out
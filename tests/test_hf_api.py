@@ -1,6 +1,8 @@
 from types import SimpleNamespace
 import builtins
 
+import pytest
+
 from core.hf_api import _extract_hf_license, _readme_text, fetch_hf_model_meta
 
 def test_extract_hf_license_priority_card_tags():
@@ -36,4 +38,154 @@ def test_fetch_hf_model_meta(monkeypatch):
     assert ms >= 0
     assert data["repo_id"] == "a/b"
     assert data["files"] == ["README.md"]
+    assert data["file_index"].total_bytes == 123
     assert data["hf_license"] in ("mit","MIT","Mit")
+
+
+def test_fetch_prefetches_index_json_when_sizes_missing(monkeypatch, tmp_path):
+    index = tmp_path / "index.json"
+    index.write_text('{"metadata": {"total_size": 42}}')
+    siblings = [SimpleNamespace(rfilename="model.safetensors.index.json", size=None),
+                SimpleNamespace(rfilename="model-00001-of-00002.safetensors", size=None)]
+    info = SimpleNamespace(id="a/b", siblings=siblings, cardData={}, license=None, tags=[])
+    monkeypatch.setattr("core.hf_api._api", SimpleNamespace(model_info=lambda *a, **k: info))
+    monkeypatch.setattr("core.hf_api._readme_text", lambda repo_id: "readme")
+    calls = []
+
+    def fake_download(repo_id, filename, repo_type):
+        calls.append(filename)
+        return str(index)
+
+    monkeypatch.setattr("core.hf_api.hf_hub_download", fake_download)
+    summary = {"params": 10, "dtype_params": {"F16": 10}, "data_bytes": 20, "shards": 1}
+    monkeypatch.setattr(
+        "core.safetensors.fetch_summary", lambda repo_id, names: calls.append(names) or summary
+    )
+    data, _ = fetch_hf_model_meta(SimpleNamespace(owner="a", name="b"))
+    assert sorted(map(str, calls)) == sorted(
+        ["model.safetensors.index.json", str(["model-00001-of-00002.safetensors"])]
+    )
+    assert data["safetensors"] == summary
+    assert data["index_json"] == {"metadata": {"total_size": 42}}
+    assert data["readme_text"] == "readme"
+
+
+def test_dataset_meta_is_fetched_once_per_id(monkeypatch):
+    import core.hf_api as h
+    card = {"license": "mit", "pretty_name": "S", "language": ["en"],
+            "dataset_info": {"features": [{"name": "q"}],
+                             "splits": [{"name": "train", "num_examples": 7},
+                                        {"name": "validation", "num_examples": 3}]}}
+    calls = []
+
+    def dataset_info(repo_id):
+        calls.append(repo_id)
+        return SimpleNamespace(id=repo_id, cardData=card, tags=[], license=None,
+                               siblings=[SimpleNamespace(rfilename="README.md")])
+
+    monkeypatch.setattr(h, "_api", SimpleNamespace(dataset_info=dataset_info))
+    monkeypatch.setattr(h, "DATASET_CACHE", h.MetadataCache("test"))
+    facts = [h.fetch_hf_dataset_meta("o/squad") for _ in range(3)]
+    assert calls == ["o/squad"] and facts[0] is facts[2]
+    assert facts[0]["splits"] == {"train": 7, "validation": 3} and facts[0]["num_rows"] == 10
+    assert facts[0]["license"] == "mit" and facts[0]["card_fields"] == ["pretty_name", "language"]
+
+
+def test_model_revision_is_a_light_lookup(monkeypatch):
+    import core.hf_api as h
+    seen = {}
+
+    def model_info(repo_id, **kw):
+        seen.update(kw, repo_id=repo_id)
+        return SimpleNamespace(sha="abc123", lastModified="2024-01-01")
+
+    monkeypatch.setattr(h, "_api", SimpleNamespace(model_info=model_info))
+    assert h.fetch_hf_model_revision(SimpleNamespace(owner="a", name="b")) == "abc123"
+    assert seen == {"repo_id": "a/b", "expand": ["sha", "lastModified"]}
+
+
+def test_dataset_revision_is_uncached(monkeypatch):
+    import core.hf_api as h
+    shas = iter(["s1", "s2"])
+    seen = []
+
+    def dataset_info(dataset_id, **kw):
+        seen.append((dataset_id, kw))
+        return SimpleNamespace(sha=next(shas))
+
+    monkeypatch.setattr(h, "_api", SimpleNamespace(dataset_info=dataset_info))
+    assert [h.fetch_hf_dataset_revision("o/d") for _ in range(2)] == ["s1", "s2"]
+    assert seen[0] == ("o/d", {"expand": ["sha", "lastModified"]})
+
+
+def test_prefetch_lists_each_author_once_and_falls_back_for_gaps(monkeypatch):
+    import core.hf_api as h
+
+    totals = SimpleNamespace(parameters={"F16": 4}, total=4)
+
+    def info(repo_id, *files, st=None):
+        siblings = [SimpleNamespace(rfilename=f) for f in ("README.md",) + files]
+        return SimpleNamespace(id=repo_id, sha="s-" + repo_id, siblings=siblings, cardData=None,
+                               tags=[], lastModified="2024-01-01", downloads=1, likes=2,
+                               safetensors=st)
+
+    listing = [
+        info("org/a", "model.safetensors", st=totals),
+        info("org/b", "pytorch_model.bin"),  # no sizes in a listing: needs model_info
+        info("org/c", "model.safetensors"),  # no hub totals either
+        info("org/unrequested"),
+    ]
+    calls = {"list": [], "info": [], "net": []}
+
+    def list_models(author, expand, limit):
+        calls["list"].append((author, limit))
+        assert "safetensors" in expand
+        return iter(listing)
+
+    def model_info(repo_id, files_metadata):
+        calls["info"].append(repo_id)
+        return info(repo_id, "pytorch_model.bin")
+
+    monkeypatch.setattr(h, "LISTED_MODELS", h.SingleFlight())
+    monkeypatch.setattr(h, "_api", SimpleNamespace(list_models=list_models, model_info=model_info))
+    monkeypatch.setattr(h, "_readme_text", lambda repo_id: "readme")
+    # Every other network read a model could need; a listed model must use none of them.
+    monkeypatch.setattr(h, "_index_json", lambda *a: calls["net"].append(("index",) + a))
+    monkeypatch.setattr(h.safetensors, "read_header", lambda url: calls["net"].append(url))
+
+    assert h.prefetch_hf_models(["org/a", "org/B", "org/c", "solo/d"], min_models=2) == 3
+    assert calls["list"] == [("org", 3 * h.LIST_ROWS_PER_MODEL)] and len(h.LISTED_MODELS) == 3
+    assert h.LISTED_MODELS.peek("org/b").id == "org/b"
+
+    meta, _ = fetch_hf_model_meta(SimpleNamespace(owner="org", name="a"))
+    assert meta["repo_id"] == "org/a" and meta["safetensors"]["data_bytes"] == 8
+    assert calls["info"] == [] and calls["net"] == []
+    fetch_hf_model_meta(SimpleNamespace(owner="org", name="b"))
+    fetch_hf_model_meta(SimpleNamespace(owner="org", name="c"))
+    assert calls["info"] == ["org/b", "org/c"] and calls["net"] == []
+    assert h.fetch_hf_model_revision(SimpleNamespace(owner="org", name="a")) == "s-org/a"
+
+
+def test_prefetch_skips_authors_with_few_requested_models(monkeypatch):
+    import core.hf_api as h
+
+    monkeypatch.setattr(h, "_api", SimpleNamespace(list_models=lambda **k: pytest.fail("listed")))
+    assert h.prefetch_hf_models(["org/a", "org/b"]) == 0
+
+
+def test_safetensors_headers_are_opt_in_when_sizes_are_known(monkeypatch):
+    import core.hf_api as h
+    from core.options import use_options
+
+    sized = [SimpleNamespace(rfilename="model.safetensors", size=10)]
+    info = SimpleNamespace(id="a/b", siblings=sized, cardData=None, tags=[])
+    calls = []
+    monkeypatch.setattr(h, "_api", SimpleNamespace(model_info=lambda *a, **k: info))
+    monkeypatch.setattr(h, "_readme_text", lambda repo_id: "")
+    monkeypatch.setattr(h.safetensors, "fetch_summary", lambda repo_id, names: calls.append(names))
+    p = SimpleNamespace(owner="a", name="b")
+    fetch_hf_model_meta(p)
+    assert calls == []
+    with use_options(param_counts=True):
+        fetch_hf_model_meta(p)
+    assert calls == [["model.safetensors"]]
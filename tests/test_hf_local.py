@@ -0,0 +1,54 @@
+import json
+import os
+import struct
+
+import pytest
+
+from core import hf_local
+from core.hf_api import fetch_hf_dataset_meta, fetch_hf_model_meta, fetch_hf_model_revision
+from core.options import use_options
+from core.url import parse_url
+
+
+def _safetensors(path, tensors):
+    header = json.dumps(tensors).encode("utf-8")
+    data = sum(2 * n for n in (t["shape"][0] * t["shape"][1] for t in tensors.values()))
+    with open(path, "wb") as f:
+        f.write(struct.pack("<Q", len(header)) + header + b"\0" * data)
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    # Hub cache layout: refs/main names the snapshot, whose files link into blobs/.
+    repo = tmp_path / "models--org--tiny"
+    snap = repo / "snapshots" / "abc123"
+    (repo / "blobs").mkdir(parents=True)
+    snap.mkdir(parents=True)
+    (repo / "refs").mkdir()
+    (repo / "refs" / "main").write_text("abc123")
+    (repo / "blobs" / "readme").write_text("---\nlicense: mit\n---\n# Tiny\nUsage: ...\n")
+    os.symlink(repo / "blobs" / "readme", snap / "README.md")
+    _safetensors(snap / "model.safetensors", {"w": {"dtype": "F16", "shape": [4, 8]}})
+    # Plain mirror layout for a dataset.
+    ds = tmp_path / "datasets" / "org" / "data"
+    ds.mkdir(parents=True)
+    (ds / "README.md").write_text("---\npretty_name: Data\nlicense: cc-by-4.0\n---\n")
+    return tmp_path
+
+
+def test_model_meta_is_read_from_the_cache_layout(mirror, monkeypatch):
+    monkeypatch.setattr(hf_local, "MMAP_MIN_BYTES", 1)  # exercise the mmap path
+    p = parse_url("https://huggingface.co/org/tiny")
+    with use_options(hf_local=str(mirror)):
+        meta, _ = fetch_hf_model_meta(p)
+        assert fetch_hf_model_revision(p) == "abc123"
+        facts = fetch_hf_dataset_meta("org/data")
+        assert fetch_hf_dataset_meta("org/missing") is None
+        with pytest.raises(FileNotFoundError):
+            fetch_hf_model_meta(parse_url("https://huggingface.co/org/missing"))
+    assert meta["hf_license"] == "mit" and meta["readme_text"].startswith("---")
+    assert sorted(meta["files"]) == ["README.md", "model.safetensors"]
+    assert meta["file_index"].ext_bytes((".safetensors",))[0] > 64
+    assert meta["safetensors"]["params"] == 32 and meta["safetensors"]["data_bytes"] == 64
+    assert facts["has_card"] and facts["license"] == "cc-by-4.0"
+    assert facts["card_fields"] == ["pretty_name"]
@@ -0,0 +1,69 @@
+import core.compute as C
+import core.incremental as inc
+from core.options import use_options
+
+
+def test_only_changed_models_are_rescored(monkeypatch, tmp_path):
+    revs = {"m1": "a", "m2": "b", "m3": "c"}
+    heads = {"https://github.com/o/r": "h1"}
+    monkeypatch.setattr(inc, "fetch_hf_model_revision", lambda p: revs[p.name])
+    monkeypatch.setattr(inc, "head_sha", lambda url: heads[url])
+    monkeypatch.setattr(C, "prefetch_hf_models", lambda ids: 0)
+    computed = []
+
+    def fake_compute_one(u, ds, code):
+        computed.append(u)
+        return {"name": u.rsplit("/", 1)[1], "net_score": len(computed)}
+
+    monkeypatch.setattr(C, "compute_one", fake_compute_one)
+    lines = ["https://huggingface.co/o/m1", "https://github.com/o/r",
+             "https://huggingface.co/o/m2", "https://huggingface.co/o/m3"]
+    path = str(tmp_path / "state.json")
+
+    def run(urls):
+        state = inc.IncrementalState(path)
+        with use_options(incremental=state):
+            rows = list(C.collate(urls))
+        state.save()
+        return rows, state
+
+    first, _ = run(lines)
+    assert len(computed) == 3
+    revs["m1"], heads["https://github.com/o/r"] = "a2", "h2"
+    computed.clear()
+    rows, state = run(lines)
+    assert sorted(computed) == ["https://huggingface.co/o/m1", "https://huggingface.co/o/m2"]
+    assert rows[2] == first[2] and (state.reused, state.rescored) == (1, 2)
+
+    # Models dropped from the input leave the state; unknown revisions always rescore.
+    revs["m3"] = None
+    computed.clear()
+    run(lines[:1] + lines[3:])
+    assert computed == ["https://huggingface.co/o/m3"]
+    assert list(inc.IncrementalState(path)._old) == ["https://huggingface.co/o/m1"]
+
+
+def test_dataset_revisions_count_and_lookups_are_shared(monkeypatch, tmp_path):
+    shas = {"o/d": "s1"}
+    calls = []
+    monkeypatch.setattr(inc, "fetch_hf_model_revision", lambda p: "rev")
+    monkeypatch.setattr(inc, "fetch_hf_dataset_revision", lambda d: shas[d])
+    monkeypatch.setattr(inc, "head_sha", lambda url: calls.append(url) or "h")
+    monkeypatch.setattr(C, "prefetch_hf_models", lambda ids: calls.extend(ids) or 0)
+    monkeypatch.setattr(C, "compute_one", lambda u, ds, code: {"name": u})
+    shared = ["https://huggingface.co/datasets/o/d", "https://github.com/o/r"]
+    lines = shared + ["https://huggingface.co/o/m1"] + shared + ["https://huggingface.co/o/m2"]
+    path = str(tmp_path / "state.json")
+
+    def run():
+        state = inc.IncrementalState(path)
+        with use_options(incremental=state):
+            list(C.collate(lines))
+        state.save()
+        return state
+
+    # Both model revisions come from one bulk prefetch; the shared repo is checked once.
+    run()
+    assert calls == ["o/m1", "o/m2", "https://github.com/o/r"]
+    shas["o/d"] = "s2"
+    assert run().rescored == 2 and run().reused == 2
@@ -0,0 +1,77 @@
+import gzip
+import io
+import sys
+
+import pytest
+
+from core import cli
+from core.inputs import expand_sources, iter_lines
+
+
+def test_plain_gzip_and_glob_inputs_concatenate_in_order(tmp_path):
+    (tmp_path / "a.txt").write_text("https://a\n\n  https://b  \n", encoding="utf-8")
+    with gzip.open(tmp_path / "b.txt.gz", "wt", encoding="utf-8") as f:
+        f.write("https://c\n")
+    # Compression is sniffed from content, not the extension.
+    with gzip.open(tmp_path / "c.txt", "wt", encoding="utf-8") as f:
+        f.write("https://d\n")
+
+    assert list(iter_lines([str(tmp_path / "*.txt*")])) == [
+        "https://a", "https://b", "https://c", "https://d",
+    ]
+    assert list(iter_lines([str(tmp_path / "c.txt"), str(tmp_path / "a.txt")])) == [
+        "https://d", "https://a", "https://b",
+    ]
+
+
+def test_missing_inputs_raise(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        expand_sources([str(tmp_path / "*.none")])
+    with pytest.raises(FileNotFoundError):
+        list(iter_lines([str(tmp_path / "absent.txt")]))
+
+
+def test_stdin_input_including_gzip(monkeypatch):
+    data = gzip.compress(b"https://s1\nhttps://s2\n")
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(data)))
+    assert list(iter_lines(["-"])) == ["https://s1", "https://s2"]
+
+
+def test_zstd_input(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    path = tmp_path / "urls.zst"
+    path.write_bytes(zstandard.ZstdCompressor().compress(b"https://z\n"))
+    assert list(iter_lines([str(path)])) == ["https://z"]
+
+
+def test_cli_reads_several_inputs(monkeypatch, tmp_path):
+    (tmp_path / "1.txt").write_text("https://one\n", encoding="utf-8")
+    (tmp_path / "2.txt").write_text("https://two\n", encoding="utf-8")
+    seen = []
+
+    def fake_collate(it):
+        seen.extend(it)
+        return iter(())
+
+    monkeypatch.setattr(cli, "collate", fake_collate)
+    assert cli.main(["prog", str(tmp_path / "1.txt"), str(tmp_path / "2.txt")]) == 0
+    assert seen == ["https://one", "https://two"]
+    # The default journal path is only defined for a single input file.
+    assert cli.main(["prog", "--resume", "-"]) == 1
+
+
+def test_compressed_inputs_close_their_files(monkeypatch, tmp_path):
+    import core.inputs as inputs
+
+    opened = []
+
+    def tracking_open(*a, **k):
+        opened.append(open(*a, **k))
+        return opened[-1]
+
+    monkeypatch.setattr(inputs, "open", tracking_open, raising=False)
+    for i in range(3):
+        with gzip.open(tmp_path / f"{i}.gz", "wt", encoding="utf-8") as f:
+            f.write(f"https://{i}\n")
+    assert len(list(iter_lines([str(tmp_path / "*.gz")]))) == 3
+    assert len(opened) == 3 and all(f.closed for f in opened)
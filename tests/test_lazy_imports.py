@@ -0,0 +1,40 @@
+import json
+import os
+import subprocess
+import sys
+
+from conftest import SRC
+
+HEAVY = ("git", "github", "huggingface_hub", "requests", "providers.purdue_genai")
+
+# Generous ceiling for our own modules; the real guard is that heavy deps stay unloaded.
+IMPORT_BUDGET_US = 500_000
+
+
+def _import_in_fresh_interpreter(stmt):
+    code = f"import sys, json; {stmt}; print(json.dumps(sorted(sys.modules)))"
+    env = dict(os.environ, PYTHONPATH=SRC)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    loaded = set(json.loads(proc.stdout.strip().splitlines()[-1]))
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cum, name = (x.strip() for x in line[len("import time:"):].split("|"))
+            if cum.isdigit():
+                cumulative[name] = int(cum)
+    return loaded, cumulative
+
+
+def test_cli_import_does_not_load_heavy_dependencies():
+    loaded, cumulative = _import_in_fresh_interpreter("import core.cli, core.server")
+    assert not [m for m in HEAVY if m in loaded]
+    assert cumulative["core.cli"] < IMPORT_BUDGET_US
+
+
+def test_metric_registry_defers_llm_provider():
+    loaded, _ = _import_in_fresh_interpreter("import metrics; metrics.metric_registry()")
+    assert "providers.purdue_genai" not in loaded
+    assert "requests" not in loaded
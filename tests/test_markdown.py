@@ -0,0 +1,62 @@
+import random
+import re
+import time
+
+from metrics.markdown import ModelCard
+
+# The regexes the tokenizer replaced; used as a reference on small inputs.
+OLD_FENCE = re.compile(r"```[a-zA-Z0-9_-]*\s+[\s\S]+?```", re.I)
+OLD_PY_FENCE = re.compile(r"```(?:python|py)\s+[\s\S]+?```", re.I)
+OLD_TABLE = re.compile(r"^\s*\|.*\|\s*$", re.M)
+OLD_LICENSE = re.compile(
+    r"^\s{0,3}#{1,3}\s*license\b.*?$([\s\S]*?)(^\s{0,3}#{1,3}\s|\Z)", re.I | re.M
+)
+
+LINES = ["## License", "#License", "# Results", "#### deep", "   ### Other", "#", "text MIT",
+         "| a | b |", "|x", "  |y|  ", "```python", "```", "``` py", "", "   ", "\t"]
+
+
+def test_fence_and_table_match_old_regexes_on_random_input():
+    rng = random.Random(0)
+    alphabet = ["`", "```", " ", "\n", "py", "Python", "x", "|", "\t", "-"]
+    for _ in range(3000):
+        s = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 25)))
+        doc = ModelCard(s)
+        assert doc.has_fenced_code() == bool(OLD_FENCE.search(s)), repr(s)
+        assert doc.has_fenced_code(("python", "py")) == bool(OLD_PY_FENCE.search(s)), repr(s)
+        assert doc.has_table_row() == bool(OLD_TABLE.search(s)), repr(s)
+
+
+def test_license_section_matches_old_regex_on_random_cards():
+    rng = random.Random(1)
+    head = re.compile(r"license\b", re.I)
+    for _ in range(2000):
+        s = "\n".join(rng.choice(LINES) for _ in range(rng.randint(0, 12)))
+        m = OLD_LICENSE.search(s)
+        got = ModelCard(s).section(head)
+        assert (got is None) == (m is None), repr(s)
+        if m:
+            assert got is not None and got.rstrip() == m.group(1).rstrip(), repr(s)
+
+
+def test_adversarial_cards_scan_in_linear_time():
+    cards = ["\n" * 200_000, "```python\n" * 20_000, ("# License\n" + " " * 50 + "\n") * 5_000,
+             "``` " + " " * 200_000, "|" + " " * 200_000 + "\n"]
+    t0 = time.perf_counter()
+    for text in cards:
+        doc = ModelCard(text)
+        doc.has_fenced_code()
+        doc.has_fenced_code(("python", "py"))
+        doc.has_table_row()
+        doc.section(re.compile("license", re.I))
+    assert time.perf_counter() - t0 < 1.0
+
+
+def test_step_budget_marks_document_as_truncated():
+    text = "# a\n" * 200 + "```py\nx\n```\n"
+    doc = ModelCard(text, max_steps=100)
+    assert len(doc.headings()) == 100 and doc.truncated
+    assert doc.has_fenced_code() is False
+    # The budget counts steps, not time, so the outcome never depends on load.
+    doc = ModelCard(text)
+    assert len(doc.headings()) == 200 and doc.has_fenced_code() and not doc.truncated
@@ -51,3 +51,24 @@ def test_bus_factor_happy_path(monkeypatch, tmp_path):
     assert r.extras["contributors"] == 2
     assert r.extras["commits"] == 4
     assert 0.0 < r.extras["gini"] < 1.0
+
+
+def test_bus_factor_reads_pre_cloned_repo(monkeypatch, tmp_path):
+    from core.options import use_options
+
+    (tmp_path / "b").mkdir()
+    monkeypatch.setattr(bf, "_safe_clone", lambda url: None)
+    seen = []
+
+    class FakeRepo:
+        def __init__(self, root):
+            seen.append(root)
+
+        def iter_commits(self, since=None):
+            return [SimpleNamespace(author=SimpleNamespace(name="Alice"))]
+
+    monkeypatch.setitem(sys.modules, "git", SimpleNamespace(Repo=FakeRepo))
+    with use_options(repos_dir=str(tmp_path)):
+        r = BusFactorMetric().compute({"code": ["https://github.com/a/b"]})
+    assert seen == [str(tmp_path / "b")] and r.extras["contributors"] == 1
+    assert (tmp_path / "b").is_dir()
@@ -41,3 +41,22 @@ def test_code_quality_repo_signals(monkeypatch, tmp_path):
     assert abs(r.score - 0.90) < 1e-6
     ch = r.extras["checks"]
     assert ch["tests"] and ch["ci"] and ch["types"] and ch["lint"] and ch["pyproject_deps"]
+
+def test_code_quality_scans_local_checkouts_in_place(monkeypatch, tmp_path):
+    from core.options import use_options
+
+    repo = tmp_path / "owner" / "repo"
+    (repo / "tests").mkdir(parents=True)
+    (repo / "tox.ini").write_text("[tox]\n")
+
+    def no_clone(url, max_seconds=5):
+        raise AssertionError("a local checkout must not be cloned")
+
+    monkeypatch.setattr(cq, "_safe_clone", no_clone)
+    m = CodeQualityMetric()
+    r = m.compute({"code": [repo.as_uri()], "readme_text": ""})
+    assert r.extras["local_checkout"] and r.extras["checks"]["tests"]
+    with use_options(repos_dir=str(tmp_path)):
+        r2 = m.compute({"code": ["https://github.com/owner/repo"], "readme_text": ""})
+    assert r2.score == r.score > 0.0
+    assert (repo / "tox.ini").exists()  # scanned in place, not deleted
@@ -23,3 +23,15 @@ def test_valid_dataset_good_detail():
     r = m.compute({"datasets": ["https://huggingface.co/datasets/a/b"],
                    "readme_text": "size and features and splits are documented"})
     assert r.score == 0.95
+
+def test_dataset_facts_lift_score():
+    url = "https://huggingface.co/datasets/a/b"
+    facts = {"has_card": True, "num_rows": 11000, "splits": {"train": 10000, "test": 1000},
+             "num_features": 2, "license": "mit", "card_fields": ["pretty_name", "language"]}
+    r = DatasetQualityMetric().compute({"datasets": [url], "readme_text": "",
+                                        "dataset_meta": {"a/b": facts}})
+    assert r.score == 0.95
+    assert r.extras["dataset_quality_detail"]["tier"] == "dataset_facts"
+    bare = DatasetQualityMetric().compute({"datasets": [url], "readme_text": "size",
+                                           "dataset_meta": {"a/b": {"splits": {"train": 5}}}})
+    assert bare.score == 0.75
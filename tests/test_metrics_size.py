@@ -1,7 +1,5 @@
 # tests/test_metrics_size.py
-import json
 from metrics.size import SizeMetric, _logistic
-import huggingface_hub as hfh  # <-- patch the real import site used inside the function
 
 
 def test_size_from_files_meta_sum():
@@ -13,19 +11,14 @@ def test_size_from_files_meta_sum():
     assert 0 <= r.score <= 1
 
 
-def test_size_from_index_json(monkeypatch, tmp_path):
-    idx = {"metadata": {"total_size": 12345}}
-    p = tmp_path / "model.safetensors.index.json"
-    p.write_text(json.dumps(idx))
-
-    # Patch the function exactly where metrics.size imports it (inside the function)
-    def fake_hf_hub_download(*args, **kwargs):
-        return str(p)
-
-    monkeypatch.setattr(hfh, "hf_hub_download", fake_hf_hub_download)
-
+def test_size_from_index_json():
+    # The index file is prefetched with the model metadata; the metric never downloads.
     r = SizeMetric().compute(
-        {"files_meta": [], "files": ["model.safetensors.index.json"], "repo_id": "x/y"}
+        {
+            "files_meta": [],
+            "files": ["model.safetensors.index.json"],
+            "index_json": {"metadata": {"total_size": 12345}},
+        }
     )
     assert r.extras["method"] == "index_json"
     assert r.extras["total_bytes"] == 12345
@@ -0,0 +1,66 @@
+import threading
+import time
+
+import core.compute as C
+from core.options import use_options
+from core.parallel import iter_parallel
+
+
+def _sleepy(i, delay):
+    def f():
+        time.sleep(delay)
+        return i
+    return f
+
+
+def test_iter_parallel_preserves_input_order():
+    funcs = [_sleepy(i, 0.02 * (5 - i)) for i in range(6)]
+    assert list(iter_parallel(funcs, max_workers=6)) == list(range(6))
+
+
+def test_iter_parallel_unordered_yields_all():
+    funcs = [_sleepy(i, 0.02 * (5 - i)) for i in range(6)]
+    out = list(iter_parallel(funcs, max_workers=6, ordered=False))
+    assert sorted(out) == list(range(6))
+    assert out[0] != 0  # the slowest task does not hold the others back
+
+
+def test_iter_parallel_window_bounds_outstanding_work():
+    gate = threading.Event()
+    started = []
+
+    def make(i):
+        def f():
+            started.append(i)
+            if i == 0:
+                gate.wait(2)
+            return i
+        return f
+
+    stuck = []
+
+    def release():
+        stuck.append(len(started))
+        gate.set()
+
+    gen = iter_parallel((make(i) for i in range(10)), max_workers=4, window=3)
+    t = threading.Timer(0.1, release)
+    t.start()
+    assert next(gen) == 0
+    # While task 0 was stuck, exactly `window` tasks had been submitted,
+    # although a fourth worker was idle.
+    assert stuck == [3]
+    assert list(gen) == list(range(1, 10))
+    t.join()
+
+
+def test_collate_runs_models_concurrently_in_order(monkeypatch):
+    def fake_compute_one(u, ds, code):
+        time.sleep(0.05 if u.endswith("m0") else 0.0)
+        return {"name": u}
+
+    monkeypatch.setattr(C, "compute_one", fake_compute_one)
+    seq = [f"https://huggingface.co/o/m{i}" for i in range(4)]
+    with use_options(max_workers=4):
+        rows = list(C.collate(seq))
+    assert [r["name"] for r in rows] == seq
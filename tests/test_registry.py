@@ -0,0 +1,108 @@
+import pytest
+
+import core.compute as C
+import metrics
+from core.options import use_options
+from metrics.base import MetricResult
+
+
+class FakeMetric:
+    def __init__(self, name, cost, score):
+        self.name, self.cost, self.score = name, cost, score
+
+    def compute(self, ctx):
+        return MetricResult(score=self.score, latency_ms=1, extras={})
+
+
+def test_select_metrics_by_name_and_profile(monkeypatch):
+    monkeypatch.setenv("GEN_AI_STUDIO_API_KEY", "x")
+    reg = metrics.metric_registry()
+    assert [m.name for m in metrics.select_metrics(reg, None)] == [m.name for m in reg]
+    fast = {m.name for m in metrics.select_metrics(reg, "fast")}
+    assert "license" in fast and "dataset_quality" in fast
+    assert not fast & {"code_quality", "bus_factor", "ramp_up_time"}
+    picked = metrics.select_metrics(reg, "size_score, license")
+    assert [m.name for m in picked] == ["license", "size_score"]
+    with pytest.raises(ValueError, match="nope"):
+        metrics.select_metrics(reg, "license,nope")
+
+
+def test_ramp_up_time_is_pure_without_an_llm_key(monkeypatch):
+    monkeypatch.delenv("GEN_AI_STUDIO_API_KEY", raising=False)
+    reg = metrics.metric_registry()
+    assert "ramp_up_time" in {m.name for m in metrics.select_metrics(reg, "offline")}
+    monkeypatch.setenv("GEN_AI_STUDIO_API_KEY", "x")
+    assert "ramp_up_time" not in {m.name for m in metrics.select_metrics(reg, "fast")}
+
+
+def test_plugins_extend_and_replace_builtins(monkeypatch):
+    extra = FakeMetric("carbon", "pure", 1.0)
+    lic = FakeMetric("license", "pure", 0.3)
+    monkeypatch.setattr(metrics, "_plugin_metrics", lambda: (extra, lic))
+    reg = metrics.metric_registry()
+    assert reg[-1] is extra and lic in reg and len(reg) == 9
+
+
+def test_subset_row_and_renormalized_net(monkeypatch):
+    monkeypatch.setattr(C, "fetch_hf_model_meta", lambda p: ({"last_modified": ""}, 5))
+    monkeypatch.setattr(C, "analyze_github_urls", lambda *a, **k: pytest.fail("cloned"))
+    reg = [FakeMetric("license", "pure", 1.0), FakeMetric("size_score", "pure", 0.5),
+           FakeMetric("bus_factor", "clone", 0.0)]
+    monkeypatch.setattr(C, "metric_registry", lambda: reg)
+    with use_options(metrics="license,size_score"):
+        row = C.compute_one("https://huggingface.co/o/m", [], ["https://github.com/o/r"])
+    assert list(row) == ["name", "category", "net_score", "net_score_latency", "license",
+                         "license_latency", "size_score", "size_score_latency"]
+    w = C.NET_WEIGHTS
+    expected = (w["license"] * 1.0 + w["size_score"] * 0.5) / (w["license"] + w["size_score"])
+    assert row["net_score"] == pytest.approx(expected)
+    assert row["size_score_latency"] == 6
+
+
+def test_threshold_skips_expensive_metrics_once_decided(monkeypatch):
+    monkeypatch.setattr(C, "fetch_hf_model_meta", lambda p: ({"last_modified": ""}, 0))
+    clones = []
+    monkeypatch.setattr(C, "analyze_github_urls", lambda *a, **k: clones.append(1) or {})
+    computed = []
+
+    class Tracked(FakeMetric):
+        def compute(self, ctx):
+            computed.append(self.name)
+            return super().compute(ctx)
+
+    def registry(license_score):
+        return [Tracked("license", "pure", license_score), Tracked("size_score", "pure", 1.0),
+                Tracked("bus_factor", "clone", 1.0), Tracked("ramp_up_time", "llm", 1.0)]
+
+    # license + size alone (0.35) cannot reach 0.9 even with clone+LLM at 1.0 -> decided.
+    monkeypatch.setattr(C, "metric_registry", lambda: registry(0.0))
+    with use_options(metrics="all", threshold=0.9):
+        row = C.compute_one("https://huggingface.co/o/m", [], ["https://github.com/o/r"])
+    assert sorted(computed) == ["license", "size_score"]
+    assert row["skipped"] == ["bus_factor", "ramp_up_time"] and row["bus_factor"] is None
+    assert not clones
+
+    # Undecided after the cheap stage: clone runs; LLM still matters for 0.9 -> runs too.
+    computed.clear()
+    monkeypatch.setattr(C, "metric_registry", lambda: registry(1.0))
+    with use_options(metrics="all", threshold=0.9):
+        row = C.compute_one("https://huggingface.co/o/m", [], ["https://github.com/o/r"])
+    assert sorted(computed) == ["bus_factor", "license", "ramp_up_time", "size_score"]
+    assert "skipped" not in row and clones == [1]
+    assert row["net_score"] == pytest.approx(1.0)
+
+
+def test_threshold_bounds_include_github_scores_before_llm_stage(monkeypatch):
+    monkeypatch.setattr(C, "fetch_hf_model_meta", lambda p: ({"last_modified": ""}, 0))
+    monkeypatch.setattr(C, "analyze_github_urls", lambda *a, **k: {"code_quality": 1.0})
+    monkeypatch.setattr(C, "metric_registry", lambda: [
+        FakeMetric("license", "pure", 1.0), FakeMetric("performance_claims", "pure", 0.0),
+        FakeMetric("code_quality", "clone", 0.0), FakeMetric("bus_factor", "clone", 0.0),
+        FakeMetric("ramp_up_time", "llm", 1.0),
+    ])
+    # Without the GitHub code_quality the LLM stage could not reach 0.6 and would
+    # be skipped; with it the full score is 0.75, so ramp_up_time must run.
+    with use_options(metrics="all", threshold=0.6):
+        row = C.compute_one("https://huggingface.co/o/m", [], ["https://github.com/o/r"])
+    assert "skipped" not in row and row["ramp_up_time"] == 1.0
+    assert row["net_score"] == pytest.approx(0.75)
@@ -0,0 +1,104 @@
+import json
+import struct
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import core.safetensors as st
+from metrics.size import SizeMetric
+
+
+def _file(tensors):
+    header = json.dumps(tensors).encode()
+    return struct.pack("<Q", len(header)) + header + b"\0" * 4096
+
+
+@pytest.fixture
+def hub():
+    """Local stub of the hub's resolve endpoint that honours Range requests."""
+    files, ranges = {}, []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            data = files.get(self.path)
+            if data is None:
+                self.send_error(404)
+                return
+            rng = self.headers.get("Range")
+            ranges.append(rng)
+            if rng:
+                a, b = (int(x) for x in rng.split("=")[1].split("-"))
+                body = data[a:b + 1]
+                self.send_response(206)
+            else:
+                body = data
+                self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *a):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", files, ranges
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_summary_reads_only_headers(hub, monkeypatch):
+    url, files, ranges = hub
+    monkeypatch.setenv("HF_ENDPOINT", url)
+    files["/a/b/resolve/main/model-1.safetensors"] = _file({
+        "__metadata__": {"format": "pt"},
+        "emb": {"dtype": "BF16", "shape": [1000, 64], "data_offsets": [0, 128000]},
+        "norm": {"dtype": "F32", "shape": [64], "data_offsets": [128000, 128256]},
+    })
+    files["/a/b/resolve/main/model-2.safetensors"] = _file({
+        "head": {"dtype": "BF16", "shape": [64, 1000], "data_offsets": [0, 128000]},
+    })
+    s = st.fetch_summary("a/b", ["model-1.safetensors", "model-2.safetensors"])
+    assert s == {
+        "params": 128064,
+        "dtype_params": {"BF16": 128000, "F32": 64},
+        "data_bytes": 256256,
+        "shards": 2,
+    }
+    assert ranges == [f"bytes=0-{st.HEADER_PROBE_BYTES - 1}"] * 2
+    assert st.fetch_summary("a/b", ["model-1.safetensors", "missing.safetensors"]) is None
+
+
+def test_large_header_takes_a_second_range_request(hub, monkeypatch):
+    url, files, ranges = hub
+    monkeypatch.setattr(st, "HEADER_PROBE_BYTES", 32)
+    tensors = {f"t{i}": {"dtype": "I8", "shape": [2, 3], "data_offsets": [0, 6]} for i in range(20)}
+    files["/x.safetensors"] = _file(tensors)
+    assert st.read_header(url + "/x.safetensors") == tensors
+    assert len(ranges) == 2 and ranges[1].startswith("bytes=32-")
+
+
+def test_size_metric_reports_params_and_precision_estimates():
+    summary = {"params": 7 * 10**9, "dtype_params": {"BF16": 7 * 10**9}}
+    r = SizeMetric().compute({"files": [], "safetensors": summary})
+    assert r.extras["param_count"] == 7 * 10**9
+    assert r.extras["dtype_params"] == {"BF16": 7 * 10**9}
+    gib = r.extras["precision_gib"]
+    assert gib["fp16"] == pytest.approx(2 * gib["int8"]) == pytest.approx(4 * gib["int4"])
+    scores = r.extras["precision_size_score"]
+    assert scores["int4"] > scores["fp16"] > scores["fp32"]
+    assert "param_count" not in SizeMetric().compute({"files": []}).extras
+
+
+@pytest.mark.parametrize("tensor", [
+    {"dtype": "F32", "shape": ["x", 4]},
+    {"dtype": "F32", "shape": 7},
+    {"dtype": "F32", "shape": [-2, 4]},
+    {"dtype": "NOPE", "shape": [4]},
+])
+def test_malformed_headers_give_no_summary(hub, monkeypatch, tensor):
+    url, files, _ = hub
+    monkeypatch.setenv("HF_ENDPOINT", url)
+    files["/a/b/resolve/main/model.safetensors"] = _file({"w": tensor})
+    assert st.fetch_summary("a/b", ["model.safetensors"]) is None
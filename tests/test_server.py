@@ -0,0 +1,63 @@
+import json
+import threading
+import urllib.request
+
+import pytest
+
+import core.compute as C
+from core.server import make_server
+
+
+@pytest.fixture
+def base_url(monkeypatch):
+    def fake_compute_one(u, ds, code):
+        return {"name": u.rsplit("/", 1)[-1], "net_score": 0.123, "license_latency": 1.6,
+                "datasets": ds, "code": code}
+
+    monkeypatch.setattr(C, "compute_one", fake_compute_one)
+    srv = make_server("127.0.0.1", 0)
+    th = threading.Thread(target=srv.serve_forever, daemon=True)
+    th.start()
+    yield "http://%s:%s" % srv.server_address[:2]
+    srv.shutdown()
+    srv.server_close()
+
+
+def _post(url, body):
+    req = urllib.request.Request(url, data=json.dumps(body).encode(), method="POST",
+                                 headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=5) as r:
+            return r.status, json.loads(r.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_score_single_model(base_url):
+    status, body = _post(base_url + "/score", {"url": "https://huggingface.co/o/m", "code": ["c"]})
+    assert status == 200
+    assert body["row"]["name"] == "m"
+    assert body["row"]["net_score"] == 0.12  # same rounding as the CLI output
+    assert body["row"]["license_latency"] == 2
+    assert body["row"]["code"] == ["c"]
+
+
+def test_score_batch_lines(base_url):
+    lines = ["https://huggingface.co/datasets/a/b", "https://huggingface.co/o/m1",
+             "https://huggingface.co/o/m2"]
+    status, body = _post(base_url + "/score", {"lines": lines})
+    assert status == 200
+    assert [r["name"] for r in body["rows"]] == ["m1", "m2"]
+    assert body["rows"][0]["datasets"] == [lines[0]]
+
+
+def test_bad_requests(base_url):
+    assert _post(base_url + "/score", {"nope": 1})[0] == 400
+    for body in ({"lines": "https://huggingface.co/o/m"}, {"lines": [1]},
+                 {"url": "https://huggingface.co/o/m", "datasets": "o/d"},
+                 {"url": "https://huggingface.co/o/m", "code": [["c"]]}):
+        status, err = _post(base_url + "/score", body)
+        assert status == 400 and "list of strings" in err["error"]
+    assert _post(base_url + "/other", {})[0] == 404
+    with urllib.request.urlopen(base_url + "/healthz", timeout=5) as r:
+        assert json.loads(r.read()) == {"status": "ok"}
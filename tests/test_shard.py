@@ -0,0 +1,57 @@
+import io
+
+import pytest
+
+import core.cli as cli_mod
+import core.compute as C
+from core.shard import merge_shards, parse_shard, shard_lines
+
+SEQ = [
+    "https://huggingface.co/datasets/a/b",
+    "https://github.com/o/r",
+    "https://huggingface.co/o/m0",
+    "https://huggingface.co/o/m1",
+    "https://huggingface.co/datasets/c/d",
+    "https://huggingface.co/o/m2",
+    "https://github.com/o/trailing",
+]
+
+
+def test_parse_shard():
+    assert parse_shard("1/3") == (1, 3)
+    for bad in ("3/3", "x/2", "1", "0/0"):
+        with pytest.raises(ValueError):
+            parse_shard(bad)
+
+
+def test_shard_lines_keeps_groups_together():
+    assert list(shard_lines(SEQ, 0, 2)) == SEQ[0:3] + SEQ[4:6]
+    assert list(shard_lines(SEQ, 1, 2)) == [SEQ[3]]
+
+
+def test_shards_merge_back_in_input_order(monkeypatch):
+    monkeypatch.setattr(C, "compute_one", lambda u, ds, code: {"name": u, "ds": ds, "code": code})
+    whole = list(C.collate(SEQ))
+    outs = [[f"{r['name']}\n" for r in C.collate(shard_lines(SEQ, i, 2))] for i in range(2)]
+    # groups are scored with the same attachments as in an unsharded run
+    sharded = [r for i in range(2) for r in C.collate(shard_lines(SEQ, i, 2))]
+    assert sharded == [whole[0], whole[2], whole[1]]
+    buf = io.StringIO()
+    assert merge_shards(outs, buf) == 3
+    assert buf.getvalue().split() == [r["name"] for r in whole]
+
+
+def test_merge_rejects_inconsistent_shards(tmp_path, capsys):
+    a = tmp_path / "a.ndjson"
+    b = tmp_path / "b.ndjson"
+    a.write_text("1\n")
+    b.write_text("2\n3\n")
+    assert cli_mod.main(["prog", "merge", str(a), str(b)]) == 1
+    assert "shard 1" in capsys.readouterr().err
+
+
+def test_unordered_shards_are_refused(tmp_path, capsys):
+    urls = tmp_path / "urls.txt"
+    urls.write_text("\n".join(SEQ), encoding="utf-8")
+    assert cli_mod.main(["prog", "--shard", "0/2", "--unordered", str(urls)]) == 1
+    assert "--unordered" in capsys.readouterr().err
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from metrics import size as size_mod
+from metrics.file_index import FileIndex
+from metrics.size import SizeMetric, load_device_profiles
+from metrics.size_batch import batch_arrays, score_batch
+
+MODELS = [
+    FileIndex(["model.safetensors", "README.md", "a.b/c"], [3 * 1024**3, 10, 5]),
+    FileIndex(["x/pytorch_model.bin", "x/y.onnx", "bad.bin"], [1000, 2000, 0]),
+    FileIndex(["config.json"], [10]),
+]
+
+
+def _check_against_metric(batch):
+    for i, idx in enumerate(MODELS):
+        r = SizeMetric().compute({"file_index": idx})
+        total = r.extras["total_bytes"] if r.extras["method"] == "files_meta" else 0
+        assert batch.total_bytes[i] == total
+        assert batch.overall[i] == pytest.approx(r.score)
+        for dev, v in r.extras["size_score"].items():
+            assert batch.scores[dev][i] == pytest.approx(v)
+        for ext, n in r.extras["per_ext_bytes"].items():
+            assert batch.per_ext_bytes[ext][i] == n
+
+
+def test_python_batch_matches_size_metric():
+    batch = score_batch(*batch_arrays(MODELS), use_numpy=False)
+    _check_against_metric(batch)
+    assert sorted(batch.per_ext_bytes) == ["bin", "onnx", "safetensors"]
+
+
+def test_numpy_batch_matches_python():
+    pytest.importorskip("numpy")
+    _check_against_metric(score_batch(*batch_arrays(MODELS), use_numpy=True))
+
+
+def test_device_profiles_from_file(monkeypatch, tmp_path):
+    p = tmp_path / "profiles.json"
+    p.write_text(json.dumps({"phone": 6, "a100": 80}))
+    monkeypatch.setenv("SIZE_PROFILES_FILE", str(p))
+    monkeypatch.setattr(size_mod, "_profiles_cache", {})
+    assert set(SizeMetric().compute({"files": []}).extras["size_score"]) == {"phone", "a100"}
+    assert set(score_batch([1], ["bin"], [0], 1, use_numpy=False).scores) == {"phone", "a100"}
+    p.write_text("[1, 2]")
+    monkeypatch.setattr(size_mod, "_profiles_cache", {})
+    with pytest.raises(ValueError):
+        load_device_profiles()
@@ -0,0 +1,95 @@
+import json
+from types import SimpleNamespace
+
+import core.cli as cli_mod
+import core.compute as C
+from core import tracing
+from core.tracing import Tracer, span, start_tracing, stop_tracing
+from metrics.base import MetricResult
+
+
+def test_span_is_noop_without_tracer():
+    stop_tracing()
+    with span("x"):
+        pass
+    assert tracing._tracer is None
+
+
+def test_summary_percentiles_and_histogram():
+    t = Tracer()
+    for ms in range(1, 101):
+        t.record("fetch", float(ms))
+    st = t.summary()["stages"]["fetch"]
+    assert st["count"] == 100
+    assert (st["p50_ms"], st["p95_ms"], st["p99_ms"], st["max_ms"]) == (50.0, 95.0, 99.0, 100.0)
+    assert st["histogram"]["le_1"] == 1 and st["histogram"]["le_100"] == 50
+    assert sum(st["histogram"].values()) == 100
+
+
+class _Metric:
+    def __init__(self, name):
+        self.name = name
+
+    def compute(self, ctx):
+        return MetricResult(score=0.5, latency_ms=1)
+
+
+def test_compute_one_records_stages(monkeypatch):
+    parsed = SimpleNamespace(kind="hf_model", owner="o", name="m")
+    monkeypatch.setattr(C, "parse_url", lambda u: parsed)
+    monkeypatch.setattr(C, "fetch_hf_model_meta", lambda p: ({"last_modified": ""}, 1))
+    monkeypatch.setattr(C, "analyze_github_urls", lambda urls, max_commits=200: {})
+    monkeypatch.setattr(C, "metric_registry", lambda: [_Metric(k) for k in C.NET_WEIGHTS])
+    t = start_tracing()
+    try:
+        C.compute_one("https://huggingface.co/o/m", [], [])
+    finally:
+        stop_tracing()
+    stages = t.summary()["stages"]
+    assert {"model", "fetch", "github", "metric.license", "metric.size_score"} <= set(stages)
+
+
+def test_cli_profile_flag_writes_summary(monkeypatch, tmp_path):
+    src = tmp_path / "urls.txt"
+    src.write_text("https://huggingface.co/o/m\n")
+    prof = tmp_path / "profile.json"
+
+    def fake_compute_one(u, ds, code):
+        with span("fetch"):
+            return {"name": "m", "net_score": 0.5}
+
+    monkeypatch.setattr(C, "compute_one", fake_compute_one)
+    monkeypatch.setattr(cli_mod, "write_rows", lambda rows: list(rows))
+    assert cli_mod.main(["prog", "--profile", str(prof), str(src)]) == 0
+    data = json.loads(prof.read_text())
+    assert data["stages"]["fetch"]["count"] == 1
+    assert tracing._tracer is None
+
+
+def test_otlp_export_links_run_model_and_metric_spans(monkeypatch, tmp_path):
+    monkeypatch.setattr(C, "parse_url", lambda u: SimpleNamespace(
+        kind="hf_model" if "/o/" in u else "other", owner="o", name=u.rsplit("/", 1)[-1]))
+    monkeypatch.setattr(C, "fetch_hf_model_meta", lambda p: ({"last_modified": ""}, 1))
+    monkeypatch.setattr(C, "analyze_github_urls", lambda urls, max_commits=200: {})
+    monkeypatch.setattr(C, "metric_registry", lambda: [_Metric(k) for k in C.NET_WEIGHTS])
+    monkeypatch.setattr(cli_mod, "write_rows", lambda rows: list(rows))
+    src = tmp_path / "urls.txt"
+    src.write_text("https://huggingface.co/o/m1\nhttps://huggingface.co/o/m2\n")
+    out = tmp_path / "trace.json"
+
+    assert cli_mod.main(["prog", "--trace", str(out), str(src)]) == 0
+
+    doc = json.loads(out.read_text())
+    spans = doc["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    by_id = {s["spanId"]: s for s in spans}
+    (run,) = [s for s in spans if s["name"] == "run"]
+    models = [s for s in spans if s["name"] == "model"]
+    metrics = [s for s in spans if s["name"].startswith("metric.")]
+    assert "parentSpanId" not in run
+    assert len(models) == 2 and all(m["parentSpanId"] == run["spanId"] for m in models)
+    assert len(metrics) == 2 * len(C.NET_WEIGHTS)
+    assert all(by_id[m["parentSpanId"]]["name"] == "model" for m in metrics)
+    assert {s["traceId"] for s in spans} == {run["traceId"]}
+    attrs = {a["key"]: a["value"] for a in models[0]["attributes"]}
+    assert attrs["url"]["stringValue"].startswith("https://huggingface.co/o/")
+    assert int(models[0]["endTimeUnixNano"]) >= int(models[0]["startTimeUnixNano"])
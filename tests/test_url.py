@@ -30,3 +30,8 @@ def test_parse_other():
     assert p.kind == "other"
     assert p.owner is None
     assert p.name is None
+
+def test_parse_file_url_is_a_local_repo():
+    p = parse_url("file:///srv/checkouts/proj/")
+    assert p.kind == "local_repo"
+    assert p.name == "proj"